@@ -1,2 +1,8 @@
 from holmes_extractor.manager import Manager as Manager
 from holmes_extractor.ontology import Ontology as Ontology
+from holmes_extractor.async_manager import AsyncManager as AsyncManager
+from holmes_extractor.metrics import Metrics as Metrics
+from holmes_extractor.metrics import MetricsSink as MetricsSink
+from holmes_extractor.structural_matching import MatchBudget as MatchBudget
+from holmes_extractor.progress import ProgressReporter as ProgressReporter
+from holmes_extractor.progress import ConsoleProgressReporter as ConsoleProgressReporter
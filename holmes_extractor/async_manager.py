@@ -0,0 +1,177 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+class AsyncManager:
+    """An asyncio front-end to a *Manager* object. Parsing and matching are performed on an
+        executor so that the event loop is never blocked. Texts submitted concurrently for parsing
+        are collected into batches that are passed to spaCy together, and each request then
+        receives its own document from the batch. Only one batch is parsed at a time; texts
+        submitted while a batch is being parsed are collected into the following batch.
+
+        An *AsyncManager* object should only be used from a single event loop.
+
+    Args:
+
+    manager -- the *Manager* object to which calls are delegated.
+    executor -- the *concurrent.futures.Executor* on which parsing and matching are performed.
+        Defaults to *None*, in which case a thread pool is created and is shut down by
+        *close()*.
+    maximum_batch_size -- the maximum number of texts to parse in a single batch.
+    maximum_batch_delay -- the maximum time in seconds to wait for further texts before
+        parsing a batch that is smaller than *maximum_batch_size*.
+    """
+
+    def __init__(self, manager, *, executor=None, maximum_batch_size=32,
+            maximum_batch_delay=0.005):
+        self.manager = manager
+        if executor == None:
+            self._executor = ThreadPoolExecutor()
+            self._owns_executor = True
+        else:
+            self._executor = executor
+            self._owns_executor = False
+        self.maximum_batch_size = maximum_batch_size
+        self.maximum_batch_delay = maximum_batch_delay
+        self._pending_parses = []
+        self._scheduled_batch_handle = None
+        self._batch_in_progress = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """Shuts down the executor if it was created by this object."""
+        if self._owns_executor:
+            await asyncio.get_event_loop().run_in_executor(None, self._executor.shutdown)
+
+    async def parse(self, text):
+        """Returns the document resulting from a full spaCy and Holmes parse on a string. The
+            string is parsed as part of a batch together with any other texts submitted
+            concurrently.
+        """
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        self._pending_parses.append((text, future))
+        if not self._batch_in_progress:
+            if len(self._pending_parses) >= self.maximum_batch_size:
+                self._start_batch(loop)
+            elif self._scheduled_batch_handle == None:
+                self._scheduled_batch_handle = loop.call_later(self.maximum_batch_delay,
+                        self._start_batch, loop)
+        return await future
+
+    def _start_batch(self, loop):
+        if self._scheduled_batch_handle != None:
+            self._scheduled_batch_handle.cancel()
+            self._scheduled_batch_handle = None
+        batch = self._pending_parses[:self.maximum_batch_size]
+        self._pending_parses = self._pending_parses[self.maximum_batch_size:]
+        self._batch_in_progress = True
+        loop.create_task(self._parse_batch(loop, batch))
+
+    def _parse_individually(self, texts):
+        results = []
+        for text in texts:
+            try:
+                results.append((self.manager.semantic_analyzer.parse(text), None))
+            except Exception as exception:
+                results.append((None, exception))
+        return results
+
+    async def _parse_batch(self, loop, batch):
+        texts = [text for text, _ in batch]
+        try:
+            try:
+                docs = await loop.run_in_executor(self._executor,
+                        self.manager.semantic_analyzer.parse_batch, texts)
+                results = [(doc, None) for doc in docs]
+            except Exception:
+                # repeat the parse text by text so that the error is only reported to the
+                # request or requests that caused it
+                results = await loop.run_in_executor(self._executor, self._parse_individually,
+                        texts)
+        except Exception as exception:
+            results = [(None, exception)] * len(batch)
+        finally:
+            self._batch_in_progress = False
+            if len(self._pending_parses) > 0:
+                # the waiting texts have already been delayed by the batch that has just finished
+                self._start_batch(loop)
+        for (_, future), (doc, exception) in zip(batch, results):
+            if future.cancelled():
+                continue
+            if exception != None:
+                future.set_exception(exception)
+            else:
+                future.set_result(doc)
+
+    async def _run_in_executor(self, function, *args):
+        return await asyncio.get_event_loop().run_in_executor(self._executor, function, *args)
+
+    async def parse_and_register_document(self, document_text, label=''):
+        """Args:
+
+        document_text -- the raw document text.
+        label -- a label for the document which must be unique. Defaults to the empty string,
+            which is intended for use cases where single documents (user entries) are
+            matched to predefined search phrases.
+        """
+        doc = await self.parse(document_text)
+        await self._run_in_executor(self.manager.register_parsed_document, doc, label)
+
+    async def match_search_phrases_against(self, entry):
+        """Matches the search phrases registered with the manager against a single document
+            supplied to the method and returns dictionaries describing any matches. The
+            registered documents are left unchanged.
+        """
+        doc = await self.parse(entry)
+        return await self._run_in_executor(self.manager._match_search_phrases_against_doc, doc)
+
+    async def match_documents_against(self, search_phrase):
+        """Matches the documents registered with the manager against a single search phrase
+            supplied to the method and returns dictionaries describing any matches. The
+            registered search phrases are left unchanged.
+        """
+        structural_matcher = self.manager.structural_matcher
+        if structural_matcher.search_phrase_cache != None:
+            cached_search_phrase = structural_matcher.search_phrase_cache.get(
+                    structural_matcher.search_phrase_cache_key(search_phrase))
+            if cached_search_phrase != None:
+                # the search phrase does not have to be parsed
+                return await self._run_in_executor(
+                        self.manager._match_documents_against_cached_search_phrase,
+                        search_phrase, cached_search_phrase)
+        search_phrase_doc = await self.parse(search_phrase)
+        return await self._run_in_executor(self.manager._match_documents_against_doc,
+                search_phrase, search_phrase_doc)
+
+    async def topic_match_documents_against(self, text_to_match, *,
+            maximum_activation_distance=75, relation_score=30, single_word_score=5,
+            overlapping_relation_multiplier=1.5, overlap_memory_size=10,
+            maximum_activation_value=1000, sideways_match_extent=100, number_of_results=10):
+        """Returns the results of a topic match between an entered text and the documents
+            registered with the manager. The parameters are as for
+            *Manager.topic_match_documents_against()*.
+        """
+        topic_matcher_arguments = {
+                'maximum_activation_distance': maximum_activation_distance,
+                'relation_score': relation_score,
+                'single_word_score': single_word_score,
+                'overlapping_relation_multiplier': overlapping_relation_multiplier,
+                'overlap_memory_size': overlap_memory_size,
+                'maximum_activation_value': maximum_activation_value,
+                'sideways_match_extent': sideways_match_extent,
+                'number_of_results': number_of_results}
+        cache_key = self.manager._topic_match_cache_key(text_to_match, topic_matcher_arguments)
+        topic_matches = self.manager._cached_topic_matches(cache_key)
+        if topic_matches == None:
+            doc = await self.parse(text_to_match)
+            topic_matches = await self._run_in_executor(functools.partial(
+                    self.manager._topic_match_documents_against_doc, doc,
+                    **topic_matcher_arguments))
+            self.manager._cache_topic_matches(cache_key, topic_matches)
+        return topic_matches
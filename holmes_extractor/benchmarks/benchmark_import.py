@@ -0,0 +1,55 @@
+"""Measures the time taken to import Holmes modules in a fresh interpreter and reports which
+slow optional dependencies each import loads. Importing *holmes_extractor* should not load
+scikit-learn, SciPy, rdflib or jsonpickle, which are only required once supervised document
+classification, an ontology or serialization is used. Run with
+
+    python -m holmes_extractor.benchmarks.benchmark_import
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+_optional_dependencies = ('sklearn', 'scipy', 'rdflib', 'jsonpickle')
+
+_measuring_script = '''
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{'seconds': seconds, 'loaded': [name for name in {dependencies!r}
+        if name in sys.modules]}}))
+'''
+
+def time_import(module):
+    """Imports *module* in a new interpreter and returns the number of seconds the import took
+        together with the optional dependencies that were loaded as a result.
+    """
+    output = subprocess.run([sys.executable, '-c', _measuring_script.format(module=module,
+            dependencies=_optional_dependencies)], check=True, stdout=subprocess.PIPE,
+            universal_newlines=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    return result['seconds'], result['loaded']
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m holmes_extractor.benchmarks.benchmark_import',
+            description='Times importing Holmes modules in fresh interpreters.')
+    parser.add_argument('--modules', nargs='*', default=['spacy', 'holmes_extractor',
+            'holmes_extractor.extensive_matching', 'holmes_extractor.server'],
+            help='the modules to import; spacy is included as a baseline')
+    parser.add_argument('--repeat', type=int, default=5)
+    arguments = parser.parse_args(argv)
+
+    for module in arguments.modules:
+        timings = []
+        for _ in range(arguments.repeat):
+            seconds, loaded = time_import(module)
+            timings.append(seconds)
+        print(module + ':', 'median of', arguments.repeat, 'imports',
+                '{:.3f}'.format(statistics.median(timings)), 'seconds;',
+                'optional dependencies loaded:', ', '.join(loaded) if len(loaded) > 0 else 'none')
+
+if __name__ == '__main__':
+    main()
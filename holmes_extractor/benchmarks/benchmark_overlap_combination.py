@@ -0,0 +1,69 @@
+"""Measures the time taken to derive phraselet frequencies, including combined labels for
+overlapping relation matches, from a large number of densely packed phraselet matches. This is
+the work done by *SupervisedTopicTrainingUtils.get_labels_to_classification_frequencies_dict()*
+during training and whenever documents are classified. No spaCy model is required. Run with
+
+    python -m holmes_extractor.benchmarks.benchmark_overlap_combination
+"""
+
+import argparse
+import random
+import timeit
+from holmes_extractor.extensive_matching import PhraseletMatch, SupervisedTopicTrainingUtils
+
+def generate_matches(*, number_of_documents, matches_per_document, tokens_per_document,
+        number_of_phraselets, seed=42):
+    """Returns random *PhraseletMatch* objects together with a dictionary from document labels
+        to classifications. About a quarter of the matches are single-word matches; the others
+        are relation matches involving two neighbouring tokens.
+    """
+    generator = random.Random(seed)
+    relation_labels = [''.join(('predicate-actor: verb', str(index), '-noun', str(index)))
+            for index in range(number_of_phraselets)]
+    word_labels = [''.join(('word: noun', str(index))) for index in range(number_of_phraselets)]
+    matches = []
+    labels_to_classifications = {}
+    for document_index in range(number_of_documents):
+        document_label = ''.join(('document', str(document_index)))
+        labels_to_classifications[document_label] = ''.join(('class',
+                str(document_index % 5)))
+        for _ in range(matches_per_document):
+            token_index = generator.randrange(tokens_per_document)
+            if generator.random() < 0.25:
+                matches.append(PhraseletMatch(generator.choice(word_labels), document_label,
+                        token_index, True, [token_index]))
+            else:
+                other_token_index = min(token_index + generator.randint(1, 3),
+                        tokens_per_document - 1)
+                matches.append(PhraseletMatch(generator.choice(relation_labels),
+                        document_label, token_index, False, [token_index, other_token_index]))
+    return matches, labels_to_classifications
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+            prog='python -m holmes_extractor.benchmarks.benchmark_overlap_combination',
+            description='Times the derivation of phraselet frequencies from dense matches.')
+    parser.add_argument('--documents', type=int, default=200)
+    parser.add_argument('--matches-per-document', type=int, default=2000)
+    parser.add_argument('--tokens-per-document', type=int, default=1000)
+    parser.add_argument('--phraselets', type=int, default=300)
+    parser.add_argument('--overlap-memory-size', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=3)
+    arguments = parser.parse_args(argv)
+
+    matches, labels_to_classifications = generate_matches(
+            number_of_documents=arguments.documents,
+            matches_per_document=arguments.matches_per_document,
+            tokens_per_document=arguments.tokens_per_document,
+            number_of_phraselets=arguments.phraselets)
+    print(len(matches), 'matches in', arguments.documents, 'documents')
+    for oneshot in (True, False):
+        utils = SupervisedTopicTrainingUtils(arguments.overlap_memory_size, oneshot)
+        timings = timeit.repeat(lambda: utils.get_labels_to_classification_frequencies_dict(
+                matches=matches, labels_to_classifications_dict=labels_to_classifications),
+                repeat=arguments.repeat, number=1)
+        print('oneshot=' + str(oneshot) + ':', 'best of', arguments.repeat, 'runs',
+                '{:.3f}'.format(min(timings)), 'seconds')
+
+if __name__ == '__main__':
+    main()
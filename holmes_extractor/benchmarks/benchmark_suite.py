@@ -0,0 +1,169 @@
+"""Times the main Holmes operations against synthetic corpora of configurable size and writes
+the results as JSON, so that the timings of different versions or environments can be
+compared. No network access is required: the corpora are generated by
+*holmes_extractor.benchmarks.corpora*. Run with e.g.
+
+    python -m holmes_extractor.benchmarks.benchmark_suite --model en_core_web_lg \\
+        --documents 200 --output results.json
+
+and see *python -m holmes_extractor.benchmarks.benchmark_suite --help* for the other options.
+Each timing records the total number of seconds taken by a stage, the number of operations
+the stage consisted of and the resulting number of seconds per operation.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import holmes_extractor as holmes
+from holmes_extractor.benchmarks import corpora
+
+class _Timings:
+
+    def __init__(self, verbose):
+        self.results = {}
+        self._verbose = verbose
+
+    def time(self, stage, number_of_operations, function):
+        """Calls 'function', records how long it took and returns its return value."""
+        start = time.perf_counter()
+        return_value = function()
+        seconds = time.perf_counter() - start
+        self.results[stage] = {
+                'seconds': seconds,
+                'operations': number_of_operations,
+                'seconds_per_operation': seconds / number_of_operations if
+                        number_of_operations > 0 else None}
+        if self._verbose:
+            print(stage, '{:.3f}'.format(seconds), 'seconds', file=sys.stderr)
+        return return_value
+
+def benchmark_structural_matching(manager, timings, *, documents, search_phrases):
+    timings.time('parse_and_register_document', len(documents), lambda: [
+            manager.parse_and_register_document(text, label) for label, text, _ in documents])
+    timings.time('register_search_phrase', len(search_phrases), lambda: [
+            manager.register_search_phrase(search_phrase) for search_phrase in search_phrases])
+    matches = timings.time('match', len(documents), manager.match)
+    timings.time('match_returning_dictionaries', len(documents),
+            manager.match_returning_dictionaries)
+    timings.time('match_search_phrases_against', len(documents), lambda: [
+            manager.match_search_phrases_against(text) for _, text, _ in documents])
+    return len(matches)
+
+def benchmark_topic_matching(manager, timings, *, queries):
+    timings.time('topic_match_documents_against', len(queries), lambda: [
+            manager.topic_match_documents_against(query) for query in queries])
+
+def benchmark_serialization(manager, timings, *, documents):
+    serialized_documents = timings.time('serialize_document', len(documents), lambda: [
+            manager.serialize_document(label) for label, _, _ in documents])
+    manager.remove_all_documents()
+    timings.time('deserialize_and_register_document', len(documents), lambda: [
+            manager.deserialize_and_register_document(serialized_document, label) for
+            serialized_document, (label, _, _) in zip(serialized_documents, documents)])
+
+def benchmark_supervised_topic_classification(manager, timings, *, training_documents,
+        test_documents, minimum_occurrences):
+    training_basis = manager.get_supervised_topic_training_basis(verbose=False)
+    timings.time('parse_and_register_training_document', len(training_documents), lambda: [
+            training_basis.parse_and_register_training_document(text, classification, label)
+            for label, text, classification in training_documents])
+    timings.time('prepare', len(training_documents), training_basis.prepare)
+    trainer = timings.time('train', len(training_documents), lambda: training_basis.train(
+            minimum_occurrences=minimum_occurrences, cv_threshold=0))
+    classifier = trainer.classifier()
+    test_texts = [text for _, text, _ in test_documents]
+    timings.time('parse_and_classify', len(test_texts), lambda: [
+            classifier.parse_and_classify(text) for text in test_texts])
+    classifications = timings.time('parse_and_classify_many', len(test_texts),
+            lambda: classifier.parse_and_classify_many(test_texts))
+    serialized_model = timings.time('serialize_model', 1, classifier.serialize_model)
+    timings.time('deserialize_supervised_topic_classifier', 1,
+            lambda: manager.deserialize_supervised_topic_classifier(serialized_model))
+    binary_model = timings.time('serialize_model_to_bytes', 1,
+            classifier.serialize_model_to_bytes)
+    timings.time('deserialize_supervised_topic_classifier_from_bytes', 1,
+            lambda: manager.deserialize_supervised_topic_classifier(binary_model))
+    return sum(1 for (_, _, classification), predicted_classifications in
+            zip(test_documents, classifications) if len(predicted_classifications) > 0 and
+            predicted_classifications[0] == classification), len(serialized_model), \
+            len(binary_model)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m holmes_extractor.benchmarks.benchmark_suite',
+            description='Times Holmes operations against synthetic corpora.')
+    parser.add_argument('--model', default='en_core_web_lg',
+            help='the name of the spaCy model')
+    parser.add_argument('--coreference-resolution', choices=('on', 'off'),
+            help='defaults to performing coreference resolution if the model supports it')
+    parser.add_argument('--documents', type=int, default=100,
+            help='the number of documents to register')
+    parser.add_argument('--sentences-per-document', type=int, default=10)
+    parser.add_argument('--search-phrases', type=int, default=50)
+    parser.add_argument('--queries', type=int, default=20,
+            help='the number of topic matching queries')
+    parser.add_argument('--training-documents', type=int, default=60)
+    parser.add_argument('--test-documents', type=int, default=30)
+    parser.add_argument('--minimum-occurrences', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--stages', nargs='*', default=['structural', 'topic', 'serialization',
+            'supervised'], choices=['structural', 'topic', 'serialization', 'supervised'])
+    parser.add_argument('--output', help='the file to which to write the JSON results; '
+            'defaults to standard output')
+    parser.add_argument('--quiet', action='store_true',
+            help='do not report the stages on standard error as they complete')
+    arguments = parser.parse_args(argv)
+
+    if arguments.coreference_resolution == None:
+        perform_coreference_resolution = None
+    else:
+        perform_coreference_resolution = arguments.coreference_resolution == 'on'
+    timings = _Timings(not arguments.quiet)
+    # the caches are deactivated so that repeated operations are measured in full
+    manager = timings.time('load_model', 1, lambda: holmes.Manager(arguments.model,
+            perform_coreference_resolution=perform_coreference_resolution,
+            search_phrase_cache_size=0, topic_match_cache_size=0))
+    documents = corpora.generate_documents(arguments.documents,
+            arguments.sentences_per_document, seed=arguments.seed)
+    counts = {}
+    if 'structural' in arguments.stages or 'topic' in arguments.stages or \
+            'serialization' in arguments.stages:
+        counts['matches'] = benchmark_structural_matching(manager, timings,
+                documents=documents, search_phrases=corpora.generate_search_phrases(
+                arguments.search_phrases, seed=arguments.seed))
+    if 'topic' in arguments.stages:
+        benchmark_topic_matching(manager, timings, queries=corpora.generate_queries(
+                arguments.queries, seed=arguments.seed))
+    if 'serialization' in arguments.stages:
+        benchmark_serialization(manager, timings, documents=documents)
+    if 'supervised' in arguments.stages:
+        supervised_documents = corpora.generate_documents(arguments.training_documents +
+                arguments.test_documents, arguments.sentences_per_document,
+                seed=arguments.seed + 1)
+        counts['correct_classifications'], counts['serialized_model_size'], \
+                counts['binary_model_size'] = benchmark_supervised_topic_classification(
+                manager, timings,
+                training_documents=supervised_documents[:arguments.training_documents],
+                test_documents=supervised_documents[arguments.training_documents:],
+                minimum_occurrences=arguments.minimum_occurrences)
+
+    results = {
+            'environment': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'model': arguments.model,
+                'perform_coreference_resolution': manager.perform_coreference_resolution},
+            'parameters': {key: value for key, value in vars(arguments).items() if key not in
+                    ('output', 'quiet')},
+            'counts': counts,
+            'timings': timings.results}
+    if arguments.output != None:
+        with open(arguments.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Generates reproducible synthetic English corpora so that benchmarks can run offline. The
+sentences are built from a small vocabulary whose words occur in structures that Holmes
+matches, e.g. 'The big dog chased the old cat.', so that the number of matches grows with the
+size of the corpus.
+"""
+
+import random
+
+# (noun, group) pairs: the group determines the classification of generated documents
+_nouns = [('dog', 'animals'), ('cat', 'animals'), ('horse', 'animals'), ('lion', 'animals'),
+        ('tiger', 'animals'), ('rabbit', 'animals'), ('teacher', 'people'),
+        ('gymnast', 'people'), ('programmer', 'people'), ('doctor', 'people'),
+        ('child', 'people'), ('farmer', 'people'), ('robot', 'machines'),
+        ('computer', 'machines'), ('tractor', 'machines'), ('printer', 'machines'),
+        ('drone', 'machines'), ('engine', 'machines')]
+
+# (lemma, third person singular, past tense)
+_verbs = [('chase', 'chases', 'chased'), ('see', 'sees', 'saw'), ('feed', 'feeds', 'fed'),
+        ('watch', 'watches', 'watched'), ('help', 'helps', 'helped'),
+        ('follow', 'follows', 'followed'), ('find', 'finds', 'found'),
+        ('like', 'likes', 'liked'), ('repair', 'repairs', 'repaired'),
+        ('visit', 'visits', 'visited')]
+
+_adjectives = ['big', 'small', 'fast', 'old', 'young', 'clever', 'lazy', 'happy', 'noisy',
+        'strong']
+
+def _noun_phrase(generator, noun):
+    if generator.random() < 0.5:
+        return ' '.join(('the', generator.choice(_adjectives), noun))
+    return ' '.join(('the', noun))
+
+def _sentence(generator, group):
+    subjects = [noun for noun, noun_group in _nouns if noun_group == group]
+    subject = generator.choice(subjects)
+    if generator.random() < 0.6:
+        # documents mostly talk about nouns from their own group
+        object_noun = generator.choice(subjects)
+    else:
+        object_noun = generator.choice(_nouns)[0]
+    verb = generator.choice(_verbs)
+    if generator.random() < 0.2:
+        sentence = ' '.join((_noun_phrase(generator, object_noun), 'was', verb[2], 'by',
+                _noun_phrase(generator, subject)))
+    else:
+        sentence = ' '.join((_noun_phrase(generator, subject), verb[2],
+                _noun_phrase(generator, object_noun)))
+    return ''.join((sentence[0].upper(), sentence[1:], '.'))
+
+def classifications():
+    """Returns the sorted classification labels assigned to generated documents."""
+    return sorted({group for _, group in _nouns})
+
+def generate_documents(number_of_documents, sentences_per_document, *, seed=42):
+    """Returns a list of (label, text, classification) tuples. The same arguments always
+        produce the same documents.
+    """
+    generator = random.Random(seed)
+    groups = classifications()
+    documents = []
+    for index in range(number_of_documents):
+        group = groups[index % len(groups)]
+        text = ' '.join(_sentence(generator, group) for _ in range(sentences_per_document))
+        documents.append((''.join(('document', str(index))), text, group))
+    return documents
+
+def generate_search_phrases(number_of_search_phrases, *, seed=42):
+    """Returns a list of distinct search phrases like 'A dog chases a cat'. At most one search
+        phrase is returned for each combination of subject, verb and object.
+    """
+    generator = random.Random(seed)
+    combinations = [(subject, verb, object_noun) for subject, _ in _nouns for verb in _verbs
+            for object_noun, _ in _nouns if subject != object_noun]
+    generator.shuffle(combinations)
+    return [' '.join(('A', subject, verb[1], 'a', object_noun)) for subject, verb, object_noun in
+            combinations[:number_of_search_phrases]]
+
+def generate_queries(number_of_queries, *, seed=42):
+    """Returns a list of distinct topic matching queries like 'The clever dog chased the cat'.
+        At most as many queries are returned as there are possible combinations.
+    """
+    generator = random.Random(seed)
+    number_of_queries = min(number_of_queries,
+            len(_adjectives) * len(_nouns) * len(_verbs) * len(_nouns))
+    queries = []
+    while len(queries) < number_of_queries:
+        query = ' '.join(('The', generator.choice(_adjectives), generator.choice(_nouns)[0],
+                generator.choice(_verbs)[2], 'the', generator.choice(_nouns)[0]))
+        if query not in queries:
+            queries.append(query)
+    return queries
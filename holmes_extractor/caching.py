@@ -0,0 +1,60 @@
+import collections
+import threading
+
+class LruCache:
+    """A thread-safe cache of bounded size that discards the least recently used entries first.
+
+    Args:
+
+    maximum_size -- the maximum number of entries the cache may contain.
+    """
+
+    def __init__(self, maximum_size):
+        if maximum_size < 1:
+            raise ValueError('maximum_size must be at least 1')
+        self.maximum_size = maximum_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Returns the value stored for *key*, or *None* if there is no such value."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        """Stores *value* for *key*, discarding the least recently used entry if the cache is
+            full.
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maximum_size:
+                self._entries.popitem(last=False)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """Removes all entries. The hit and miss counters are retained."""
+        with self._lock:
+            self._entries.clear()
+
+    def statistics(self):
+        """Returns a dictionary with the current size, maximum size and hit and miss counts."""
+        with self._lock:
+            return {
+                    'size': len(self._entries),
+                    'maximum_size': self.maximum_size,
+                    'hits': self.hits,
+                    'misses': self.misses}
@@ -30,15 +30,26 @@ class NoSearchPhraseError(HolmesError):
 class NoSearchedDocumentError(HolmesError):
     pass
 
+# no longer raised now that documents parsed with coreference models can be serialized; retained
+# so that existing code catching it continues to work
 class SerializationNotSupportedError(HolmesError):
     pass
 
 class WrongModelDeserializationError(HolmesError):
     pass
 
+class UnsupportedModelFormatError(HolmesError):
+    pass
+
+class UnsupportedSnapshotFormatError(HolmesError):
+    pass
+
 class DocumentTooBigError(HolmesError):
     pass
 
+class MatchBudgetExceededError(HolmesError):
+    pass
+
 class FewerThanTwoClassificationsError(HolmesError):
     pass
 
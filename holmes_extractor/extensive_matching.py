@@ -1,11 +1,20 @@
 import collections
-import jsonpickle
+import io
+import itertools
+import json
+import pickle
 import uuid
-import statistics
-from scipy.sparse import dok_matrix
-from sklearn.neural_network import MLPClassifier
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 from .errors import WrongModelDeserializationError, FewerThanTwoClassificationsError, \
-        DuplicateDocumentError, NoPhraseletsAfterFilteringError
+        DuplicateDocumentError, NoPhraseletsAfterFilteringError, \
+        UnsupportedModelFormatError, UnsupportedSnapshotFormatError
+from .semantics import SemanticAnalyzerFactory
+from .structural_matching import StructuralMatcher, SerializedPhraselet, ResultList
+from .ontology import Ontology
+# scipy, scikit-learn and jsonpickle are imported within the methods that use them because
+# importing them is slow and many applications never train or serialize classifiers
 
 class TopicMatch:
     """A topic match between some text and part of a document.
@@ -50,9 +59,10 @@ class TopicMatcher:
             single_word_score, overlapping_relation_multiplier,
             overlap_memory_size, maximum_activation_value, sideways_match_extent,
             number_of_results):
-        self._holmes = holmes
         self._semantic_analyzer = holmes.semantic_analyzer
-        self.structural_matcher = holmes.structural_matcher
+        # a private structural matcher is used so that topic matching neither changes nor
+        # depends on the search phrases registered with the manager
+        self.structural_matcher = holmes.structural_matcher.matcher_sharing_documents()
         self._ontology = holmes.structural_matcher.ontology
         self.maximum_activation_distance = maximum_activation_distance
         self.relation_score = relation_score
@@ -70,27 +80,36 @@ class TopicMatcher:
 
         text_to_match -- the text to match against the documents.
         """
-        self._holmes.remove_all_search_phrases()
-        doc = self._semantic_analyzer.parse(text_to_match)
+        return self.topic_match_documents_against_doc(self._semantic_analyzer.parse(text_to_match))
+
+    def topic_match_documents_against_doc(self, doc):
+        """ Performs a topic match of a document that has already been parsed against the loaded
+            documents.
+
+        Property:
+
+        doc -- the parsed document to match against the documents.
+        """
+        self.structural_matcher.remove_all_search_phrases()
         self.structural_matcher.register_phraselets(doc,
                 replace_with_hypernym_ancestors=False,
                 match_all_words = False,
                 returning_serialized_phraselets = False)
         if len(self.structural_matcher.list_search_phrase_labels()) == 0:
-            return []
+            return ResultList()
         # First get the structural matches sorted by position
-        position_sorted_structural_matches = \
-                sorted(self.structural_matcher.match(), key=lambda match:
+        structural_matches = self.structural_matcher.match()
+        position_sorted_structural_matches = sorted(structural_matches, key=lambda match:
                 (match.document_label, match.index_within_document))
-        if len(position_sorted_structural_matches) == 0:
+        if len(position_sorted_structural_matches) == 0 and not structural_matches.is_truncated:
             # We found nothing, so we try again with all single words (not just nouns)
-            self._holmes.remove_all_search_phrases()
+            self.structural_matcher.remove_all_search_phrases()
             self.structural_matcher.register_phraselets(doc,
                     replace_with_hypernym_ancestors=False,
                     match_all_words=True,
                     returning_serialized_phraselets = False)
-            position_sorted_structural_matches = \
-                    sorted(self.structural_matcher.match(), key=lambda match:
+            structural_matches = self.structural_matcher.match()
+            position_sorted_structural_matches = sorted(structural_matches, key=lambda match:
                     (match.document_label, match.index_within_document))
         # Read through the documents measuring the activation based on where
         # in the document structural matches were found
@@ -98,8 +117,8 @@ class TopicMatcher:
                 position_sorted_structural_matches)
         # Resort the matches starting with the highest (most active) and
         # create topic match objects with information about the surrounding sentences
-        return self.get_topic_matches(score_sorted_structural_matches,
-                position_sorted_structural_matches)
+        return ResultList(self.get_topic_matches(score_sorted_structural_matches,
+                position_sorted_structural_matches), structural_matches.is_truncated)
 
     def perform_activation_scoring(self, position_sorted_structural_matches):
         """
@@ -232,6 +251,109 @@ class TopicMatcher:
             counter += 1
         return topic_matches
 
+class PhraseletMatch:
+    """A match against a phraselet that retains only the information required for supervised
+        document classification. Unlike *Match* objects, *PhraseletMatch* objects contain no
+        references to spaCy documents and can be passed between processes.
+
+    Properties:
+
+    search_phrase_label -- the label of the phraselet that matched.
+    document_label -- the label of the document that matched.
+    index_within_document -- the index of the document token that matched the phraselet
+        root token.
+    from_single_word_phraselet -- 'True' if this is a match against a single-word phraselet.
+    document_token_indexes -- the indexes of the document tokens that matched the phraselet
+        tokens.
+    """
+
+    def __init__(self, search_phrase_label, document_label, index_within_document,
+            from_single_word_phraselet, document_token_indexes):
+        self.search_phrase_label = search_phrase_label
+        self.document_label = document_label
+        self.index_within_document = index_within_document
+        self.from_single_word_phraselet = from_single_word_phraselet
+        self.document_token_indexes = document_token_indexes
+
+def _to_phraselet_matches(matches):
+    return [PhraseletMatch(match.search_phrase_label, match.document_label,
+            match.index_within_document, match.from_single_word_phraselet,
+            [word_match.document_token.i for word_match in match.word_matches])
+            for match in matches]
+
+# the structural matcher used by a process started by 'match_phraselets_in_processes()'
+_process_structural_matcher = None
+
+def _initialize_matching_process(structural_matcher_settings):
+    global _process_structural_matcher
+    semantic_analyzer = SemanticAnalyzerFactory().semantic_analyzer(
+            model=structural_matcher_settings['model'], debug=False,
+            disabled_pipes=structural_matcher_settings['disabled_pipes'])
+    if structural_matcher_settings['ontology_arguments'] != None:
+        ontology = Ontology(**structural_matcher_settings['ontology_arguments'])
+    else:
+        ontology = None
+    _process_structural_matcher = StructuralMatcher(semantic_analyzer, ontology,
+            structural_matcher_settings['overall_similarity_threshold'],
+            structural_matcher_settings['embedding_based_matching_on_root_words'],
+            structural_matcher_settings['perform_coreference_resolution'])
+
+def _match_phraselets_in_process(serialized_phraselets, labels_to_serialized_documents):
+    structural_matcher = _process_structural_matcher
+    structural_matcher.remove_all_search_phrases()
+    structural_matcher.remove_all_documents()
+    structural_matcher.register_serialized_phraselets(serialized_phraselets)
+    for label, serialized_document in labels_to_serialized_documents:
+        structural_matcher.register_document(
+                structural_matcher.semantic_analyzer.from_serialized_string(serialized_document),
+                label)
+    return _to_phraselet_matches(structural_matcher.match())
+
+def match_phraselets_in_processes(*, structural_matcher, serialized_phraselets,
+        labels_to_serialized_documents, number_of_processes):
+    """ Matches documents against phraselets using a pool of worker processes, each of which
+        loads its own copy of the spaCy model and ontology. Returns a list of *PhraseletMatch*
+        objects. The result does not depend on the number of processes.
+
+        Parameters:
+
+        structural_matcher -- the structural matcher whose settings the worker processes should
+            use.
+        serialized_phraselets -- the phraselets to match.
+        labels_to_serialized_documents -- a list of (label, serialized document) tuples
+            for the documents to match.
+        number_of_processes -- the number of worker processes to start.
+    """
+    if structural_matcher.ontology != None:
+        ontology_arguments = structural_matcher.ontology._construction_arguments()
+    else:
+        ontology_arguments = None
+    structural_matcher_settings = {
+            'model': structural_matcher.semantic_analyzer.model,
+            'disabled_pipes': structural_matcher.semantic_analyzer.disabled_pipes,
+            'ontology_arguments': ontology_arguments,
+            'overall_similarity_threshold': structural_matcher.overall_similarity_threshold,
+            'embedding_based_matching_on_root_words':
+            structural_matcher.embedding_based_matching_on_root_words,
+            'perform_coreference_resolution': structural_matcher.perform_coreference_resolution}
+    serialized_phraselets = list(serialized_phraselets)
+    # several shards per process so that the load is spread evenly
+    number_of_shards = min(len(labels_to_serialized_documents), number_of_processes * 4)
+    if number_of_shards == 0:
+        return []
+    shard_size = -(-len(labels_to_serialized_documents) // number_of_shards)
+    shards = [labels_to_serialized_documents[index: index + shard_size] for index in
+            range(0, len(labels_to_serialized_documents), shard_size)]
+    phraselet_matches = []
+    with ProcessPoolExecutor(max_workers=number_of_processes,
+            initializer=_initialize_matching_process,
+            initargs=(structural_matcher_settings,)) as executor:
+        # 'map()' returns the results in shard order
+        for shard_phraselet_matches in executor.map(_match_phraselets_in_process,
+                [serialized_phraselets] * len(shards), shards):
+            phraselet_matches.extend(shard_phraselet_matches)
+    return phraselet_matches
+
 class SupervisedTopicTrainingUtils:
 
     def __init__(self, overlap_memory_size, oneshot):
@@ -247,18 +369,17 @@ class SupervisedTopicTrainingUtils:
 
             Parameters:
 
-            matches -- the structural matches from which to build the dictionary
+            matches -- the *PhraseletMatch* objects from which to build the dictionary
             labels_to_classifications_dict -- a dictionary from document labels to document
                 classifications, or 'None' if the target dictionary should contain raw frequencies.
         """
-        def increment(search_phrase_label, document_label):
+        def increment(search_phrase_label, classification):
             if labels_to_classifications_dict != None:
                 if search_phrase_label not in labels_to_frequencies_dict:
                     classification_frequency_dict = {}
                     labels_to_frequencies_dict[search_phrase_label] = classification_frequency_dict
                 else:
                     classification_frequency_dict = labels_to_frequencies_dict[search_phrase_label]
-                classification = labels_to_classifications_dict[document_label]
                 if classification in classification_frequency_dict:
                     classification_frequency_dict[classification] += 1
                 else:
@@ -272,87 +393,156 @@ class SupervisedTopicTrainingUtils:
         labels_to_frequencies_dict = {}
         matches = sorted(matches,
                 key=lambda match:(match.document_label, match.index_within_document))
-        for index, match in enumerate(matches):
-            if self.oneshot:
-                if ('this_document_label' not in locals()) or \
-                        this_document_label != match.document_label:
-                    this_document_label = match.document_label
-                    search_phrases_added_for_this_document = set()
-                if match.search_phrase_label not in search_phrases_added_for_this_document:
-                    increment(match.search_phrase_label, match.document_label)
-                    search_phrases_added_for_this_document.add(match.search_phrase_label)
+        for document_label, document_matches in itertools.groupby(matches,
+                key=lambda match: match.document_label):
+            if labels_to_classifications_dict != None:
+                classification = labels_to_classifications_dict[document_label]
             else:
-                increment(match.search_phrase_label, match.document_label)
-            if not match.from_single_word_phraselet:
-                previous_match_index = index
-                number_of_analyzed_matches_counter = 0
-                while previous_match_index > 0 and number_of_analyzed_matches_counter \
-                        <= self.overlap_memory_size:
-                    previous_match_index -= 1
-                    previous_match = matches[previous_match_index]
-                    if previous_match.document_label != match.document_label:
-                        break
-                    if previous_match.from_single_word_phraselet:
-                        continue
-                    if previous_match.search_phrase_label == match.search_phrase_label:
+                classification = None
+            search_phrases_added_for_this_document = set()
+            # the labels and token index sets of the preceding relation matches within the
+            # document together with a dictionary from each token index to the positions within
+            # these lists of the relation matches that involve it and a dictionary from each
+            # label to the ascending positions of the relation matches with that label
+            previous_labels = []
+            previous_document_token_index_sets = []
+            document_token_indexes_to_positions = {}
+            labels_to_positions = {}
+            for match in document_matches:
+                if self.oneshot:
+                    if match.search_phrase_label not in search_phrases_added_for_this_document:
+                        increment(match.search_phrase_label, classification)
+                        search_phrases_added_for_this_document.add(match.search_phrase_label)
+                else:
+                    increment(match.search_phrase_label, classification)
+                if match.from_single_word_phraselet:
+                    continue
+                document_token_indexes = set(match.document_token_indexes)
+                window_start = self._overlap_window_start(len(previous_labels),
+                        labels_to_positions.get(match.search_phrase_label, ()))
+                overlapping_positions = set()
+                for document_token_index in document_token_indexes:
+                    for position in reversed(document_token_indexes_to_positions.get(
+                            document_token_index, ())):
+                        if position < window_start:
+                            break
+                        overlapping_positions.add(position)
+                for position in overlapping_positions:
+                    previous_label = previous_labels[position]
+                    if previous_label == match.search_phrase_label:
                         continue # otherwise coreference resolution leads to phrases being
                                  # combined with themselves
-                    number_of_analyzed_matches_counter += 1
-                    previous_word_match_doc_indexes = list(map(lambda word_match:
-                            word_match.document_token.i, previous_match.word_matches))
-                    for word_match in match.word_matches:
-                        if word_match.document_token.i in previous_word_match_doc_indexes:
-                            # the same word is involved in both matches, so combine them
-                            # into a new label
-                            label_parts = sorted((previous_match.search_phrase_label,
-                                    match.search_phrase_label))
-                            combined_label = '/'.join((label_parts[0],
-                                    label_parts[1]))
-                            if self.oneshot:
-                                if combined_label not in search_phrases_added_for_this_document:
-                                    increment(combined_label, match.document_label)
-                                    search_phrases_added_for_this_document.add(combined_label)
-                            else:
-                                increment(combined_label, match.document_label)
+                    if previous_label < match.search_phrase_label:
+                        combined_label = '/'.join((previous_label, match.search_phrase_label))
+                    else:
+                        combined_label = '/'.join((match.search_phrase_label, previous_label))
+                    if self.oneshot:
+                        if combined_label not in search_phrases_added_for_this_document:
+                            increment(combined_label, classification)
+                            search_phrases_added_for_this_document.add(combined_label)
+                    else:
+                        # each word involved in both matches combines them into a new label
+                        for document_token_index in match.document_token_indexes:
+                            if document_token_index in \
+                                    previous_document_token_index_sets[position]:
+                                increment(combined_label, classification)
+                for document_token_index in document_token_indexes:
+                    document_token_indexes_to_positions.setdefault(document_token_index,
+                            []).append(len(previous_labels))
+                labels_to_positions.setdefault(match.search_phrase_label, []).append(
+                        len(previous_labels))
+                previous_labels.append(match.search_phrase_label)
+                previous_document_token_index_sets.append(document_token_indexes)
         return labels_to_frequencies_dict
 
-    def record_matches(self, *, structural_matcher, sorted_label_dict, doc, doc_label, matrix,
-            row_index):
-        """ Matches a document against the currently stored phraselets and records the matches
-            in a matrix.
+    def _overlap_window_start(self, number_of_previous_matches, positions_with_same_label):
+        """ Returns the position of the earliest preceding relation match that a new match
+            should be checked for words in common with. Preceding matches with the same label
+            as the new match are disregarded and 'overlap_memory_size' + 1 other preceding
+            matches are checked.
+
+            Parameters:
+
+            number_of_previous_matches -- the number of preceding relation matches.
+            positions_with_same_label -- the ascending positions of the preceding relation
+                matches with the same label as the new match.
+        """
+        window_start = number_of_previous_matches - self.overlap_memory_size - 1
+        # each match with the same label within the window extends it by one position; only
+        # these matches are visited, so the cost does not depend on 'overlap_memory_size'
+        index = len(positions_with_same_label) - 1
+        while window_start > 0 and index >= 0 and \
+                positions_with_same_label[index] >= window_start:
+            window_start -= 1
+            index -= 1
+        return max(0, window_start)
+
+    def get_feature_matrix(self, *, structural_matcher, sorted_label_dict, docs,
+            document_labels=None):
+        """ Matches a list of documents against the currently stored phraselets in a single pass
+            and records the matches in a CSR matrix with a row for each document and a column
+            for each phraselet label. Returns the matrix and a sorted list of the indexes of the
+            rows that contain at least one match.
 
             Parameters:
 
             structural_matcher -- the structural matcher object on which the phraselets are stored.
             sorted_label_dict -- a dictionary from search phrase (phraselet) labels to their own
                 alphabetic sorting indexes.
-            doc -- the document to be matched.
-            doc_label - the label of 'doc'.
-            matrix -- the matrix within which to record the matches.
-            row_index -- the row number within the matrix corresponding to the document.
+            docs -- the documents to be matched.
+            document_labels -- the labels with which to register the documents, or 'None' if
+                the documents should be labelled with their indexes within 'docs'.
         """
+        if document_labels == None:
+            document_labels = range(len(docs))
+        # a private structural matcher is used so that documents can be classified concurrently
+        structural_matcher = structural_matcher.matcher_sharing_search_phrases()
+        for doc, document_label in zip(docs, document_labels):
+            structural_matcher.register_document(doc, document_label)
+        return self.get_feature_matrix_from_phraselet_matches(
+                phraselet_matches=_to_phraselet_matches(structural_matcher.match()),
+                sorted_label_dict=sorted_label_dict,
+                document_labels=document_labels)
+
+    def get_feature_matrix_from_phraselet_matches(self, *, phraselet_matches, sorted_label_dict,
+            document_labels):
+        """ Records phraselet matches in a CSR matrix with a row for each document and a column
+            for each phraselet label. Returns the matrix and a sorted list of the indexes of the
+            rows that contain at least one match.
+
+            Parameters:
 
-        structural_matcher.remove_all_documents()
-        structural_matcher.register_document(doc, doc_label)
-        found = False
-        for label, occurrences in \
+            phraselet_matches -- the *PhraseletMatch* objects to record.
+            sorted_label_dict -- a dictionary from search phrase (phraselet) labels to their own
+                alphabetic sorting indexes.
+            document_labels -- the labels of the documents corresponding to the matrix rows.
+        """
+        document_labels_to_row_indexes = {document_label: index for index, document_label in
+                enumerate(document_labels)}
+        rows = []
+        columns = []
+        values = []
+        # mapping each document label to the row index yields frequencies broken down by row
+        for label, row_frequencies in \
                 self.get_labels_to_classification_frequencies_dict(
-                matches=structural_matcher.match(),
-                labels_to_classifications_dict=None).items():
-            if self.oneshot:
-                occurrences = 1
+                matches=phraselet_matches,
+                labels_to_classifications_dict=document_labels_to_row_indexes).items():
             if label in sorted_label_dict: # may not be the case for compound labels
-                label_index = sorted_label_dict[label]
-                matrix[row_index, label_index] = occurrences
-                found = True
-        return found
+                for index, occurrences in row_frequencies.items():
+                    rows.append(index)
+                    columns.append(sorted_label_dict[label])
+                    values.append(1 if self.oneshot else occurrences)
+        from scipy.sparse import coo_matrix
+        matrix = coo_matrix((values, (rows, columns)),
+                shape=(len(document_labels), len(sorted_label_dict)), dtype=float).tocsr()
+        return matrix, sorted(set(rows))
 
 class SupervisedTopicTrainingBasis:
     """ Holder object for training documents and their classifications from which one or more
         'SupervisedTopicModelTrainer' objects can be derived.
     """
     def __init__(self, *, structural_matcher, classification_ontology, overlap_memory_size,
-            oneshot, verbose):
+            oneshot, verbose, number_of_processes=1, incremental=False):
         """ Parameters:
 
             structural_matcher -- the structural matcher to use.
@@ -363,6 +553,12 @@ class SupervisedTopicTrainingBasis:
             oneshot -- whether the same word or relationship matched multiple times should be
                 counted once only (value 'True') or multiple times (value 'False')
             verbose -- if 'True', information about training progres is outputted to the console.
+            number_of_processes -- the number of worker processes across which the matching of
+                training documents against phraselets is distributed, or '1' if matching should
+                take place within the current process.
+            incremental -- if 'True', training documents may be registered and removed after
+                'prepare()' has been called and 'prepare()' may then be called again. Only
+                documents and phraselets that have not yet been matched are matched.
         """
         self.semantic_analyzer = structural_matcher.semantic_analyzer
         self.structural_matcher = structural_matcher
@@ -376,6 +572,12 @@ class SupervisedTopicTrainingBasis:
         self.classification_implication_dict = {}
         self.labels_to_classification_frequencies = None
         self.serialized_phraselets = []
+        self._serialized_phraselet_labels = set()
+        self.number_of_processes = number_of_processes
+        self.incremental = incremental
+        self._document_labels_to_phraselet_labels = {}
+        self._document_labels_to_phraselet_matches = {}
+        self._matched_phraselet_labels = set()
 
     def parse_and_register_training_document(self, text, classification, label=None):
         """ Parses and registers a document to use for training.
@@ -399,9 +601,7 @@ class SupervisedTopicTrainingBasis:
             label -- a label with which to identify the document in verbose training output,
                 or 'None' if a random label should be assigned.
         """
-        if self.labels_to_classification_frequencies != None:
-            raise RuntimeError(
-                    "register_training_document() may not be called once prepare() has been called")
+        self._check_changes_permitted('register_training_document()')
         if label == None:
             label = str(uuid.uuid4())
         if label in self.training_documents:
@@ -409,22 +609,67 @@ class SupervisedTopicTrainingBasis:
         if self.verbose:
             print('Registering document', label)
         self.training_documents[label] = doc
-        self.serialized_phraselets.extend(
-                self.structural_matcher.register_phraselets(doc,
+        phraselet_labels = set()
+        for serialized_phraselet in self.structural_matcher.register_phraselets(doc,
                 replace_with_hypernym_ancestors=True,
                 match_all_words=False,
-                returning_serialized_phraselets = True))
+                returning_serialized_phraselets = True):
+            phraselet_labels.add(serialized_phraselet.label)
+            # each distinct phraselet is only retained once however many documents contain it
+            if serialized_phraselet.label not in self._serialized_phraselet_labels:
+                self._serialized_phraselet_labels.add(serialized_phraselet.label)
+                self.serialized_phraselets.append(serialized_phraselet)
+        self._document_labels_to_phraselet_labels[label] = phraselet_labels
         self.structural_matcher.register_document(doc, label)
         self.training_documents_labels_to_classifications_dict[label] = classification
 
+    def remove_training_document(self, label):
+        """ Removes a training document. Only permitted once 'prepare()' has been called if the
+            object was created in incremental mode. A changed training document is updated by
+            removing it and registering it again.
+
+            Parameters:
+
+            label -- the label of the document to remove.
+        """
+        self._check_changes_permitted('remove_training_document()')
+        self.training_documents.pop(label)
+        self.training_documents_labels_to_classifications_dict.pop(label)
+        self.structural_matcher.remove_document(label)
+        self._document_labels_to_phraselet_matches.pop(label, None)
+        self._document_labels_to_phraselet_labels.pop(label)
+        remaining_phraselet_labels = set()
+        for phraselet_labels in self._document_labels_to_phraselet_labels.values():
+            remaining_phraselet_labels.update(phraselet_labels)
+        removed_phraselet_labels = self._serialized_phraselet_labels - remaining_phraselet_labels
+        if len(removed_phraselet_labels) > 0:
+            # phraselets derived only from the removed document no longer form part of the
+            # training data; should they recur later, they are matched afresh
+            self.serialized_phraselets = [serialized_phraselet for serialized_phraselet in
+                    self.serialized_phraselets if serialized_phraselet.label not in
+                    removed_phraselet_labels]
+            self._serialized_phraselet_labels = remaining_phraselet_labels
+            self._matched_phraselet_labels -= removed_phraselet_labels
+            for document_label, phraselet_matches in \
+                    self._document_labels_to_phraselet_matches.items():
+                self._document_labels_to_phraselet_matches[document_label] = [phraselet_match
+                        for phraselet_match in phraselet_matches if
+                        phraselet_match.search_phrase_label not in removed_phraselet_labels]
+
+    def _check_changes_permitted(self, method_name):
+        if self.labels_to_classification_frequencies != None:
+            if not self.incremental:
+                raise RuntimeError(''.join((method_name,
+                        " may not be called once prepare() has been called")))
+            # the prepared state is out of date until prepare() is called again
+            self.labels_to_classification_frequencies = None
+
     def register_additional_classification_label(self, label):
         """ Register an additional classification label which no training document has explicitly
             but that should be assigned to documents whose explicit labels are related to the
             additional classification label via the classification ontology.
         """
-        if self.labels_to_classification_frequencies != None:
-            raise RuntimeError(
-                    "register_additional_classification_label() may not be called once prepare() has been called")
+        self._check_changes_permitted('register_additional_classification_label()')
         if self.classification_ontology != None and self.classification_ontology.contains(label):
             self.additional_classification_labels.add(label)
 
@@ -435,23 +680,46 @@ class SupervisedTopicTrainingBasis:
             classification ontology to derive classification implications.
 
             Once this method has been called, the instance no longer accepts new training documents
-            or additional classification labels.
+            or additional classification labels unless it was created in incremental mode. In
+            incremental mode, calling this method again only matches new documents against
+            all phraselets and existing documents against new phraselets.
         """
         if self.labels_to_classification_frequencies != None:
             raise RuntimeError(
                     "prepare() may only be called once")
+        new_document_labels = sorted(label for label in self.training_documents if label not in
+                self._document_labels_to_phraselet_matches)
+        matched_document_labels = sorted(self._document_labels_to_phraselet_matches)
+        new_serialized_phraselets = [serialized_phraselet for serialized_phraselet in
+                self.serialized_phraselets if serialized_phraselet.label not in
+                self._matched_phraselet_labels]
+        if self.verbose:
+            print('Matching', len(new_document_labels), 'documents against all phraselets')
+        phraselet_matches = self._match_documents(self.serialized_phraselets,
+                new_document_labels)
         if self.verbose:
-            print('Matching documents against all phraselets')
+            print('Matching', len(matched_document_labels), 'documents against',
+                    len(new_serialized_phraselets), 'new phraselets')
+        phraselet_matches.extend(self._match_documents(new_serialized_phraselets,
+                matched_document_labels))
+        for document_label in new_document_labels:
+            self._document_labels_to_phraselet_matches[document_label] = []
+        for phraselet_match in phraselet_matches:
+            self._document_labels_to_phraselet_matches[phraselet_match.document_label].append(
+                    phraselet_match)
+        self._matched_phraselet_labels.update(self._serialized_phraselet_labels)
         self.labels_to_classification_frequencies = self._utils.\
                 get_labels_to_classification_frequencies_dict(
-                matches=self.structural_matcher.match(),
+                matches=self.phraselet_matches(self._serialized_phraselet_labels),
                 labels_to_classifications_dict=
                 self.training_documents_labels_to_classifications_dict)
         self.classifications = \
                 sorted(set(self.training_documents_labels_to_classifications_dict.values()
                         ).union(self.additional_classification_labels))
         if len(self.classifications) < 2:
+            self.labels_to_classification_frequencies = None
             raise FewerThanTwoClassificationsError(len(self.classifications))
+        self.classification_implication_dict = {}
         if self.classification_ontology != None:
             for classification in self.classifications:
                 self.classification_ontology.add_to_dictionary(classification)
@@ -463,6 +731,171 @@ class SupervisedTopicTrainingBasis:
                         else:
                             self.classification_implication_dict[child] = [parent]
 
+    def phraselet_matches(self, phraselet_labels):
+        """ Returns the stored *PhraseletMatch* objects for the phraselets with
+            'phraselet_labels' in a deterministic order. Only valid once 'prepare()' has been
+            called.
+        """
+        phraselet_indexes = {serialized_phraselet.label: index for index, serialized_phraselet
+                in enumerate(self.serialized_phraselets)}
+        phraselet_matches = []
+        for document_label in sorted(self._document_labels_to_phraselet_matches):
+            phraselet_matches.extend(sorted((phraselet_match for phraselet_match in
+                    self._document_labels_to_phraselet_matches[document_label] if
+                    phraselet_match.search_phrase_label in phraselet_labels),
+                    key=lambda phraselet_match: (phraselet_match.index_within_document,
+                    phraselet_indexes[phraselet_match.search_phrase_label])))
+        return phraselet_matches
+
+    def _match_documents(self, serialized_phraselets, document_labels):
+        """ Matches the training documents with 'document_labels' against
+            'serialized_phraselets' and returns a list of *PhraseletMatch* objects.
+        """
+        if len(serialized_phraselets) == 0 or len(document_labels) == 0:
+            return []
+        if self.number_of_processes > 1:
+            return self.match_in_processes(serialized_phraselets, document_labels)
+        structural_matcher = self.structural_matcher.matcher_sharing_documents()
+        document_labels = set(document_labels)
+        for document_label in list(structural_matcher.document_labels()):
+            if document_label not in document_labels:
+                structural_matcher.remove_document(document_label)
+        structural_matcher.register_serialized_phraselets(serialized_phraselets)
+        return _to_phraselet_matches(structural_matcher.match())
+
+    def match_in_processes(self, serialized_phraselets, document_labels=None):
+        """ Matches the training documents with 'document_labels', or all training documents
+            if 'document_labels' is 'None', against phraselets using a pool of
+            'number_of_processes' worker processes and returns a list of *PhraseletMatch*
+            objects.
+        """
+        if document_labels == None:
+            document_labels = self.training_documents.keys()
+        return match_phraselets_in_processes(structural_matcher=self.structural_matcher,
+                serialized_phraselets=serialized_phraselets,
+                labels_to_serialized_documents=[(label, self.semantic_analyzer.
+                to_serialized_string(self.training_documents[label])) for label in
+                sorted(document_labels)],
+                number_of_processes=self.number_of_processes)
+
+    save_format_version = 1
+
+    def save(self, path):
+        """ Writes the training documents, their classifications, the phraselets derived from
+            them and the phraselet matches recorded for each document to a file from which
+            'load()' can restore an equivalent object without any document having to be parsed
+            or matched again. The file is written and read sequentially, one document at a time.
+
+            Parameters:
+
+            path -- the path of the file to write.
+        """
+        prepared = self.labels_to_classification_frequencies != None
+        header = {
+                'format': 'holmes_training_basis',
+                'format_version': self.save_format_version,
+                'model': self.semantic_analyzer.model,
+                'classification_ontology_arguments':
+                        self.classification_ontology._construction_arguments() if
+                        self.classification_ontology != None else None,
+                'overlap_memory_size': self._utils.overlap_memory_size,
+                'oneshot': self._utils.oneshot,
+                'incremental': self.incremental,
+                'additional_classification_labels': sorted(
+                        self.additional_classification_labels),
+                'serialized_phraselets': [(serialized_phraselet.label,
+                        serialized_phraselet.template_label, serialized_phraselet.parent_word,
+                        serialized_phraselet.child_word) for serialized_phraselet in
+                        self.serialized_phraselets],
+                'matched_phraselet_labels': sorted(self._matched_phraselet_labels),
+                'labels_to_classification_frequencies':
+                        self.labels_to_classification_frequencies,
+                'classifications': self.classifications if prepared else None,
+                'classification_implication_dict': self.classification_implication_dict,
+                'number_of_documents': len(self.training_documents)}
+        with open(path, 'wb') as file:
+            pickler = pickle.Pickler(file, protocol=pickle.HIGHEST_PROTOCOL)
+            pickler.dump(header)
+            for label, doc in self.training_documents.items():
+                # 'None' rather than an empty list signifies a document not yet matched
+                pickler.dump((label, self.semantic_analyzer._to_serialized_document(doc),
+                        self.structural_matcher._registered_documents[label].
+                        words_to_token_indexes_dict,
+                        self.training_documents_labels_to_classifications_dict[label],
+                        sorted(self._document_labels_to_phraselet_labels[label]),
+                        self._document_labels_to_phraselet_matches.get(label)))
+                # the pickler would otherwise retain every document written
+                pickler.clear_memo()
+
+    def load(self, path):
+        """ Restores the state written by 'save()' into this object, which must not yet
+            contain any training documents. The settings recorded in the file replace those
+            with which this object was created, apart from 'verbose' and
+            'number_of_processes'. The file contains pickled Python objects and should only be
+            loaded from trusted sources.
+
+            Parameters:
+
+            path -- the path of the file written by 'save()'.
+        """
+        if len(self.training_documents) > 0:
+            raise RuntimeError("load() may only be called on an empty training basis")
+        with open(path, 'rb') as file:
+            unpickler = pickle.Unpickler(file)
+            try:
+                header = unpickler.load()
+                if not isinstance(header, dict) or \
+                        header.get('format') != 'holmes_training_basis':
+                    raise UnsupportedSnapshotFormatError('Not a Holmes training basis')
+                if header['format_version'] != self.save_format_version:
+                    raise UnsupportedSnapshotFormatError(' '.join(('Format version:',
+                            str(header['format_version']))))
+            except (pickle.UnpicklingError, EOFError, AttributeError, KeyError) as exception:
+                raise UnsupportedSnapshotFormatError(str(exception))
+            if header['model'] != self.semantic_analyzer.model:
+                raise WrongModelDeserializationError(header['model'])
+            if header['classification_ontology_arguments'] == None:
+                self.classification_ontology = None
+            elif self.classification_ontology == None or \
+                    self.classification_ontology._construction_arguments() != \
+                    header['classification_ontology_arguments']:
+                self.classification_ontology = Ontology(
+                        **header['classification_ontology_arguments'])
+            self._utils = SupervisedTopicTrainingUtils(header['overlap_memory_size'],
+                    header['oneshot'])
+            self.incremental = header['incremental']
+            self.additional_classification_labels = set(
+                    header['additional_classification_labels'])
+            self.serialized_phraselets = [SerializedPhraselet(*serialized_phraselet) for
+                    serialized_phraselet in header['serialized_phraselets']]
+            self._serialized_phraselet_labels = set(serialized_phraselet.label for
+                    serialized_phraselet in self.serialized_phraselets)
+            self._matched_phraselet_labels = set(header['matched_phraselet_labels'])
+            self.structural_matcher.register_serialized_phraselets(self.serialized_phraselets)
+            try:
+                for _ in range(header['number_of_documents']):
+                    label, serialized_document, words_to_token_indexes_dict, classification, \
+                            phraselet_labels, phraselet_matches = unpickler.load()
+                    doc = serialized_document.holmes_document(self.semantic_analyzer)
+                    self.training_documents[label] = doc
+                    self.training_documents_labels_to_classifications_dict[label] = \
+                            classification
+                    self._document_labels_to_phraselet_labels[label] = set(phraselet_labels)
+                    if phraselet_matches != None:
+                        self._document_labels_to_phraselet_matches[label] = phraselet_matches
+                    self.structural_matcher._register_document_with_index(doc, label,
+                            words_to_token_indexes_dict)
+            except (pickle.UnpicklingError, EOFError, AttributeError) as exception:
+                raise UnsupportedSnapshotFormatError(str(exception))
+        if header['labels_to_classification_frequencies'] != None:
+            self.classifications = header['classifications']
+            self.classification_implication_dict = header['classification_implication_dict']
+            if self.classification_ontology != None:
+                for classification in self.classifications:
+                    self.classification_ontology.add_to_dictionary(classification)
+            self.labels_to_classification_frequencies = \
+                    header['labels_to_classification_frequencies']
+
     def train(self, *, minimum_occurrences=4, cv_threshold=1.0, mlp_activation='relu',
             mlp_solver='adam', mlp_learning_rate='constant', mlp_learning_rate_init=0.001,
             mlp_max_iter=200, mlp_shuffle=True, mlp_random_state=42, oneshot=True,
@@ -492,7 +925,9 @@ class SupervisedTopicTrainingBasis:
         return SupervisedTopicModelTrainer(
                 training_basis = self,
                 semantic_analyzer = self.semantic_analyzer,
-                structural_matcher = self.structural_matcher,
+                # the trainer and its classifier register the filtered phraselets on a private
+                # structural matcher so that the phraselets of this object remain registered
+                structural_matcher = self.structural_matcher._new_structural_matcher(),
                 labels_to_classification_frequencies = self.labels_to_classification_frequencies,
                 serialized_phraselets = self.serialized_phraselets,
                 minimum_occurrences = minimum_occurrences,
@@ -534,23 +969,18 @@ class SupervisedTopicModelTrainer:
         self._sorted_label_dict = {}
         for index, label in enumerate(sorted(self._labels_to_classification_frequencies.keys())):
             self._sorted_label_dict[label] = index
-        self._input_matrix = dok_matrix((len(self._training_basis.training_documents),
-                len(self._sorted_label_dict)))
-        self._output_matrix = dok_matrix((len(self._training_basis.training_documents),
-                len(self._training_basis.classifications)))
-
         if self._training_basis.verbose:
-            print('Matching documents against filtered phraselets')
-        for index, document_label in enumerate(sorted(self._training_basis.
-                training_documents.keys())):
-            self._utils.record_matches(
-                    structural_matcher = self._structural_matcher,
-                    sorted_label_dict = self._sorted_label_dict,
-                    doc=self._training_basis.training_documents[document_label],
-                    doc_label=document_label,
-                    matrix=self._input_matrix,
-                    row_index=index)
-            self._record_classifications_for_training(document_label, index)
+            print('Recording matches against filtered phraselets')
+        sorted_document_labels = sorted(self._training_basis.training_documents.keys())
+        # the matches recorded during preparation are reused: restricting them to the filtered
+        # phraselets gives the same result as matching the documents again
+        self._input_matrix, _ = self._utils.get_feature_matrix_from_phraselet_matches(
+                phraselet_matches = self._training_basis.phraselet_matches(
+                {serialized_phraselet.label for serialized_phraselet in
+                self._serialized_phraselets}),
+                sorted_label_dict = self._sorted_label_dict,
+                document_labels = sorted_document_labels)
+        self._output_matrix = self._get_output_matrix(sorted_document_labels)
         self._hidden_layer_sizes = hidden_layer_sizes
         if self._hidden_layer_sizes == None:
             start = len(self._sorted_label_dict)
@@ -558,6 +988,7 @@ class SupervisedTopicModelTrainer:
             self._hidden_layer_sizes = [start, int(start+step), int(start+(2*step))]
         if self._training_basis.verbose:
             print('Hidden layer sizes:', self._hidden_layer_sizes)
+        from sklearn.neural_network import MLPClassifier
         self._mlp = MLPClassifier(
                 activation=mlp_activation,
                 solver=mlp_solver,
@@ -573,75 +1004,75 @@ class SupervisedTopicModelTrainer:
             print('MLP neural network converged after', self._mlp.n_iter_, 'iterations.')
 
     def _filter(self, labels_to_classification_frequencies, serialized_phraselets):
-        """ Filters the phraselets in memory based on minimum_occurrences and cv_threshold. """
+        """ Filters the phraselets in memory based on minimum_occurrences and cv_threshold. The
+            filters are evaluated for all labels at once on a matrix with a row for each label
+            and a column for each explicit classification label.
+        """
 
-        def increment_totals(classification_frequencies):
-            for classification, frequency in classification_frequencies.items():
-                if classification in totals:
-                    totals[classification] += frequency
-                else:
-                    totals[classification] = frequency
-
-        totals = {}
-        accepted = 0
-        under_minimum_occurrences = 0
-        under_minimum_cv = 0
-        for classification_frequencies in labels_to_classification_frequencies.values():
-            increment_totals(classification_frequencies)
-        new_labels_to_classification_frequencies = {}
-        new_serialized_phraselets = set()
-        for label, classification_frequencies in labels_to_classification_frequencies.items():
-            at_least_minimum = False
-            working_classification_frequencies = classification_frequencies.copy()
-            for classification in working_classification_frequencies:
-                if working_classification_frequencies[classification] >= self._minimum_occurrences:
-                    at_least_minimum = True
-                working_classification_frequencies[classification] *= totals[classification]
-            if not at_least_minimum:
-                under_minimum_occurrences += 1
-                continue
-            frequency_list = list(working_classification_frequencies.values())
-            # We only want to take explicit classification labels into account, i.e. ignore the
-            # classification ontology.
-            number_of_classification_labels = \
-                len(set(
-                self._training_basis.training_documents_labels_to_classifications_dict.values()))
-            frequency_list.extend([0] * number_of_classification_labels)
-            frequency_list = frequency_list[:number_of_classification_labels]
-            if statistics.pstdev(frequency_list) / statistics.mean(frequency_list) >= \
-                    self._cv_threshold:
-                accepted += 1
-                new_labels_to_classification_frequencies[label] = classification_frequencies
-            else:
-                under_minimum_cv += 1
+        labels = list(labels_to_classification_frequencies.keys())
+        # We only want to take explicit classification labels into account, i.e. ignore the
+        # classification ontology.
+        classification_indexes = {classification: index for index, classification in
+                enumerate(sorted(set(self._training_basis.
+                training_documents_labels_to_classifications_dict.values())))}
+        rows = []
+        columns = []
+        values = []
+        for index, label in enumerate(labels):
+            for classification, frequency in labels_to_classification_frequencies[label].items():
+                rows.append(index)
+                columns.append(classification_indexes[classification])
+                values.append(frequency)
+        frequencies = np.zeros((len(labels), len(classification_indexes)))
+        frequencies[rows, columns] = values
+        at_least_minimum = (frequencies >= self._minimum_occurrences).any(axis=1)
+        weighted_frequencies = frequencies * frequencies.sum(axis=0)
+        at_least_cv_threshold = weighted_frequencies.std(axis=1) / \
+                weighted_frequencies.mean(axis=1) >= self._cv_threshold
+        accepted_indexes = np.flatnonzero(at_least_minimum & at_least_cv_threshold)
+        new_labels_to_classification_frequencies = {labels[index]:
+                labels_to_classification_frequencies[labels[index]] for index in accepted_indexes}
         if self._training_basis.verbose:
-            print('Filtered: accepted', accepted, '; removed minimum occurrences',
-                under_minimum_occurrences, '; removed cv threshold',
-                under_minimum_cv)
-        for serialized_phraselet in serialized_phraselets:
-            if serialized_phraselet.label in \
-                    new_labels_to_classification_frequencies.keys():
-                new_serialized_phraselets.add(serialized_phraselet)
+            print('Filtered: accepted', len(accepted_indexes), '; removed minimum occurrences',
+                len(labels) - int(at_least_minimum.sum()), '; removed cv threshold',
+                int(at_least_minimum.sum()) - len(accepted_indexes))
+        new_serialized_phraselets = {serialized_phraselet for serialized_phraselet in
+                serialized_phraselets if serialized_phraselet.label in
+                new_labels_to_classification_frequencies}
         return new_labels_to_classification_frequencies, new_serialized_phraselets
 
-    def _record_classifications_for_training(self, document_label, index):
-        classification = \
-                self._training_basis.training_documents_labels_to_classifications_dict[
-                document_label]
-        classification_index = self._training_basis.classifications.index(classification)
-        self._output_matrix[index, classification_index] = 1
-        if classification in self._training_basis.classification_implication_dict:
-            for implied_classification in \
-                    self._training_basis.classification_implication_dict[classification]:
-                implied_classification_index = self._training_basis.classifications.index(
-                        implied_classification)
-                self._output_matrix[index, implied_classification_index] = 1
+    def _get_output_matrix(self, sorted_document_labels):
+        """ Returns a CSR matrix with a row for each training document and a column for each
+            classification label that records the explicit and implied classifications of
+            each document.
+        """
+        classification_indexes = {classification: index for index, classification in
+                enumerate(self._training_basis.classifications)}
+        rows = []
+        columns = []
+        for index, document_label in enumerate(sorted_document_labels):
+            classification = \
+                    self._training_basis.training_documents_labels_to_classifications_dict[
+                    document_label]
+            column_indexes = {classification_indexes[classification]}
+            if classification in self._training_basis.classification_implication_dict:
+                for implied_classification in \
+                        self._training_basis.classification_implication_dict[classification]:
+                    column_indexes.add(classification_indexes[implied_classification])
+            # duplicate coordinates would be summed when the matrix is built
+            for column_index in sorted(column_indexes):
+                rows.append(index)
+                columns.append(column_index)
+        from scipy.sparse import coo_matrix
+        return coo_matrix(([1] * len(rows), (rows, columns)),
+                shape=(len(sorted_document_labels), len(self._training_basis.classifications)),
+                dtype=float).tocsr()
 
     def classifier(self):
         """ Returns a supervised topic classifier which contains no explicit references to the
             training data and that can be serialized.
         """
-        self._structural_matcher.output_document_matching_message_to_console = False
+        self._structural_matcher.progress_reporter = None
         self._mlp.verbose=False # we no longer require output once we are using the model
                                 # to classify new documents
         model = SupervisedTopicClassifierModel(
@@ -689,9 +1120,67 @@ class SupervisedTopicClassifierModel:
         self.overlap_memory_size = overlap_memory_size
         self.oneshot = oneshot
 
+class _NumpyMlp:
+    """ Evaluates a trained neural network using NumPy alone. Offers the *predict()* and
+        *predict_proba()* methods of *MLPClassifier* for the multilabel networks generated
+        during supervised topic training.
+
+        Parameters:
+
+        coefs -- the weight matrices of the layers.
+        intercepts -- the bias vectors of the layers.
+        activation -- the activation function of the hidden layers.
+        out_activation -- the activation function of the output layer.
+    """
+
+    def __init__(self, coefs, intercepts, activation, out_activation):
+        self.coefs = coefs
+        self.intercepts = intercepts
+        self.activation = activation
+        self.out_activation = out_activation
+
+    @classmethod
+    def from_mlp(cls, mlp):
+        if isinstance(mlp, cls):
+            return mlp
+        return cls(mlp.coefs_, mlp.intercepts_, mlp.activation, mlp.out_activation_)
+
+    @staticmethod
+    def _activate(function_name, values):
+        if function_name == 'identity':
+            return values
+        if function_name == 'logistic':
+            return 1 / (1 + np.exp(-values))
+        if function_name == 'tanh':
+            return np.tanh(values)
+        if function_name == 'relu':
+            return np.maximum(values, 0)
+        if function_name == 'softmax':
+            exponentials = np.exp(values - values.max(axis=1)[:, np.newaxis])
+            return exponentials / exponentials.sum(axis=1)[:, np.newaxis]
+        raise UnsupportedModelFormatError(' '.join(('Activation function:', function_name)))
+
+    def predict_proba(self, feature_matrix):
+        values = feature_matrix
+        for index, (coef, intercept) in enumerate(zip(self.coefs, self.intercepts)):
+            values = values.dot(coef) + intercept
+            if index < len(self.coefs) - 1:
+                values = self._activate(self.activation, values)
+        return self._activate(self.out_activation, values)
+
+    def predict(self, feature_matrix):
+        probabilities = self.predict_proba(feature_matrix)
+        if self.out_activation == 'softmax':
+            predictions = np.zeros(probabilities.shape, dtype=int)
+            predictions[np.arange(probabilities.shape[0]), probabilities.argmax(axis=1)] = 1
+            return predictions
+        return (probabilities > 0.5).astype(int)
+
 class SupervisedTopicClassifier:
     """ Classifies new documents based on a pre-trained model."""
 
+    binary_model_format_version = 1
+
     def __init__(self, semantic_analyzer, structural_matcher, model):
         self._semantic_analyzer = semantic_analyzer
         self._structural_matcher = structural_matcher
@@ -727,29 +1216,138 @@ class SupervisedTopicClassifier:
 
             doc -- the pre-parsed document to classify.
         """
+        return self.classify_many([doc])[0]
+
+    def parse_and_classify_many(self, texts):
+        """ Returns a list containing a list of classifications for each text as returned by
+            *parse_and_classify()*. The texts are parsed as a single batch.
+
+            Parameter:
+
+            texts -- the texts to parse and classify.
+        """
+        return self.classify_many(self._semantic_analyzer.parse_batch(texts))
+
+    def classify_many(self, docs):
+        """ Returns a list containing a list of classifications for each document as returned by
+            *classify()*. The documents are matched in a single pass and the neural network is
+            evaluated once for all documents, which is considerably faster than classifying the
+            documents one by one.
+
+            Parameter:
+
+            docs -- the pre-parsed documents to classify.
+        """
 
         if self._model == None:
             raise RuntimeError('No model defined')
-        new_document_matrix = dok_matrix((1, len(self._model.sorted_label_dict)))
-        if not self._utils.record_matches(structural_matcher=self._structural_matcher,
+        classifications_list = [[] for doc in docs]
+        if len(docs) == 0:
+            return classifications_list
+        feature_matrix, matched_row_indexes = self._utils.get_feature_matrix(
+                structural_matcher=self._structural_matcher,
                 sorted_label_dict=self._model.sorted_label_dict,
-                doc=doc,
-                doc_label=None,
-                matrix=new_document_matrix,
-                row_index=0):
-            return []
-        else:
-            classification_indexes = self._model.mlp.predict(new_document_matrix).nonzero()[1]
-            if len(classification_indexes) > 1:
-                probabilities = self._model.mlp.predict_proba(new_document_matrix)
-                classification_indexes = sorted(classification_indexes, key=lambda index:
-                        1-probabilities[0,index])
-            return list(map(lambda index:self._model.classifications[index],
-                    classification_indexes))
+                docs=docs)
+        if len(matched_row_indexes) == 0:
+            return classifications_list
+        matched_feature_matrix = feature_matrix[matched_row_indexes]
+        prediction_rows, prediction_columns = \
+                self._model.mlp.predict(matched_feature_matrix).nonzero()
+        probabilities = self._model.mlp.predict_proba(matched_feature_matrix)
+        classification_indexes_list = [[] for index in matched_row_indexes]
+        for prediction_row, prediction_column in sorted(zip(prediction_rows,
+                prediction_columns)):
+            classification_indexes_list[prediction_row].append(prediction_column)
+        for prediction_row, classification_indexes in enumerate(classification_indexes_list):
+            classification_indexes = sorted(classification_indexes, key=lambda index:
+                    1-probabilities[prediction_row, index])
+            classifications_list[matched_row_indexes[prediction_row]] = list(map(
+                    lambda index:self._model.classifications[index], classification_indexes))
+        return classifications_list
 
     def serialize_model(self):
+        import jsonpickle
         return jsonpickle.encode(self._model)
 
     def deserialize_model(self, serialized_model):
+        import jsonpickle
         self._model = jsonpickle.decode(serialized_model)
         self._load_model(self._model)
+
+    def serialize_model_to_bytes(self):
+        """ Returns the model in a compact, versioned binary format that is considerably smaller
+            and faster to load than the representation returned by *serialize_model()*. The
+            format is a NumPy *.npz* archive holding the neural network weights alongside a
+            header that contains the phraselet table and the other model settings. Any ontology
+            is recorded as a reference to its file, which must also be available when the model
+            is loaded.
+        """
+        if self._model == None:
+            raise RuntimeError('No model defined')
+        mlp = _NumpyMlp.from_mlp(self._model.mlp)
+        ontology = self._model.structural_matcher_ontology
+        header = {
+                'format_version': self.binary_model_format_version,
+                'semantic_analyzer_model': self._model.semantic_analyzer_model,
+                'ontology_arguments': ontology._construction_arguments() if ontology != None
+                        else None,
+                'phraselets': [[phraselet.label, phraselet.template_label,
+                        phraselet.parent_word, phraselet.child_word] for phraselet in
+                        self._model.serialized_phraselets],
+                'sorted_labels': sorted(self._model.sorted_label_dict,
+                        key=self._model.sorted_label_dict.get),
+                'classifications': self._model.classifications,
+                'overlap_memory_size': self._model.overlap_memory_size,
+                'oneshot': self._model.oneshot,
+                'activation': mlp.activation,
+                'out_activation': mlp.out_activation,
+                'number_of_layers': len(mlp.coefs)}
+        arrays = {'header': np.frombuffer(json.dumps(header).encode('utf-8'), dtype=np.uint8)}
+        for index, (coef, intercept) in enumerate(zip(mlp.coefs, mlp.intercepts)):
+            arrays['coefs_' + str(index)] = coef
+            arrays['intercepts_' + str(index)] = intercept
+        output = io.BytesIO()
+        np.savez_compressed(output, **arrays)
+        return output.getvalue()
+
+    def deserialize_model_from_bytes(self, serialized_model):
+        """ Loads a model in the format returned by *serialize_model_to_bytes()*. The neural
+            network is evaluated using NumPy alone. Where the model was trained with the
+            same ontology as the one used by this classifier, the loaded ontology is reused
+            rather than being read again.
+        """
+        try:
+            with np.load(io.BytesIO(serialized_model), allow_pickle=False) as archive:
+                header = json.loads(archive['header'].tobytes().decode('utf-8'))
+                if header['format_version'] != self.binary_model_format_version:
+                    raise UnsupportedModelFormatError(' '.join(('Format version:',
+                            str(header['format_version']))))
+                coefs = []
+                intercepts = []
+                for index in range(header['number_of_layers']):
+                    coefs.append(archive['coefs_' + str(index)])
+                    intercepts.append(archive['intercepts_' + str(index)])
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile) as exception:
+            raise UnsupportedModelFormatError(str(exception))
+        ontology_arguments = header['ontology_arguments']
+        current_ontology = self._structural_matcher.ontology
+        if ontology_arguments == None:
+            ontology = None
+        elif current_ontology != None and \
+                current_ontology._construction_arguments() == ontology_arguments:
+            ontology = current_ontology
+        else:
+            ontology = Ontology(**ontology_arguments)
+        self._model = SupervisedTopicClassifierModel(
+                semantic_analyzer_model = header['semantic_analyzer_model'],
+                structural_matcher_ontology = ontology,
+                serialized_phraselets = [SerializedPhraselet(*phraselet) for phraselet in
+                        header['phraselets']],
+                mlp = _NumpyMlp(coefs, intercepts, header['activation'],
+                        header['out_activation']),
+                sorted_label_dict = {label: index for index, label in
+                        enumerate(header['sorted_labels'])},
+                classifications = header['classifications'],
+                overlap_memory_size = header['overlap_memory_size'],
+                oneshot = header['oneshot'])
+        self._load_model(self._model)
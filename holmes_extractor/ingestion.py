@@ -0,0 +1,55 @@
+import json
+import os
+
+def document_paths(paths):
+    """Yields the paths of the files named in *paths*. Directories are replaced by the files
+        they directly contain, in alphabetical order.
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            for file_name in sorted(os.listdir(path)):
+                file_path = os.path.join(path, file_name)
+                if os.path.isfile(file_path):
+                    yield file_path
+        else:
+            yield path
+
+_json_lines_extensions = ('.jsonl', '.jl')
+
+def read_documents(paths, *, text_property='text', label_property='label', encoding='utf-8'):
+    """Yields a (label, text) tuple for each document held in the files named in *paths*, reading
+        the files lazily so that only the document currently being yielded is held in memory.
+        Files with the extension *.jsonl* or *.jl* are read as JSON Lines files with one
+        document per line; all other files are read as text files each containing a single
+        document labelled with the file name.
+
+    Args:
+
+    paths -- an iterable of file and directory paths. Directories are replaced by the files they
+        directly contain.
+    text_property -- the property of each JSON Lines object that holds the document text.
+    label_property -- the property of each JSON Lines object that holds the document label. If
+        an object has no such property, the document is labelled with the file name and the
+        line number, e.g. *'documents.jsonl:3'*.
+    encoding -- the encoding of the files.
+    """
+    for path in document_paths(paths):
+        file_name = os.path.basename(path)
+        with open(path, encoding=encoding) as file:
+            if not path.lower().endswith(_json_lines_extensions):
+                yield file_name, file.read()
+                continue
+            for line_number, line in enumerate(file, start=1):
+                if line.strip() == '':
+                    continue
+                try:
+                    document = json.loads(line)
+                    text = document[text_property]
+                except (ValueError, KeyError, TypeError) as exception:
+                    raise ValueError(''.join(('Line ', str(line_number), ' of ', path,
+                            ' is not a JSON object with the property \'', text_property,
+                            '\'.'))) from exception
+                label = document.get(label_property)
+                if label == None:
+                    label = ':'.join((file_name, str(line_number)))
+                yield str(label), text
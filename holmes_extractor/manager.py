@@ -1,7 +1,14 @@
 import copy
+import itertools
+import pickle
 import sys
 from .errors import *
-from .structural_matching import StructuralMatcher
+from .structural_matching import StructuralMatcher, ResultList
+from .caching import LruCache
+from .metrics import timer
+from .progress import ConsoleProgressReporter, _ProgressTracker
+from .ingestion import read_documents
+from .ontology import Ontology
 from .semantics import SemanticAnalyzerFactory
 from .extensive_matching import *
 from .consoles import HolmesConsoles
@@ -22,13 +29,35 @@ class Manager:
         should be performed depending on whether the model supports it. Defaults to *None*.
     debug -- a boolean value specifying whether debug representations should be outputted
         for parsed sentences. Defaults to *False*.
+    search_phrase_cache_size -- the maximum number of search phrases that are retained so that
+        registering or matching the same search phrase text again does not require it to be
+        parsed, or *0* if no search phrases should be retained. Defaults to *1000*.
+    topic_match_cache_size -- the maximum number of topic match results that are retained so
+        that repeating a topic match query with the same parameters does not require it to be
+        processed again, or *0* if no results should be retained. Retained results are
+        discarded whenever a document is registered or removed. Defaults to *100*.
+    metrics -- optionally, a *Metrics* object in which the wall time spent in each parsing and
+        matching stage and counts of the matching work performed are recorded, see *stats()*.
+        Defaults to *None*, in which case nothing is recorded.
+    match_budget -- optionally, a *MatchBudget* object limiting the work performed by each call
+        that matches search phrases against documents, including topic matching. Defaults to
+        *None* (no limits).
+    disabled_pipes -- the names of spaCy pipeline components that are not required and should
+        not be loaded, e.g. *('ner',)* if entity matching is not used. Defaults to *()*.
+
+    The spaCy model is only loaded when it is first required, e.g. to parse a document, and is
+    shared with all other *Manager* objects within the process that use the same model and
+    disabled pipeline components.
     """
 
     def __init__(self, model, *, overall_similarity_threshold=1.0,
             embedding_based_matching_on_root_words=False, ontology=None,
-            perform_coreference_resolution=None, debug=False):
+            perform_coreference_resolution=None, debug=False, search_phrase_cache_size=1000,
+            topic_match_cache_size=100, metrics=None, match_budget=None, disabled_pipes=()):
         self.semantic_analyzer = SemanticAnalyzerFactory().semantic_analyzer(model=model,
-                debug=debug)
+                debug=debug, disabled_pipes=disabled_pipes)
+        self.semantic_analyzer.metrics = metrics
+        self.metrics = metrics
         if perform_coreference_resolution == None:
             perform_coreference_resolution = \
                     self.semantic_analyzer.model_supports_coreference_resolution()
@@ -39,9 +68,19 @@ class Manager:
         self.overall_similarity_threshold = overall_similarity_threshold
         self.embedding_based_matching_on_root_words = embedding_based_matching_on_root_words
         self.perform_coreference_resolution = perform_coreference_resolution
+        if search_phrase_cache_size > 0:
+            self._search_phrase_cache = LruCache(search_phrase_cache_size)
+        else:
+            self._search_phrase_cache = None
         self.structural_matcher = StructuralMatcher(self.semantic_analyzer, ontology,
                 overall_similarity_threshold, embedding_based_matching_on_root_words,
-                perform_coreference_resolution)
+                perform_coreference_resolution, search_phrase_cache=self._search_phrase_cache,
+                metrics=metrics, match_budget=match_budget)
+        if topic_match_cache_size > 0:
+            self._topic_match_cache = LruCache(topic_match_cache_size)
+        else:
+            self._topic_match_cache = None
+        self._topic_match_cache_document_version = None
         self.documents = {}
 
     def _validate_options(self, overall_similarity_threshold,
@@ -73,6 +112,103 @@ class Manager:
         self.structural_matcher.register_document(self.semantic_analyzer.parse(document_text),
                 label)
 
+    def parse_and_register_document_in_chunks(self, document_text, label='', *,
+            maximum_chunk_size=100000, overlap=1000):
+        """Registers a document of any length, including documents that are too long to be
+            parsed with *parse_and_register_document()*. The text is divided at paragraph or,
+            where necessary, sentence boundaries into chunks that spaCy parses one at a time, and
+            the chunks are then registered as a single document, so that matching and topic
+            matching work across chunk boundaries and token indexes refer to the whole document.
+            Coreference resolution is not performed on documents registered in this way.
+
+        Args:
+
+        document_text -- the raw document text.
+        label -- a label for the document which must be unique. Defaults to the empty string.
+        maximum_chunk_size -- the maximum number of characters in each chunk. Defaults to
+            *100000*.
+        overlap -- the maximum number of characters preceding each chunk that are parsed
+            together with it so that spaCy has some context. Defaults to *1000*.
+        """
+        self.structural_matcher.register_document(self.semantic_analyzer.parse_in_chunks(
+                document_text, maximum_chunk_size=maximum_chunk_size, overlap=overlap), label)
+
+    def parse_and_register_documents(self, labelled_texts, *, batch_size=32,
+            progress_reporter=None):
+        """Parses and registers documents supplied as an iterable of (label, text) tuples, e.g. a
+            generator. Tuples are only taken from the iterable when the documents taken before
+            them have been registered, and are parsed in batches of *batch_size*, so that no
+            more than one batch of document texts is held in memory at once however many
+            documents are supplied. Documents that are too long to be parsed in one piece are
+            registered as by *parse_and_register_document_in_chunks()*. Returns the number of
+            documents registered.
+
+        Args:
+
+        labelled_texts -- an iterable of (label, text) tuples. Labels must be unique.
+        batch_size -- the number of documents passed to spaCy together. Defaults to *32*.
+        progress_reporter -- optionally, a *ProgressReporter* object that is informed whenever
+            a document has been registered.
+        """
+        if batch_size < 1:
+            raise ValueError('batch_size must be positive')
+        if progress_reporter != None:
+            progress_tracker = _ProgressTracker(progress_reporter, 'registration')
+        else:
+            progress_tracker = None
+        labelled_texts = iter(labelled_texts)
+        number_registered = 0
+        while True:
+            batch = list(itertools.islice(labelled_texts, batch_size))
+            if len(batch) == 0:
+                break
+            labels_in_batch = set()
+            for label, _ in batch:
+                if label in labels_in_batch or label in self.structural_matcher.document_labels():
+                    raise DuplicateDocumentError(label)
+                labels_in_batch.add(label)
+            maximum_document_size = self.semantic_analyzer._maximum_document_size
+            docs = iter(self.semantic_analyzer.parse_batch([text for _, text in batch
+                    if len(text) <= maximum_document_size], batch_size=batch_size))
+            for label, text in batch:
+                if len(text) <= maximum_document_size:
+                    doc = next(docs)
+                else:
+                    doc = self.semantic_analyzer.parse_in_chunks(text)
+                self.structural_matcher.register_document(doc, label)
+                number_registered += 1
+                if progress_tracker != None:
+                    progress_tracker.advance(label, len(text))
+        if progress_tracker != None:
+            progress_tracker.finish()
+        return number_registered
+
+    def register_documents_from_paths(self, paths, *, batch_size=32, progress_reporter=None,
+            text_property='text', label_property='label', encoding='utf-8'):
+        """Reads, parses and registers the documents held in text files and JSON Lines files,
+            reading the files lazily as described for *parse_and_register_documents()*. Each text
+            file holds a single document labelled with its file name. Files with the extension
+            *.jsonl* or *.jl* hold one JSON object per line. Returns the number of documents
+            registered.
+
+        Args:
+
+        paths -- an iterable of file and directory paths. Directories are replaced by the files
+            they directly contain, in alphabetical order.
+        batch_size -- the number of documents passed to spaCy together. Defaults to *32*.
+        progress_reporter -- optionally, a *ProgressReporter* object that is informed whenever
+            a document has been registered.
+        text_property -- the property of each JSON Lines object that holds the document text.
+            Defaults to *'text'*.
+        label_property -- the property of each JSON Lines object that holds the document label.
+            Defaults to *'label'*. Objects without the property are labelled with the file name
+            and line number, e.g. *'documents.jsonl:3'*.
+        encoding -- the encoding of the files. Defaults to *'utf-8'*.
+        """
+        return self.parse_and_register_documents(read_documents(paths,
+                text_property=text_property, label_property=label_property,
+                encoding=encoding), batch_size=batch_size, progress_reporter=progress_reporter)
+
     def register_parsed_document(self, document, label=''):
         """Args:
 
@@ -91,8 +227,6 @@ class Manager:
             which is intended for use cases where single documents (user entries) are
             matched to predefined search phrases.
         """
-        if self.semantic_analyzer.model_supports_coreference_resolution():
-            raise SerializationNotSupportedError(self.semantic_analyzer.model)
         doc = self.semantic_analyzer.from_serialized_string(document)
         self.semantic_analyzer.debug_structures(doc) # only has effect when debug=True
         self.structural_matcher.register_document(doc, label)
@@ -121,14 +255,120 @@ class Manager:
         label -- the label of the document to be serialized.
         """
 
-        if self.semantic_analyzer.model_supports_coreference_resolution():
-            raise SerializationNotSupportedError(self.semantic_analyzer.model)
         doc = self.structural_matcher.get_document(label)
         if doc != None:
             return self.semantic_analyzer.to_serialized_string(doc)
         else:
             return None
 
+    snapshot_format_version = 2
+
+    def save_snapshot(self, path):
+        """Writes the configuration of this object together with all registered documents and
+            search phrases to a single file from which an equivalent object can be created using
+            *load_snapshot()* without any text having to be parsed again. The file is written
+            and read sequentially, one document at a time. Any ontology is recorded as a
+            reference to its file, which must also be available when the snapshot is loaded.
+
+        Args:
+
+        path -- the path of the file to write.
+        """
+        structural_matcher = self.structural_matcher
+        # copies are written so that documents and search phrases may be registered by other
+        # threads while the snapshot is being taken
+        registered_documents = list(structural_matcher._registered_documents.items())
+        search_phrases = list(structural_matcher.search_phrases)
+        header = {
+                'format': 'holmes_snapshot',
+                'format_version': self.snapshot_format_version,
+                'model': self.semantic_analyzer.model,
+                'disabled_pipes': self.semantic_analyzer.disabled_pipes,
+                'overall_similarity_threshold': self.overall_similarity_threshold,
+                'embedding_based_matching_on_root_words':
+                        self.embedding_based_matching_on_root_words,
+                'ontology_arguments': self.ontology._construction_arguments() if
+                        self.ontology != None else None,
+                'perform_coreference_resolution': self.perform_coreference_resolution,
+                'search_phrase_cache_size': self._search_phrase_cache.maximum_size if
+                        self._search_phrase_cache != None else 0,
+                'topic_match_cache_size': self._topic_match_cache.maximum_size if
+                        self._topic_match_cache != None else 0,
+                'number_of_documents': len(registered_documents),
+                'number_of_search_phrases': len(search_phrases)}
+        with open(path, 'wb') as file:
+            pickler = pickle.Pickler(file, protocol=pickle.HIGHEST_PROTOCOL)
+            pickler.dump(header)
+            for label, registered_document in registered_documents:
+                pickler.dump((label, self.semantic_analyzer._to_serialized_document(
+                        registered_document.doc),
+                        registered_document.words_to_token_indexes_dict))
+                # the pickler would otherwise retain every document written
+                pickler.clear_memo()
+            for search_phrase in search_phrases:
+                pickler.dump((search_phrase.label, self.semantic_analyzer._to_serialized_document(
+                        search_phrase.doc),
+                        [token.i for token in search_phrase.matchable_tokens],
+                        search_phrase.root_token.i, search_phrase.topic_match_phraselet))
+                pickler.clear_memo()
+
+    @classmethod
+    def load_snapshot(cls, path, *, debug=False, metrics=None, match_budget=None):
+        """Returns a new *Manager* object with the configuration, documents and search phrases
+            stored in a file written by *save_snapshot()*. Snapshots contain pickled Python
+            objects and should only be loaded from trusted sources.
+
+        Args:
+
+        path -- the path of the snapshot file.
+        debug -- see the *Manager* constructor. Defaults to *False*.
+        metrics -- see the *Manager* constructor. Defaults to *None*.
+        match_budget -- see the *Manager* constructor. Defaults to *None*.
+        """
+        with open(path, 'rb') as file:
+            unpickler = pickle.Unpickler(file)
+            try:
+                header = unpickler.load()
+                if not isinstance(header, dict) or header.get('format') != 'holmes_snapshot':
+                    raise UnsupportedSnapshotFormatError('Not a Holmes snapshot')
+                if header['format_version'] != cls.snapshot_format_version:
+                    raise UnsupportedSnapshotFormatError(' '.join(('Format version:',
+                            str(header['format_version']))))
+            except (pickle.UnpicklingError, EOFError, AttributeError, KeyError) as exception:
+                raise UnsupportedSnapshotFormatError(str(exception))
+            if header['ontology_arguments'] != None:
+                ontology = Ontology(**header['ontology_arguments'])
+            else:
+                ontology = None
+            manager = cls(header['model'],
+                    overall_similarity_threshold=header['overall_similarity_threshold'],
+                    embedding_based_matching_on_root_words=
+                    header['embedding_based_matching_on_root_words'], ontology=ontology,
+                    perform_coreference_resolution=header['perform_coreference_resolution'],
+                    debug=debug, search_phrase_cache_size=header['search_phrase_cache_size'],
+                    topic_match_cache_size=header['topic_match_cache_size'],
+                    metrics=metrics, match_budget=match_budget,
+                    disabled_pipes=header['disabled_pipes'])
+            structural_matcher = manager.structural_matcher
+            try:
+                for _ in range(header['number_of_documents']):
+                    label, serialized_document, words_to_token_indexes_dict = unpickler.load()
+                    doc = serialized_document.holmes_document(manager.semantic_analyzer)
+                    structural_matcher._register_document_with_index(doc, label,
+                            words_to_token_indexes_dict)
+                for _ in range(header['number_of_search_phrases']):
+                    label, serialized_document, matchable_token_indexes, root_token_index, \
+                            topic_match_phraselet = unpickler.load()
+                    doc = serialized_document.holmes_document(manager.semantic_analyzer)
+                    structural_matcher._add_search_phrase(
+                            structural_matcher._search_phrase_from_tokens(doc,
+                            [doc[index] for index in matchable_token_indexes],
+                            doc[root_token_index], label, topic_match_phraselet))
+            except (pickle.UnpicklingError, EOFError, AttributeError, KeyError, TypeError,
+                    ValueError) as exception:
+                raise UnsupportedSnapshotFormatError(str(exception))
+        return manager
+
     def register_search_phrase(self, search_phrase_text, label=None):
         """Args:
 
@@ -150,10 +390,15 @@ class Manager:
         """Matches the registered search phrases to the registered documents. Returns a list
             of *Match* objects sorted by their overall similarity measures in descending order.
             Should be called by applications wishing to retain references to the spaCy and
-            Holmes information that was used to derive the matches.
+            Holmes information that was used to derive the matches. The list is a *ResultList*
+            whose *is_truncated* property is *True* if the match budget was exceeded.
         """
-        return sorted(self.structural_matcher.match(), key=lambda match: 1 -
-                         float(match.overall_similarity_measure))
+        return self._match(self.structural_matcher)
+
+    def _match(self, structural_matcher):
+        matches = structural_matcher.match()
+        return ResultList(sorted(matches, key=lambda match: 1 -
+                         float(match.overall_similarity_measure)), matches.is_truncated)
 
     def _build_match_dictionary(self, match):
         """Builds and returns a dictionary describing a match."""
@@ -196,36 +441,62 @@ class Manager:
         """Matches the registered search phrases to the registered documents. Returns a list
             of dictionaries describing any matches, sorted by their overall similarity measures in
             descending order. Callers of this method do not have to manage any further
-            dependencies on spaCy or Holmes.
+            dependencies on spaCy or Holmes. The list is a *ResultList* whose *is_truncated*
+            property is *True* if the match budget was exceeded.
         """
-        match_dicts = []
-        for match in self.match():
-            match_dicts.append(self._build_match_dictionary(match))
+        return self._match_returning_dictionaries(self.structural_matcher)
+
+    def _match_returning_dictionaries(self, structural_matcher):
+        matches = self._match(structural_matcher)
+        match_dicts = ResultList(is_truncated=matches.is_truncated)
+        with timer(self.metrics, 'match_dictionary_construction'):
+            for match in matches:
+                match_dicts.append(self._build_match_dictionary(match))
         return match_dicts
 
     def match_search_phrases_against(self, entry):
         """Convenience method matching the registered search phrases against a single document
             supplied to the method and returning dictionaries describing any matches.
-            Any pre-existing registered documents are removed.
+            The document is matched using a private structural matcher, so that the registered
+            documents are left unchanged and the method may be called concurrently from several
+            threads.
         """
-        self.remove_all_documents()
-        self.parse_and_register_document(document_text=entry)
-        return self.match_returning_dictionaries()
+        return self._match_search_phrases_against_doc(self.semantic_analyzer.parse(entry))
+
+    def _match_search_phrases_against_doc(self, doc):
+        structural_matcher = self.structural_matcher.matcher_sharing_search_phrases()
+        structural_matcher.register_document(doc, '')
+        return self._match_returning_dictionaries(structural_matcher)
 
     def match_documents_against(self, search_phrase):
         """Convenience method matching the registered documents against a single search phrase
             supplied to the method and returning dictionaries describing any matches.
-            Any pre-existing registered searched phrases are removed.
+            The search phrase is matched using a private structural matcher, so that the
+            registered search phrases are left unchanged and the method may be called
+            concurrently from several threads.
         """
-        self.remove_all_search_phrases()
-        self.register_search_phrase(search_phrase)
-        return self.match_returning_dictionaries()
+        structural_matcher = self.structural_matcher.matcher_sharing_documents()
+        structural_matcher.register_search_phrase(search_phrase, search_phrase)
+        return self._match_returning_dictionaries(structural_matcher)
+
+    def _match_documents_against_doc(self, search_phrase, search_phrase_doc):
+        structural_matcher = self.structural_matcher.matcher_sharing_documents()
+        structural_matcher.register_parsed_search_phrase(search_phrase, search_phrase_doc,
+                search_phrase)
+        return self._match_returning_dictionaries(structural_matcher)
+
+    def _match_documents_against_cached_search_phrase(self, search_phrase_text, search_phrase):
+        structural_matcher = self.structural_matcher.matcher_sharing_documents()
+        structural_matcher.register_cached_search_phrase(search_phrase, search_phrase_text)
+        return self._match_returning_dictionaries(structural_matcher)
 
     def topic_match_documents_against(self, text_to_match, *, maximum_activation_distance=75,
             relation_score=30, single_word_score=5, overlapping_relation_multiplier=1.5,
                 overlap_memory_size=10, maximum_activation_value=1000, sideways_match_extent=100,
                 number_of_results=10):
         """Returns the results of a topic match between an entered text and the loaded documents.
+            The registered search phrases are left unchanged and the method may be called
+            concurrently from several threads.
 
         Properties:
 
@@ -245,16 +516,83 @@ class Manager:
             topic match either side of the word where the activation peaked.
         number_of_results -- the number of topic match objects to return.
         """
-        topic_matcher = TopicMatcher(self,
-                maximum_activation_distance=maximum_activation_distance,
-                relation_score=relation_score,
-                single_word_score=single_word_score,
-                overlapping_relation_multiplier=overlapping_relation_multiplier,
-                overlap_memory_size=overlap_memory_size,
-                maximum_activation_value=maximum_activation_value,
-                sideways_match_extent=sideways_match_extent,
-                number_of_results=number_of_results)
-        return topic_matcher.topic_match_documents_against(text_to_match)
+        topic_matcher_arguments = {
+                'maximum_activation_distance': maximum_activation_distance,
+                'relation_score': relation_score,
+                'single_word_score': single_word_score,
+                'overlapping_relation_multiplier': overlapping_relation_multiplier,
+                'overlap_memory_size': overlap_memory_size,
+                'maximum_activation_value': maximum_activation_value,
+                'sideways_match_extent': sideways_match_extent,
+                'number_of_results': number_of_results}
+        cache_key = self._topic_match_cache_key(text_to_match, topic_matcher_arguments)
+        topic_matches = self._cached_topic_matches(cache_key)
+        if topic_matches == None:
+            topic_matches = self._topic_match_documents_against_doc(
+                    self.semantic_analyzer.parse(text_to_match), **topic_matcher_arguments)
+            self._cache_topic_matches(cache_key, topic_matches)
+        return topic_matches
+
+    def _topic_match_documents_against_doc(self, doc, **topic_matcher_arguments):
+        topic_matcher = TopicMatcher(self, **topic_matcher_arguments)
+        return topic_matcher.topic_match_documents_against_doc(doc)
+
+    def _topic_match_cache_key(self, text_to_match, topic_matcher_arguments):
+        # the document version is part of the key so that results calculated while documents
+        # were being registered or removed can never be returned later
+        return (self.structural_matcher.document_version, text_to_match,
+                tuple(sorted(topic_matcher_arguments.items())))
+
+    def _cached_topic_matches(self, cache_key):
+        """Returns a copy of the cached topic match results for *cache_key*, or *None* if there
+            are none.
+        """
+        if self._topic_match_cache == None:
+            return None
+        if cache_key[0] != self._topic_match_cache_document_version:
+            if self._topic_match_cache_document_version != None and \
+                    cache_key[0] < self._topic_match_cache_document_version:
+                return None
+            # documents have been registered or removed since the cached results were calculated
+            self._topic_match_cache.clear()
+            self._topic_match_cache_document_version = cache_key[0]
+        topic_matches = self._topic_match_cache.get(cache_key)
+        if topic_matches == None:
+            return None
+        return ResultList(topic_matches)
+
+    def _cache_topic_matches(self, cache_key, topic_matches):
+        # results truncated because the match budget was exceeded are not retained
+        if self._topic_match_cache != None and not topic_matches.is_truncated and \
+                cache_key[0] == self._topic_match_cache_document_version:
+            self._topic_match_cache.put(cache_key, list(topic_matches))
+
+    def topic_match_cache_statistics(self):
+        """Returns a dictionary with the size, maximum size and hit and miss counts of the
+            topic match result cache, or *None* if no topic match result cache is being used.
+        """
+        if self._topic_match_cache == None:
+            return None
+        return self._topic_match_cache.statistics()
+
+    def search_phrase_cache_statistics(self):
+        """Returns a dictionary with the size, maximum size and hit and miss counts of the
+            search phrase cache, or *None* if no search phrase cache is being used.
+        """
+        if self._search_phrase_cache == None:
+            return None
+        return self._search_phrase_cache.statistics()
+
+    def stats(self):
+        """Returns a dictionary describing what has been recorded in the *Metrics* object passed
+            to the constructor, or *None* if no *Metrics* object was passed. The *timings* entry
+            maps each stage to the number of times it occurred and the total number of seconds
+            it took; stages nested within other stages are also included in the outer totals.
+            The *counters* entry maps each counter to its value.
+        """
+        if self.metrics == None:
+            return None
+        return self.metrics.snapshot()
 
     def _new_supervised_topic_structural_matcher(self, verbose):
             return StructuralMatcher(self.semantic_analyzer, self.ontology,
@@ -262,12 +600,14 @@ class Manager:
                     embedding_based_matching_on_root_words =
                     self.embedding_based_matching_on_root_words,
                     perform_coreference_resolution = self.perform_coreference_resolution,
-                    output_document_matching_message_to_console = verbose)
+                    progress_reporter = ConsoleProgressReporter() if verbose else None,
+                    metrics = self.metrics)
             # a private structural matcher is required because the results would be unpredictable
             # if the user registered search phrases additional to the generated phraselets
 
     def get_supervised_topic_training_basis(self, *, classification_ontology=None,
-            overlap_memory_size=10, oneshot=True, verbose=True):
+            overlap_memory_size=10, oneshot=True, verbose=True, number_of_processes=1,
+            incremental=False):
         """ Returns an object that is used to train and generate a document model.
 
             Parameters:
@@ -279,11 +619,35 @@ class Manager:
             oneshot -- whether the same word or relationship matched multiple times should be
                 counted once only (value 'True') or multiple times (value 'False')
             verbose -- if 'True', information about training progres is outputted to the console.
+            number_of_processes -- the number of worker processes across which the matching of
+                training documents against phraselets is distributed, or '1' if matching should
+                take place within the current process. Not supported for models that perform
+                coreference resolution.
+            incremental -- if 'True', training documents may be registered and removed after
+                'prepare()' has been called and 'prepare()' may then be called again, whereupon
+                only new documents and new phraselets are matched.
         """
         return SupervisedTopicTrainingBasis(
                 structural_matcher=self._new_supervised_topic_structural_matcher(verbose),
                 classification_ontology=classification_ontology,
-                overlap_memory_size=overlap_memory_size, oneshot=oneshot, verbose=verbose)
+                overlap_memory_size=overlap_memory_size, oneshot=oneshot, verbose=verbose,
+                number_of_processes=number_of_processes, incremental=incremental)
+
+    def load_supervised_topic_training_basis(self, path, *, verbose=True, number_of_processes=1):
+        """ Returns a training basis restored from a file written by
+            'SupervisedTopicTrainingBasis.save()'. The file contains pickled Python objects and
+            should only be loaded from trusted sources.
+
+            Parameters:
+
+            path -- the path of the file.
+            verbose -- if 'True', information about training progres is outputted to the console.
+            number_of_processes -- see 'get_supervised_topic_training_basis()'.
+        """
+        training_basis = self.get_supervised_topic_training_basis(verbose=verbose,
+                number_of_processes=number_of_processes)
+        training_basis.load(path)
+        return training_basis
 
     def deserialize_supervised_topic_classifier(self, serialized_model):
         """ Returns a document classifier that will use a pre-trained model.
@@ -291,12 +655,16 @@ class Manager:
             Parameters:
 
             serialized_model -- the pre-trained model, which will correspond to a
-                'SupervisedTopicClassifierModel' instance.
+                'SupervisedTopicClassifierModel' instance. A 'bytes' object is loaded as a model
+                in the binary format returned by 'serialize_model_to_bytes()'.
         """
         classifier = SupervisedTopicClassifier(self.semantic_analyzer,
                 self._new_supervised_topic_structural_matcher(False),
                 None)
-        classifier.deserialize_model(serialized_model)
+        if isinstance(serialized_model, (bytes, bytearray)):
+            classifier.deserialize_model_from_bytes(serialized_model)
+        else:
+            classifier.deserialize_model(serialized_model)
         return classifier
 
     def start_chatbot_mode_console(self):
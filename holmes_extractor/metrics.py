@@ -0,0 +1,118 @@
+import threading
+import time
+
+class MetricsSink:
+    """Receives the measurements recorded by a *Metrics* object as they are made, e.g. to
+        forward them to a monitoring system. Subclasses override either or both methods. The
+        methods may be called concurrently from several threads.
+    """
+
+    def record_timing(self, stage, seconds):
+        """Called whenever a stage has finished.
+
+        Args:
+
+        stage -- the name of the stage.
+        seconds -- the wall time the stage took.
+        """
+        pass
+
+    def record_count(self, counter, value):
+        """Called whenever a counter is incremented.
+
+        Args:
+
+        counter -- the name of the counter.
+        value -- the amount by which the counter was incremented.
+        """
+        pass
+
+class Metrics:
+    """A thread-safe collection of wall times and counts recorded by Holmes while it parses and
+        matches. Supply an instance as the *metrics* argument of *Manager* to switch recording
+        on; when no instance is supplied, nothing is recorded.
+
+    Args:
+
+    sinks -- *MetricsSink* objects to which each measurement is also passed as it is made.
+    """
+
+    def __init__(self, sinks=()):
+        self.sinks = tuple(sinks)
+        self._lock = threading.Lock()
+        self._timings = {}
+        self._counters = {}
+
+    def timer(self, stage):
+        """Returns a context manager that records the wall time taken by the *with* block as
+            one occurrence of *stage*.
+        """
+        return _Timer(self, stage)
+
+    def record_timing(self, stage, seconds):
+        with self._lock:
+            timing = self._timings.get(stage)
+            if timing == None:
+                self._timings[stage] = [1, seconds]
+            else:
+                timing[0] += 1
+                timing[1] += seconds
+        for sink in self.sinks:
+            sink.record_timing(stage, seconds)
+
+    def increment(self, counter, value=1):
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + value
+        for sink in self.sinks:
+            sink.record_count(counter, value)
+
+    def snapshot(self):
+        """Returns a dictionary with a *timings* entry mapping each stage to the number of times
+            it occurred and the total number of seconds it took, and a *counters* entry mapping
+            each counter to its value.
+        """
+        with self._lock:
+            return {
+                    'timings': {stage: {'count': count, 'seconds': seconds} for
+                            stage, (count, seconds) in self._timings.items()},
+                    'counters': dict(self._counters)}
+
+    def reset(self):
+        """Discards everything recorded so far."""
+        with self._lock:
+            self._timings.clear()
+            self._counters.clear()
+
+class _Timer:
+
+    __slots__ = ('_metrics', '_stage', '_start')
+
+    def __init__(self, metrics, stage):
+        self._metrics = metrics
+        self._stage = stage
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._metrics.record_timing(self._stage, time.perf_counter() - self._start)
+
+class _NullTimer:
+
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+_null_timer = _NullTimer()
+
+def timer(metrics, stage):
+    """Returns *metrics.timer(stage)*, or a context manager that does nothing if *metrics* is
+        *None*.
+    """
+    if metrics == None:
+        return _null_timer
+    return metrics.timer(stage)
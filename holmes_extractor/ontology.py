@@ -1,4 +1,3 @@
-import rdflib
 import urllib
 from itertools import chain
 
@@ -32,6 +31,8 @@ class Ontology:
                  owl_synonym_type='http://www.w3.org/2002/07/owl#equivalentClass',
                  owl_hyponym_type='http://www.w3.org/2000/01/rdf-schema#subClassOf',
                  symmetric_matching=False):
+        # rdflib is slow to import and is therefore only imported once an ontology is used
+        import rdflib
         self.path = ontology_path
         self._graph = rdflib.Graph()
         self._graph.load(ontology_path)
@@ -41,7 +42,9 @@ class Ontology:
         self._owl_synonym_type = owl_synonym_type
         self._owl_hyponym_type = owl_hyponym_type
         self._words, self._multiwords = self._get_words()
+        self._entry_urls_by_word = self._get_entry_urls_by_word()
         self._match_dict = {}
+        self._hypernym_ancestor_dict = {}
         self.symmetric_matching=symmetric_matching
 
     class Entry:
@@ -58,24 +61,31 @@ class Ontology:
             self.depth = depth
             self.is_individual = is_individual
 
+    def _construction_arguments(self):
+        """Returns the keyword arguments with which an equivalent object can be constructed,
+            e.g. within another process.
+        """
+        return {
+                'ontology_path': self.path,
+                'owl_class_type': self._owl_class_type,
+                'owl_individual_type': self._owl_individual_type,
+                'owl_type_link': self._owl_type_link,
+                'owl_synonym_type': self._owl_synonym_type,
+                'owl_hyponym_type': self._owl_hyponym_type,
+                'symmetric_matching': self.symmetric_matching}
+
     def add_to_dictionary(self, search_phrase_word):
         """Generates the dictionary for a search_phrase word."""
         search_phrase_word = search_phrase_word.lower()
         if search_phrase_word not in self._match_dict:
             entry_set = set()
+            for class_id, is_individual in self._entry_urls_by_word.get(search_phrase_word, ()):
+                self._recursive_add_to_dict(
+                        entry_set, search_phrase_word, class_id, set(), 0, is_individual, False,
+                        self.symmetric_matching)
+            # the set is only published once complete so that concurrent queries never see
+            # a partially built dictionary
             self._match_dict[search_phrase_word] = entry_set
-            for class_id, type_link, metaclass_id in self._get_classes():
-                entry_word = self._get_entry_word(class_id).lower()
-                if entry_word == search_phrase_word:
-                    self._recursive_add_to_dict(
-                            entry_set, entry_word, class_id, set(), 0, False, False,
-                            self.symmetric_matching)
-            for class_id, type_link, metaclass_id in self._get_individuals():
-                entry_word = self._get_entry_word(class_id).lower()
-                if entry_word == search_phrase_word:
-                    self._recursive_add_to_dict(
-                            entry_set, entry_word, class_id, set(), 0, True, False,
-                            self.symmetric_matching)
 
     def contains(self, word):
         """Returns whether or not a word is present in the loaded ontology."""
@@ -117,26 +127,42 @@ class Ontology:
 
     def _get_classes(self):
         """Returns all classes from the loaded ontology."""
+        import rdflib
         return self._graph.triples((None, rdflib.term.URIRef(self._owl_type_link),
                 rdflib.term.URIRef(self._owl_class_type)))
 
     def _get_individuals(self):
         """Returns all classes from the loaded ontology."""
+        import rdflib
         return self._graph.triples((None, rdflib.term.URIRef(self._owl_type_link),
                 rdflib.term.URIRef(self._owl_individual_type)))
 
     def _get_words(self):
-        """Finds all words in the loaded ontology and returns multiwords in a separate list."""
-        words = []
-        multiwords = []
+        """Finds all words in the loaded ontology and returns multiwords in a separate set."""
+        words = set()
+        multiwords = set()
         for class_id, type_link, metaclass_id in chain(
                 self._get_classes(), self._get_individuals()):
             entry_word = self._get_entry_word(class_id)
-            words.append(entry_word.lower())
+            words.add(entry_word.lower())
             if ' ' in entry_word:
-                multiwords.append(entry_word.lower())
+                multiwords.add(entry_word.lower())
         return words, multiwords
 
+    def _get_entry_urls_by_word(self):
+        """Returns a dictionary from lower-case entry words to lists of (URL, is_individual)
+            tuples for the classes and individuals with each entry word, so that the entries for
+            a word can be found without scanning the whole ontology.
+        """
+        entry_urls_by_word = {}
+        for class_id, type_link, metaclass_id in self._get_classes():
+            entry_urls_by_word.setdefault(self._get_entry_word(class_id).lower(), []).append(
+                    (class_id, False))
+        for class_id, type_link, metaclass_id in self._get_individuals():
+            entry_urls_by_word.setdefault(self._get_entry_word(class_id).lower(), []).append(
+                    (class_id, True))
+        return entry_urls_by_word
+
     def _recursive_add_to_dict(self, entry_set, word, working_entry_url, visited,
             depth, is_individual, is_hypernym, symmetric):
         """Adds synonyms and hyponyms of a search phrase word to its dictionary.
@@ -156,6 +182,7 @@ class Ontology:
         symmetric -- 'True' if hypernyms should be matched as well as synonyms, hyponyms
             and individuals.
         """
+        import rdflib
         if working_entry_url not in visited:
             visited.add(working_entry_url)
             working_entry_word = self._get_entry_word(working_entry_url)
@@ -205,23 +232,36 @@ class Ontology:
             if there are several, or 'word' if 'word' is not found in the ontology or has
             no hypernym. If there are several hypernym ancestors at the same level, the first one
             in the alphabet is returned.
+
+            Results are stored so that each word is only looked up in the ontology once.
+        """
+        lower_case_word = word.lower()
+        if lower_case_word not in self._hypernym_ancestor_dict:
+            self._hypernym_ancestor_dict[lower_case_word] = \
+                    self._find_most_general_hypernym_ancestor(lower_case_word)
+        ancestor = self._hypernym_ancestor_dict[lower_case_word]
+        return word if ancestor == None else ancestor
+
+    def precompute_hypernym_ancestors(self):
+        """Looks up the most general hypernym ancestors of all words in the ontology at once, e.g.
+            before training a supervised topic model or before starting worker processes.
+        """
+        for word in self._entry_urls_by_word:
+            self.get_most_general_hypernym_ancestor(word)
+
+    def _find_most_general_hypernym_ancestor(self, word):
+        """Returns the most general hypernym ancestor of the lower-case 'word', or 'None' if
+            'word' is not found in the ontology or has no hypernym.
         """
         matching_set = set()
-        for clazz in (clazz for clazz, t, m in self._get_classes() if
-                self._get_entry_word(clazz).lower()==word.lower()):
+        for class_id, is_individual in self._entry_urls_by_word.get(word, ()):
             this_class_set = set()
-            self._recursive_add_to_dict(this_class_set, word, clazz, set(), 0, False,
+            self._recursive_add_to_dict(this_class_set, word, class_id, set(), 0, is_individual,
                     False, True)
             matching_set |= this_class_set
-        for individual in (individual for individual, t, m in self._get_individuals() if
-                self._get_entry_word(individual).lower() == word.lower()):
-            this_individual_set = set()
-            self._recursive_add_to_dict(this_individual_set, word, individual, set(), 0,
-                    True, False, True)
-            matching_set |= this_individual_set
         matching_list = sorted(matching_set, key=lambda entry: (entry.depth, entry.word))
         matching_list = list(filter(lambda entry: entry.depth < 0, matching_list))
         if len(matching_list) == 0:
-            return word
+            return None
         else:
             return matching_list[0].word
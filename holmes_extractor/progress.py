@@ -0,0 +1,89 @@
+import sys
+import time
+
+class ProgressReporter:
+    """Receives reports on the progress of operations that process many documents, e.g.
+        registering documents read from files or matching search phrases against all registered
+        documents. Subclasses override whichever methods they require.
+
+    The *documents*, *characters* and *seconds* arguments are cumulative: they give the number
+        of documents and characters processed and the wall time elapsed since the operation
+        started.
+    """
+
+    def started(self, operation):
+        """Called when *operation*, e.g. *'registration'* or *'matching'*, starts."""
+        pass
+
+    def advanced(self, operation, label, *, documents, characters, seconds):
+        """Called whenever a document has been processed.
+
+        Args:
+
+        operation -- the name of the operation.
+        label -- the label of the document that has just been processed.
+        """
+        pass
+
+    def finished(self, operation, *, documents, characters, seconds):
+        """Called when *operation* has finished."""
+        pass
+
+class ConsoleProgressReporter(ProgressReporter):
+    """Writes the number of documents processed and the throughput to the console at regular
+        intervals and when an operation finishes.
+
+    Args:
+
+    interval_seconds -- the minimum number of seconds between two progress messages for the
+        same operation. *0* writes a message for every document.
+    file -- the file to which messages are written. Defaults to *sys.stdout*.
+    """
+
+    def __init__(self, *, interval_seconds=5.0, file=None):
+        self.interval_seconds = interval_seconds
+        self.file = file
+        self._last_report_seconds = {}
+
+    def started(self, operation):
+        self._last_report_seconds[operation] = 0.0
+
+    def advanced(self, operation, label, *, documents, characters, seconds):
+        if seconds - self._last_report_seconds.get(operation, 0.0) >= self.interval_seconds:
+            self._last_report_seconds[operation] = seconds
+            self._write(operation, documents, characters, seconds, ' '.join(('last document:',
+                    str(label))))
+
+    def finished(self, operation, *, documents, characters, seconds):
+        self._write(operation, documents, characters, seconds, 'finished')
+
+    def _write(self, operation, documents, characters, seconds, suffix):
+        if seconds > 0:
+            throughput = ''.join(('{:.1f}'.format(documents / seconds), ' documents/s, ',
+                    '{:.0f}'.format(characters / seconds), ' characters/s'))
+        else:
+            throughput = 'n/a'
+        print(''.join((operation, ': ', str(documents), ' documents, ',
+                '{:.1f}'.format(seconds), 's (', throughput, '); ', suffix)),
+                file=self.file if self.file != None else sys.stdout)
+
+class _ProgressTracker:
+    """Accumulates the counts passed to a *ProgressReporter* during a single operation."""
+
+    def __init__(self, progress_reporter, operation):
+        self.progress_reporter = progress_reporter
+        self.operation = operation
+        self.documents = 0
+        self.characters = 0
+        self._start = time.perf_counter()
+        progress_reporter.started(operation)
+
+    def advance(self, label, characters):
+        self.documents += 1
+        self.characters += characters
+        self.progress_reporter.advanced(self.operation, label, documents=self.documents,
+                characters=self.characters, seconds=time.perf_counter() - self._start)
+
+    def finish(self):
+        self.progress_reporter.finished(self.operation, documents=self.documents,
+                characters=self.characters, seconds=time.perf_counter() - self._start)
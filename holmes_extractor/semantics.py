@@ -1,8 +1,43 @@
+import copy
+import os
+import re
+import numpy as np
 import spacy
+import spacy.util
+import threading
 from .errors import WrongModelDeserializationError, DocumentTooBigError
+from .metrics import timer
+from spacy.attrs import LEMMA, TAG, POS, DEP, HEAD, ENT_IOB, ENT_TYPE
 from spacy.tokens import Token, Doc
 from abc import ABC, abstractmethod
-import jsonpickle
+
+_dependency_label_ids = {}
+_dependency_label_ids_lock = threading.Lock()
+
+def dependency_label_id(label):
+    """Returns the small integer to which a dependency label is interned. The same label always
+        receives the same integer within a process, whatever the language.
+    """
+    try:
+        return _dependency_label_ids[label]
+    except KeyError:
+        with _dependency_label_ids_lock:
+            return _dependency_label_ids.setdefault(label, len(_dependency_label_ids))
+
+# the spaCy models loaded within the process by (model name, disabled pipes), so that semantic
+# analyzers for the same model share a single loaded model
+_spacy_models = {}
+_spacy_models_lock = threading.Lock()
+
+def _load_spacy_model(model, disabled_pipes):
+    key = (model, disabled_pipes)
+    try:
+        return _spacy_models[key]
+    except KeyError:
+        with _spacy_models_lock:
+            if key not in _spacy_models:
+                _spacy_models[key] = spacy.load(model, disable=list(disabled_pipes))
+            return _spacy_models[key]
 
 
 class SemanticDependency:
@@ -34,6 +69,27 @@ class SemanticDependency:
         self.label = label
         self.is_uncertain = is_uncertain
 
+    @property
+    def label(self):
+        return self._label
+
+    @label.setter
+    def label(self, label):
+        # the interned id is kept in step with the label because labels are changed after
+        # dependencies have been created, e.g. 'nsubj' -> 'nsubjpass'
+        self._label = label
+        self.label_id = dependency_label_id(label)
+
+    def __getstate__(self):
+        return {'parent_index': self.parent_index, 'child_index': self.child_index,
+                'label': self._label, 'is_uncertain': self.is_uncertain}
+
+    def __setstate__(self, state):
+        self.parent_index = state['parent_index']
+        self.child_index = state['child_index']
+        self.label = state['label']
+        self.is_uncertain = state['is_uncertain']
+
     def child_token(self, doc):
         """Convenience method to return the child token of this dependency.
 
@@ -59,6 +115,28 @@ class SemanticDependency:
         return hash((self.parent_index, self.child_index))
 
 
+class CoreferenceMention:
+    """A mention within a coreference cluster. Mentions are recorded as token indexes rather
+        than as spaCy spans so that they can be serialized together with the document.
+
+    root_index -- the index of the root token of the mention.
+    start -- the index of the first token of the mention.
+    end -- the index of the token following the last token of the mention.
+    """
+
+    def __init__(self, root_index, start, end):
+        self.root_index = root_index
+        self.start = start
+        self.end = end
+
+    def root_token(self, doc):
+        """Convenience method to return the root token of this mention.
+
+        doc -- the document containing the mention.
+        """
+        return doc[self.root_index]
+
+
 class HolmesDictionary:
     """The holder object for token-level semantic information managed by Holmes
 
@@ -69,6 +147,8 @@ class HolmesDictionary:
     children -- list of *SemanticDependency* objects where this token is the parent.
     righthand_siblings -- list of tokens to the right of this token that stand in a conjunction
         relationship to this token and that share its semantic parents.
+    coreference_clusters -- the coreference clusters containing a mention in which this token
+        occurs, each a list of *CoreferenceMention* objects.
     """
 
     def __init__(self, index, lemma):
@@ -76,10 +156,17 @@ class HolmesDictionary:
         self.lemma = lemma
         self.children = []
         self.righthand_siblings = []
+        self.coreference_clusters = []
         self.is_involved_in_or_conjunction = False
         self.is_negated = None
         self.is_matchable = None
 
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if 'coreference_clusters' not in state:
+            # dictionaries serialized by earlier versions do not record coreference clusters
+            self.coreference_clusters = []
+
     @property
     def is_uncertain(self):
         """if *True*, a match involving this token will itself be uncertain."""
@@ -172,17 +259,56 @@ class PhraseletTemplate:
         """ 'True' if this is a template for single-word phraselets, otherwise 'False'. """
         return self.child_index == None
 
+_paragraph_end = re.compile(r'\n\s*\n\s*')
+_sentence_end = re.compile(r'(?<=[.!?])\s+')
+_whitespace = re.compile(r'\s+')
+
+def _split_into_blocks(text, maximum_block_size):
+    """Returns (start, end) character offsets dividing *text* into consecutive blocks of at
+        most *maximum_block_size* characters. Blocks end at paragraph boundaries where possible,
+        otherwise at sentence boundaries, otherwise at whitespace. Whitespace at a boundary
+        belongs to the preceding block.
+    """
+
+    def split(start, end, patterns):
+        if end - start <= maximum_block_size:
+            yield start, end
+            return
+        if len(patterns) == 0:
+            # there is no boundary within the block, so it has to be split within a word
+            for block_start in range(start, end, maximum_block_size):
+                yield block_start, min(block_start + maximum_block_size, end)
+            return
+        piece_start = start
+        for boundary in patterns[0].finditer(text, start, end):
+            if boundary.end() < end:
+                yield from split(piece_start, boundary.end(), patterns[1:])
+                piece_start = boundary.end()
+        yield from split(piece_start, end, patterns[1:])
+
+    blocks = []
+    for block_start, block_end in split(0, len(text), (_paragraph_end, _sentence_end,
+            _whitespace)):
+        if len(blocks) > 0 and block_end - blocks[-1][0] <= maximum_block_size:
+            # merge small neighbouring pieces
+            blocks[-1] = (blocks[-1][0], block_end)
+        else:
+            blocks.append((block_start, block_end))
+    return blocks
+
 class SemanticAnalyzerFactory():
     """Returns the correct *SemanticAnalyzer* for the model language. This class must be added to
         if additional *SemanticAnalyzer* implementations are added for new languages.
     """
 
-    def semantic_analyzer(self, *, model, debug=False):
+    def semantic_analyzer(self, *, model, debug=False, disabled_pipes=()):
         language = model[0:2]
         if language == 'en':
-            return EnglishSemanticAnalyzer(model=model, debug=debug)
+            return EnglishSemanticAnalyzer(model=model, debug=debug,
+                    disabled_pipes=disabled_pipes)
         elif language == 'de':
-            return GermanSemanticAnalyzer(model=model, debug=debug)
+            return GermanSemanticAnalyzer(model=model, debug=debug,
+                    disabled_pipes=disabled_pipes)
         else:
             raise ValueError(
                 ' '.join(['No semantic analyzer for model', language]))
@@ -197,18 +323,53 @@ class SemanticAnalyzer(ABC):
         implementation where they can be illustrated with direct examples.
     """
 
-    def __init__(self, *, model, debug):
+    def __init__(self, *, model, debug, disabled_pipes=()):
         """Args:
 
         model -- the name of the spaCy model
         debug -- *True* if the object should print a representation of each parsed document
+        disabled_pipes -- the names of spaCy pipeline components that should not be loaded
         """
-        self.nlp = spacy.load(model)
         self.model = model
         self.debug = debug
+        self.disabled_pipes = tuple(sorted(disabled_pipes))
+        self._nlp = None
+        self._model_meta = None
+        self._dependency_label_compatibility_table = \
+                self._build_dependency_label_compatibility_table()
+        self._phraselet_template_documents = {}
+        # a *Metrics* object, or *None* if no measurements should be recorded
+        self.metrics = None
 
     Token.set_extension('holmes', default='')
 
+    @property
+    def nlp(self):
+        """The spaCy model, which is loaded when it is first required. The loaded model is shared
+            with all other semantic analyzers within the process for the same model and disabled
+            pipes.
+        """
+        if self._nlp == None:
+            self._nlp = _load_spacy_model(self.model, self.disabled_pipes)
+        return self._nlp
+
+    def _meta(self):
+        """Returns the metadata of the spaCy model, which is read from the model package or
+            directory if the model has not yet been loaded.
+        """
+        if self._nlp != None:
+            return self._nlp.meta
+        if self._model_meta == None:
+            if spacy.util.is_package(self.model):
+                model_path = spacy.util.get_package_path(self.model)
+            elif os.path.isdir(self.model):
+                model_path = self.model
+            else:
+                # e.g. a shortcut link: there is no cheap way of reading the metadata
+                return self.nlp.meta
+            self._model_meta = spacy.util.get_model_meta(model_path)
+        return self._model_meta
+
     def parse(self, text):
         """Performs a full spaCy and Holmes parse on a string.
         """
@@ -216,51 +377,145 @@ class SemanticAnalyzer(ABC):
         holmes_doc = self.holmes_parse(spacy_doc)
         return holmes_doc
 
+    def parse_batch(self, texts, *, batch_size=32):
+        """Performs a full spaCy and Holmes parse on a sequence of strings, passing the strings
+            to spaCy as a single batch. Returns a list of documents in the order of *texts*.
+        """
+        for text in texts:
+            self._check_document_size(text)
+        with timer(self.metrics, 'spacy_parse'):
+            spacy_docs = list(self.nlp.pipe(texts, batch_size=batch_size))
+        return [self.holmes_parse(spacy_doc) for spacy_doc in spacy_docs]
+
     _maximum_document_size = 1000000
 
+    def _check_document_size(self, text):
+        if len(text) > self._maximum_document_size:
+            raise DocumentTooBigError(' '.join(('size:', str(len(text)), 'max:',
+                    str(self._maximum_document_size))))
+
     def spacy_parse(self, text):
         """Performs a standard spaCy parse on a string.
         """
-        if len(text) > self._maximum_document_size:
-            raise DocumentTooBigError(' '.join(('size:', str(len(text)), 'max:',
+        self._check_document_size(text)
+        with timer(self.metrics, 'spacy_parse'):
+            return self.nlp(text)
+
+    _chunk_attributes = (LEMMA, TAG, POS, DEP, HEAD, ENT_IOB, ENT_TYPE)
+
+    def parse_in_chunks(self, text, *, maximum_chunk_size=100000, overlap=1000):
+        """Performs a full spaCy and Holmes parse on a string of any length. The string is
+            divided at paragraph or, where necessary, sentence boundaries into chunks of at most
+            *maximum_chunk_size* characters that spaCy parses one at a time. Each chunk after
+            the first is parsed together with up to *overlap* characters from the end of the
+            previous chunk so that spaCy has some context, but only the tokens belonging to the
+            chunk itself are retained. The retained tokens are combined into a single document
+            whose token indexes and character offsets refer to the whole string, and the Holmes
+            parse is then performed on that document. Coreference information is not retained.
+        """
+        if maximum_chunk_size < 1 or overlap < 0:
+            raise ValueError('maximum_chunk_size must be positive and overlap must not be negative')
+        if maximum_chunk_size + overlap > self._maximum_document_size:
+            raise ValueError(' '.join(('maximum_chunk_size + overlap must not exceed',
                     str(self._maximum_document_size))))
-        return self.nlp(text)
+        dep_column = self._chunk_attributes.index(DEP)
+        head_column = self._chunk_attributes.index(HEAD)
+        ent_iob_column = self._chunk_attributes.index(ENT_IOB)
+        words = []
+        spaces = []
+        arrays = []
+        tensors = []
+        previous_start = None
+        for start, end in _split_into_blocks(text, maximum_chunk_size):
+            context_start = start
+            if previous_start != None and overlap > 0 and text[start - 1].isspace():
+                # the context may only end where the chunk begins if a token boundary lies
+                # between them, and must itself begin at a token boundary
+                context_start = max(previous_start, start - overlap)
+                if context_start > previous_start:
+                    boundary = _whitespace.search(text, context_start, start)
+                    context_start = boundary.end() if boundary != None else start
+            chunk_doc = self.spacy_parse(text[context_start:end])
+            first_index = 0
+            while first_index < len(chunk_doc) and \
+                    chunk_doc[first_index].idx < start - context_start:
+                first_index += 1
+            array = chunk_doc.to_array(self._chunk_attributes)[first_index:]
+            for index in range(len(array)):
+                token = chunk_doc[first_index + index]
+                words.append(token.text)
+                spaces.append(len(token.whitespace_) > 0)
+                if token.head.i < first_index:
+                    # the head was part of the context, so the token becomes a root
+                    array[index, head_column] = 0
+                    array[index, dep_column] = self.nlp.vocab.strings['ROOT']
+            if len(array) > 0 and array[0, ent_iob_column] == 1:
+                # an entity that began in the context now begins at the first token
+                array[0, ent_iob_column] = 3
+            arrays.append(array)
+            if chunk_doc.tensor is not None and len(chunk_doc.tensor) == len(chunk_doc):
+                tensors.append(chunk_doc.tensor[first_index:])
+            previous_start = start
+        doc = Doc(self.nlp.vocab, words=words, spaces=spaces)
+        if len(words) > 0:
+            doc.from_array(self._chunk_attributes, np.concatenate(arrays))
+            if len(tensors) == len(arrays):
+                doc.tensor = np.concatenate(tensors)
+        return self.holmes_parse(doc)
+
+    # the methods called for each token in turn by *holmes_parse()* after the Holmes
+    # dictionaries have been created; each name is also used to label the pass in the metrics
+    _holmes_parse_passes = ('_set_matchability', '_set_negation',
+            '_initialize_semantic_dependencies', '_mark_if_righthand_sibling',
+            '_copy_any_sibling_info', '_correct_auxiliaries_and_passives',
+            '_copy_any_sibling_info', '_normalize_predicative_adjectives',
+            '_handle_relative_constructions',
+            '_create_additional_preposition_phrase_semantic_dependencies',
+            '_perform_language_specific_tasks')
 
     def holmes_parse(self, spacy_doc):
         """Adds the Holmes-specific information to each token within a spaCy document.
         """
-        for token in spacy_doc:
-            token._.set('holmes', HolmesDictionary(token.i, self._holmes_lemma(token)))
-        for token in spacy_doc:
-            self._set_matchability(token)
-        for token in spacy_doc:
-            self._set_negation(token)
-        for token in spacy_doc:
-            self._initialize_semantic_dependencies(token)
-        for token in spacy_doc:
-            self._mark_if_righthand_sibling(token)
-        for token in spacy_doc:
-            self._copy_any_sibling_info(token)
-        for token in spacy_doc:
-            self._correct_auxiliaries_and_passives(token)
-        for token in spacy_doc:
-            self._copy_any_sibling_info(token)
-        for token in spacy_doc:
-            self._normalize_predicative_adjectives(token)
-        for token in spacy_doc:
-            self._handle_relative_constructions(token)
-        for token in spacy_doc:
-            self._create_additional_preposition_phrase_semantic_dependencies(token)
-        for token in spacy_doc:
-            self._perform_language_specific_tasks(token)
+        metrics = self.metrics
+        with timer(metrics, 'holmes_parse'):
+            with timer(metrics, 'holmes_parse._create_holmes_dictionaries'):
+                for token in spacy_doc:
+                    token._.set('holmes', HolmesDictionary(token.i, self._holmes_lemma(token)))
+            with timer(metrics, 'holmes_parse._set_coreference_clusters'):
+                self._set_coreference_clusters(spacy_doc)
+            for pass_name in self._holmes_parse_passes:
+                pass_method = getattr(self, pass_name)
+                with timer(metrics, 'holmes_parse.' + pass_name):
+                    for token in spacy_doc:
+                        pass_method(token)
         self.debug_structures(spacy_doc)
         return spacy_doc
 
+    def _set_coreference_clusters(self, spacy_doc):
+        """Copies the clusters found by neuralcoref into the Holmes dictionaries of the tokens
+            within their mentions. All later processing uses these copies, which unlike the
+            neuralcoref clusters are retained when a document is serialized.
+        """
+        if not self.model_supports_coreference_resolution() or not spacy_doc._.has_coref:
+            return
+        for cluster in spacy_doc._.coref_clusters:
+            mentions = [CoreferenceMention(mention.root.i, mention.start, mention.end) for
+                    mention in cluster.mentions]
+            for mention in cluster.mentions:
+                for token in mention:
+                    clusters = token._.holmes.coreference_clusters
+                    # a token within overlapping mentions belongs to the cluster only once
+                    if len(clusters) == 0 or clusters[-1] is not mentions:
+                        clusters.append(mentions)
+
     def model_supports_enbeddings(self):
-        return self.nlp.meta['vectors']['vectors'] > 0
+        return self._meta()['vectors']['vectors'] > 0
 
     def model_supports_coreference_resolution(self):
-        return self.nlp.has_pipe('neuralcoref')
+        if self._nlp != None:
+            return self._nlp.has_pipe('neuralcoref')
+        return 'neuralcoref' in self._meta().get('pipeline', ()) and \
+                'neuralcoref' not in self.disabled_pipes
 
     def dependency_labels_match(self, *, search_phrase_dependency_label, document_dependency_label):
         """Determines whether a dependency label in a search phrase matches a dependency label in
@@ -272,6 +527,40 @@ class SemanticAnalyzer(ABC):
             return False
         return document_dependency_label in self._matching_dep_dict[search_phrase_dependency_label]
 
+    def _build_dependency_label_compatibility_table(self):
+        """Returns a table indexed first by interned search phrase dependency label and second
+            by interned document dependency label whose entries are *1* where the labels match
+            as defined by *_matching_dep_dict* and *0* otherwise. Equal labels always match and
+            are handled by *dependency_label_ids_match()* without reference to the table.
+        """
+        for search_phrase_dependency_label, document_dependency_labels in \
+                self._matching_dep_dict.items():
+            dependency_label_id(search_phrase_dependency_label)
+            for document_dependency_label in document_dependency_labels:
+                dependency_label_id(document_dependency_label)
+        table_size = len(_dependency_label_ids)
+        table = [bytearray(table_size) for index in range(table_size)]
+        for search_phrase_dependency_label, document_dependency_labels in \
+                self._matching_dep_dict.items():
+            row = table[dependency_label_id(search_phrase_dependency_label)]
+            for document_dependency_label in document_dependency_labels:
+                row[dependency_label_id(document_dependency_label)] = 1
+        return table
+
+    def dependency_label_ids_match(self, search_phrase_dependency_label_id,
+            document_dependency_label_id):
+        """Equivalent to *dependency_labels_match()* for labels interned using
+            *dependency_label_id()*, e.g. the *label_id* attributes of *SemanticDependency* objects.
+            Labels interned after this object was created never occur within *_matching_dep_dict*
+            and can therefore only match themselves.
+        """
+        if search_phrase_dependency_label_id == document_dependency_label_id:
+            return True
+        table = self._dependency_label_compatibility_table
+        return search_phrase_dependency_label_id < len(table) and \
+                document_dependency_label_id < len(table) and \
+                table[search_phrase_dependency_label_id][document_dependency_label_id] == 1
+
     def debug_structures(self, doc):
         if self.debug:
             for token in doc:
@@ -279,7 +568,9 @@ class SemanticAnalyzer(ABC):
                 uncertainty_string = 'uncertain' if token._.holmes.is_uncertain else 'certain'
                 matchability_string = 'matchable' if token._.holmes.is_matchable else 'unmatchable'
                 if self.is_involved_in_coreference(token):
-                    coreference_string = token._.coref_clusters
+                    coreference_string = '; '.join(' / '.join(doc[mention.start:mention.end].text
+                            for mention in cluster) for cluster in
+                            token._.holmes.coreference_clusters)
                 else:
                     coreference_string = ''
                 print(token.i, token.text, token._.holmes.lemma, token.pos_, token.tag_,
@@ -288,23 +579,47 @@ class SemanticAnalyzer(ABC):
                         token._.holmes.righthand_siblings, negation_string,
                         uncertainty_string, matchability_string, coreference_string)
 
+    def _to_serialized_document(self, spacy_doc):
+        # the document is left unchanged so that it can be serialized while other threads are
+        # matching against it. The extension attribute values in 'user_data', e.g. the
+        # neuralcoref clusters, are excluded because they cannot all be serialized by spaCy;
+        # the information Holmes needs from them is held in the dictionaries.
+        return SerializedHolmesDocument(spacy_doc.to_bytes(user_data=False),
+                [token._.holmes for token in spacy_doc], self.model)
+
     def to_serialized_string(self, spacy_doc):
-        dictionaries = []
-        for token in spacy_doc:
-            dictionaries.append(token._.holmes)
-            token._.holmes = None
-        serialized_document = SerializedHolmesDocument(
-            spacy_doc.to_bytes(), dictionaries, self.model)
-        for token in spacy_doc:
-            token._.holmes = dictionaries[token.i]
-        return jsonpickle.encode(serialized_document)
+        # jsonpickle is only imported when it is needed to speed up importing this module
+        import jsonpickle
+        return jsonpickle.encode(self._to_serialized_document(spacy_doc))
 
     def from_serialized_string(self, serialized_spacy_doc):
+        import jsonpickle
         serialized_document = jsonpickle.decode(serialized_spacy_doc)
         if serialized_document._model != self.model:
             raise WrongModelDeserializationError(serialized_document._model)
+        for dictionary in serialized_document._dictionaries:
+            # jsonpickle only calls __setstate__() for objects whose state was written by
+            # __getstate__(), which is not the case for the dictionaries
+            if 'coreference_clusters' not in dictionary.__dict__:
+                dictionary.__setstate__({})
         return serialized_document.holmes_document(self)
 
+    def parse_phraselet_template(self, phraselet_template):
+        """Returns a new document for the template sentence of a phraselet template. Each
+            template sentence is only parsed once: later documents are restored from a stored
+            representation, which is much faster than parsing.
+        """
+        serialized_document = self._phraselet_template_documents.get(phraselet_template.label)
+        if serialized_document == None:
+            serialized_document = self._to_serialized_document(
+                    self.parse(phraselet_template.template_sentence))
+            self._phraselet_template_documents[phraselet_template.label] = serialized_document
+        doc = serialized_document.holmes_document(self)
+        for token in doc:
+            # the stored dictionaries must not be changed when the caller sets lemmas
+            token._.holmes = copy.copy(token._.holmes)
+        return doc
+
     def get_dependent_phrase(self, token):
         "Return the dependent phrase of a token. Used in building match dictionaries"
         if not token.pos_ in self.noun_pos:
@@ -324,12 +639,11 @@ class SemanticAnalyzer(ABC):
                 return return_string
 
     def is_involved_in_coreference(self, token):
-        if self.model_supports_coreference_resolution() and token.doc._.has_coref:
-            for cluster in token._.coref_clusters:
-                for mention in cluster.mentions:
-                    if mention.root.i == token.i or token.i in \
-                            mention.root._.holmes.righthand_siblings:
-                        return True
+        for cluster in token._.holmes.coreference_clusters:
+            for mention in cluster:
+                if mention.root_index == token.i or token.i in \
+                        mention.root_token(token.doc)._.holmes.righthand_siblings:
+                    return True
         return False
 
     def token_and_coreference_chain_indexes(self, token):
@@ -341,23 +655,23 @@ class SemanticAnalyzer(ABC):
         else:
             list_to_return = []
             # find out which cluster *token* is in
-            for cluster in token._.coref_clusters:
+            for cluster in token._.holmes.coreference_clusters:
                 counter = 0
-                for span in cluster:
-                    for candidate in span.root._.holmes.loop_token_and_righthand_siblings(
-                            token.doc):
+                for mention in cluster:
+                    for candidate in mention.root_token(token.doc)._.holmes.\
+                            loop_token_and_righthand_siblings(token.doc):
                         if candidate.i == token.i:
                             token_mention_index = counter
                     counter += 1
-            for cluster in token._.coref_clusters:
+            for cluster in token._.holmes.coreference_clusters:
                 counter = 0
-                for span in cluster:
+                for mention in cluster:
                     if abs(counter - token_mention_index) <= \
                             self._maximum_mentions_in_coreference_chain:
-                        for candidate in span.root._.holmes.loop_token_and_righthand_siblings(
-                                token.doc):
-                            if candidate.i >= span.start and candidate.i <= span.end and not \
-                                    (token.i >= span.start and token.i <= span.end and
+                        for candidate in mention.root_token(token.doc)._.holmes.\
+                                loop_token_and_righthand_siblings(token.doc):
+                            if candidate.i >= mention.start and candidate.i <= mention.end and \
+                                    not (token.i >= mention.start and token.i <= mention.end and
                                     candidate.i != token.i):
                                 list_to_return.append(candidate.i)
                     counter += 1
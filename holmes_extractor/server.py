@@ -0,0 +1,239 @@
+"""An HTTP server that answers JSON matching requests against a *Manager* object.
+
+The model, ontology, documents, search phrases and supervised topic classifier are loaded once
+when the server starts. Requests are then handled by a pool of worker threads and connections
+are kept alive between requests. Start the server with e.g.
+
+    python -m holmes_extractor.server --model en_core_web_lg --documents docs/ --port 8080
+
+and see *python -m holmes_extractor.server --help* for the other options.
+
+Each POST request carries a JSON object with a *text* property and receives a JSON response:
+
+/match_search_phrases -- matches the registered search phrases against *text*.
+/match_documents -- matches the registered documents against the search phrase *text*.
+/topic_match -- topic matches *text* against the registered documents. The parameters of
+    *Manager.topic_match_documents_against()* may be supplied as further properties.
+/classify -- classifies *text* using the supervised topic classifier.
+
+A GET request to / returns a description of the server configuration.
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from .errors import HolmesError
+from .ingestion import document_paths
+from .manager import Manager
+from .ontology import Ontology
+from .progress import ConsoleProgressReporter
+
+class HolmesServer(HTTPServer):
+    """An HTTP server that answers JSON matching requests against a *Manager* object.
+
+    Args:
+
+    server_address -- a (host, port) tuple. A port of *0* selects a free port.
+    manager -- the *Manager* object with which documents and search phrases have been
+        registered.
+    classifier -- optionally, the *SupervisedTopicClassifier* used to answer classification
+        requests.
+    number_of_workers -- the number of worker threads. Because connections are kept alive,
+        each worker serves one connection at a time and further connections wait until a
+        worker becomes free.
+    keep_alive_timeout -- the number of seconds after which an idle connection is closed.
+    """
+
+    def __init__(self, server_address, manager, *, classifier=None, number_of_workers=8,
+            keep_alive_timeout=30):
+        self.manager = manager
+        self.classifier = classifier
+        self._executor = ThreadPoolExecutor(max_workers=number_of_workers)
+        handler_class = type('_ConfiguredHolmesRequestHandler', (_HolmesRequestHandler,),
+                {'timeout': keep_alive_timeout})
+        super().__init__(server_address, handler_class)
+
+    def process_request(self, request, client_address):
+        self._executor.submit(self._process_request_in_worker, request, client_address)
+
+    def _process_request_in_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._executor.shutdown(wait=False)
+
+class _HolmesRequestHandler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    _topic_match_parameters = ('maximum_activation_distance', 'relation_score',
+            'single_word_score', 'overlapping_relation_multiplier', 'overlap_memory_size',
+            'maximum_activation_value', 'sideways_match_extent', 'number_of_results')
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, content):
+        body = json.dumps(content, default=float).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error_json(self, status, error, message):
+        self._send_json(status, {'error': error, 'message': message})
+
+    def do_GET(self):
+        if self.path != '/':
+            self._send_error_json(404, 'NotFound', self.path)
+            return
+        manager = self.server.manager
+        ontology = manager.structural_matcher.ontology
+        self._send_json(200, {
+                'model': manager.semantic_analyzer.model,
+                'ontology': ontology.path if ontology != None else None,
+                'document_labels': sorted(manager.document_labels()),
+                'search_phrase_labels': manager.list_search_phrase_labels(),
+                'classifier': self.server.classifier != None})
+
+    def do_POST(self):
+        # the request body is always read so that the connection can be reused
+        try:
+            content_length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            content_length = 0
+        body = self.rfile.read(content_length)
+        handlers = {
+                '/match_search_phrases': self._match_search_phrases,
+                '/match_documents': self._match_documents,
+                '/topic_match': self._topic_match,
+                '/classify': self._classify}
+        if self.path not in handlers:
+            self._send_error_json(404, 'NotFound', self.path)
+            return
+        try:
+            request = json.loads(body.decode('utf-8'))
+            if not isinstance(request, dict) or not isinstance(request.get('text'), str):
+                raise ValueError("The request must be a JSON object with a 'text' property.")
+        except ValueError as exception:
+            self._send_error_json(400, 'BadRequest', str(exception))
+            return
+        try:
+            self._send_json(200, handlers[self.path](request))
+        except HolmesError as exception:
+            self._send_error_json(400, type(exception).__name__, str(exception))
+        except (TypeError, ValueError) as exception:
+            self._send_error_json(400, 'BadRequest', str(exception))
+        except Exception as exception:
+            self._send_error_json(500, type(exception).__name__, str(exception))
+
+    def _match_search_phrases(self, request):
+        return self.server.manager.match_search_phrases_against(request['text'])
+
+    def _match_documents(self, request):
+        return self.server.manager.match_documents_against(request['text'])
+
+    def _topic_match(self, request):
+        topic_matcher_arguments = {key: value for key, value in request.items() if key in
+                self._topic_match_parameters}
+        topic_matches = self.server.manager.topic_match_documents_against(request['text'],
+                **topic_matcher_arguments)
+        return [{
+                'document_label': topic_match.document_label,
+                'start_index': topic_match.start_index,
+                'end_index': topic_match.end_index,
+                'sentences_start_index': topic_match.sentences_start_index,
+                'sentences_end_index': topic_match.sentences_end_index,
+                'relative_start_index': topic_match.relative_start_index,
+                'relative_end_index': topic_match.relative_end_index,
+                'score': topic_match.score,
+                'text': topic_match.text} for topic_match in topic_matches]
+
+    def _classify(self, request):
+        if self.server.classifier == None:
+            raise ValueError('No supervised topic classifier has been loaded.')
+        return self.server.classifier.parse_and_classify(request['text'])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m holmes_extractor.server',
+            description='Serves Holmes matching requests over HTTP.')
+    parser.add_argument('--model', required=True, help='the name of the spaCy model')
+    parser.add_argument('--ontology', help='the path of an OWL ontology')
+    parser.add_argument('--symmetric-matching', action='store_true',
+            help='match search phrase words to their hypernyms within the ontology as well')
+    parser.add_argument('--overall-similarity-threshold', type=float, default=1.0)
+    parser.add_argument('--embedding-based-matching-on-root-words', action='store_true')
+    parser.add_argument('--coreference-resolution', choices=('on', 'off'),
+            help='defaults to performing coreference resolution if the model supports it')
+    parser.add_argument('--disabled-pipes', nargs='*', default=[],
+            help='spaCy pipeline components that should not be loaded')
+    parser.add_argument('--documents', nargs='*', default=[],
+            help='text files, JSON Lines files with a \'text\' and optionally a \'label\' '
+            'property, or directories containing such files, to register as documents; each text '
+            'file is labelled with its file name')
+    parser.add_argument('--serialized-documents', nargs='*', default=[],
+            help='files, or directories containing files, holding serialized documents')
+    parser.add_argument('--search-phrases',
+            help='a text file containing one search phrase per line')
+    parser.add_argument('--classifier', help='a file containing a serialized supervised '
+            'topic classifier model in either the JSON or the binary format')
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=8)
+    arguments = parser.parse_args(argv)
+
+    if arguments.ontology != None:
+        ontology = Ontology(arguments.ontology, symmetric_matching=arguments.symmetric_matching)
+    else:
+        ontology = None
+    if arguments.coreference_resolution == None:
+        perform_coreference_resolution = None
+    else:
+        perform_coreference_resolution = arguments.coreference_resolution == 'on'
+    manager = Manager(arguments.model, ontology=ontology,
+            overall_similarity_threshold=arguments.overall_similarity_threshold,
+            embedding_based_matching_on_root_words=
+            arguments.embedding_based_matching_on_root_words,
+            perform_coreference_resolution=perform_coreference_resolution,
+            disabled_pipes=arguments.disabled_pipes)
+    manager.register_documents_from_paths(arguments.documents,
+            progress_reporter=ConsoleProgressReporter())
+    for path in document_paths(arguments.serialized_documents):
+        with open(path, encoding='utf-8') as file:
+            manager.deserialize_and_register_document(file.read(), os.path.basename(path))
+    if arguments.search_phrases != None:
+        with open(arguments.search_phrases, encoding='utf-8') as file:
+            for line in file:
+                if line.strip() != '':
+                    manager.register_search_phrase(line.strip())
+    if arguments.classifier != None:
+        with open(arguments.classifier, 'rb') as file:
+            serialized_model = file.read()
+        if not serialized_model.startswith(b'PK'):
+            # binary models are zip archives; anything else is a JSON model
+            serialized_model = serialized_model.decode('utf-8')
+        classifier = manager.deserialize_supervised_topic_classifier(serialized_model)
+    else:
+        classifier = None
+
+    server = HolmesServer((arguments.host, arguments.port), manager, classifier=classifier,
+            number_of_workers=arguments.workers)
+    print('Serving on', ':'.join((server.server_address[0], str(server.server_address[1]))))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == '__main__':
+    main()
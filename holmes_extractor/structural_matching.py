@@ -1,6 +1,9 @@
 import copy
+import time
 from .errors import *
 from .semantics import SemanticDependency
+from .metrics import timer
+from .progress import _ProgressTracker
 
 class WordMatch:
     """A match between a searched phrase word and a document word.
@@ -122,13 +125,107 @@ class SerializedPhraselet:
     def __hash__(self):
         return hash((self.template_label, self.parent_word, self.child_word))
 
+class MatchBudget:
+    """Limits on the work performed by a single call to *StructuralMatcher.match()*, so that
+        pathological documents, e.g. with very long coordinations, cannot make matching run for
+        an unbounded time.
+
+    Parameters:
+
+    maximum_recursion_steps -- the maximum number of attempts to match a search phrase token
+        to a document token during the call, or *None* for no limit.
+    maximum_partial_matches -- the maximum number of partial matches that may be built from
+        the word matches found starting at a single document token that matches a search phrase
+        root token, or *None* for no limit. Partial matches multiply where words are
+        coordinated.
+    deadline_seconds -- the maximum wall time in seconds the call may take, or *None* for no
+        limit.
+    raise_when_exceeded -- if *True*, a *MatchBudgetExceededError* is raised when a limit is
+        exceeded. If *False*, the matches found so far are returned in a *ResultList* whose
+        *is_truncated* property is *True*: exceeding *maximum_partial_matches* only skips the
+        document token concerned and matching continues, while exceeding either of the other
+        limits ends the call.
+    """
+
+    def __init__(self, *, maximum_recursion_steps=None, maximum_partial_matches=None,
+            deadline_seconds=None, raise_when_exceeded=False):
+        for name, value in (('maximum_recursion_steps', maximum_recursion_steps),
+                ('maximum_partial_matches', maximum_partial_matches),
+                ('deadline_seconds', deadline_seconds)):
+            if value != None and value <= 0:
+                raise ValueError(' '.join((name, 'must be greater than 0')))
+        self.maximum_recursion_steps = maximum_recursion_steps
+        self.maximum_partial_matches = maximum_partial_matches
+        self.deadline_seconds = deadline_seconds
+        self.raise_when_exceeded = raise_when_exceeded
+
+class _MatchBudgetExceeded(Exception):
+    """Raised internally to end a call to *StructuralMatcher.match()* whose budget has been
+        exceeded when the matches found so far are to be returned.
+    """
+    pass
+
+class _MatchBudgetTracker:
+    """Keeps track of the work performed by a single call to *StructuralMatcher.match()*
+        against a *MatchBudget*.
+    """
+
+    def __init__(self, match_budget):
+        self.match_budget = match_budget
+        self.recursion_steps = 0
+        if match_budget.deadline_seconds != None:
+            self.deadline = time.perf_counter() + match_budget.deadline_seconds
+        else:
+            self.deadline = None
+        self.is_truncated = False
+
+    def record_recursion_step(self):
+        self.recursion_steps += 1
+        if self.match_budget.maximum_recursion_steps != None and \
+                self.recursion_steps > self.match_budget.maximum_recursion_steps:
+            self._exceeded('maximum_recursion_steps', self.match_budget.maximum_recursion_steps)
+        self.check_deadline()
+
+    def check_deadline(self):
+        if self.deadline != None and time.perf_counter() > self.deadline:
+            self._exceeded('deadline_seconds', self.match_budget.deadline_seconds)
+
+    def partial_matches_permitted(self, number_of_partial_matches):
+        """Returns *False* if the document token at which matching started should be skipped
+            because *number_of_partial_matches* is more than the budget allows.
+        """
+        if self.match_budget.maximum_partial_matches == None or \
+                number_of_partial_matches <= self.match_budget.maximum_partial_matches:
+            return True
+        if self.match_budget.raise_when_exceeded:
+            raise MatchBudgetExceededError(' '.join(('maximum_partial_matches:',
+                    str(self.match_budget.maximum_partial_matches))))
+        self.is_truncated = True
+        return False
+
+    def _exceeded(self, name, value):
+        if self.match_budget.raise_when_exceeded:
+            raise MatchBudgetExceededError(' '.join((name + ':', str(value))))
+        self.is_truncated = True
+        raise _MatchBudgetExceeded()
+
+class ResultList(list):
+    """A list of results that records whether a *MatchBudget* was exceeded while the results
+        were being found, in which case *is_truncated* is *True* and further results may exist.
+    """
+
+    def __init__(self, results=(), is_truncated=False):
+        super().__init__(results)
+        self.is_truncated = is_truncated
+
 
 class StructuralMatcher:
     """The class responsible for matching search phrases with documents."""
 
     def __init__(self, semantic_analyzer, ontology, overall_similarity_threshold,
             embedding_based_matching_on_root_words, perform_coreference_resolution,
-            output_document_matching_message_to_console=False):
+            progress_reporter=None, search_phrase_cache=None,
+            metrics=None, match_budget=None):
         """Args:
 
         semantic_analyzer -- the *SemanticAnalyzer* object to use in generating search phrase
@@ -143,8 +240,15 @@ class StructuralMatcher:
             matching should be attempted on search-phrase root tokens, which has a considerable
             performance hit. Defaults to *False*.
         perform_coreference_resolution -- *True*, if coreference resolution should be performed.
-        output_document_matching_message_to_console -- *True* if a status message should be written
-            to the console when a document is matched.
+        progress_reporter -- optionally, a *ProgressReporter* object that is informed whenever
+            a document has been matched.
+        search_phrase_cache -- optionally, an *LruCache* object in which search phrases
+            registered from text are stored so that registering the same text again does not
+            require it to be parsed. The cache may be shared between several structural matchers.
+        metrics -- optionally, a *Metrics* object in which the time spent in each matching stage
+            and the amount of matching work performed are recorded.
+        match_budget -- optionally, a *MatchBudget* object limiting the work performed by each
+            call to *match()*.
         """
         self.semantic_analyzer = semantic_analyzer
         self.ontology = ontology
@@ -154,15 +258,19 @@ class StructuralMatcher:
         self.search_phrases = []
         # Dict from document labels to *_RegisteredDocument* objects
         self._registered_documents = {}
+        # incremented whenever a document is registered or removed
+        self.document_version = 0
         self.perform_coreference_resolution = perform_coreference_resolution
-        self.output_document_matching_message_to_console = \
-                output_document_matching_message_to_console
+        self.progress_reporter = progress_reporter
+        self.search_phrase_cache = search_phrase_cache
+        self.metrics = metrics
+        self.match_budget = match_budget
 
     class _SearchPhrase:
 
         def __init__(self, doc, matchable_tokens, root_token,
                 matchable_non_entity_tokens_to_lexemes, single_token_similarity_threshold, label,
-                ontology, topic_match_phraselet):
+                ontology, topic_match_phraselet, required_word_sets):
             """Args:
 
             doc -- the Holmes document created for the search phrase
@@ -177,6 +285,10 @@ class StructuralMatcher:
             label -- a label for the search phrase.
             ontology -- a reference to the ontology held by the outer *StructuralMatcher* object.
             topic_match_phraselet -- 'True' if a topic match phraselet, otherwise 'False'.
+            required_word_sets -- a tuple containing, for each matchable token that can only
+                match words that are related to it directly or via the ontology, the set of
+                those words. A document can only match if it contains at least one word from
+                each set.
             """
             self.doc = doc
             self.matchable_tokens = matchable_tokens
@@ -186,6 +298,7 @@ class StructuralMatcher:
             self.label = label
             self.ontology = ontology
             self.topic_match_phraselet = topic_match_phraselet
+            self.required_word_sets = required_word_sets
 
     class _RegisteredDocument:
         """Args:
@@ -193,11 +306,15 @@ class StructuralMatcher:
         doc -- the Holmes document
         words_to_token_indexes_dict -- a dictionary from words to the token indexes
             where each word occurs in the document
+        words -- a frozenset of every word with which a search phrase word can be compared
+            when matching against the document, used to rule out search phrases that cannot
+            match before any matching is attempted
         """
 
-        def __init__(self, doc, words_to_token_indexes_dict):
+        def __init__(self, doc, words_to_token_indexes_dict, words):
             self.doc = doc
             self.words_to_token_indexes_dict = words_to_token_indexes_dict
+            self.words = words
 
     class _MultiwordSpan:
 
@@ -216,18 +333,25 @@ class StructuralMatcher:
         """ Generator over all words that match the root token of the search phrase,
             taking any ontology into account.
         """
-        yield search_phrase.root_token._.holmes.lemma
-        if not search_phrase.topic_match_phraselet:
-            yield search_phrase.root_token.text.lower()
+        return self._words_matching_search_phrase_token(search_phrase.root_token,
+                search_phrase.topic_match_phraselet)
+
+    def _words_matching_search_phrase_token(self, search_phrase_token, topic_match_phraselet):
+        """ Generator over all words that match a search phrase token, taking any ontology
+            into account.
+        """
+        yield search_phrase_token._.holmes.lemma
+        if not topic_match_phraselet:
+            yield search_phrase_token.text.lower()
         if self.ontology != None and not \
-                self._is_entity_search_phrase_token(search_phrase.root_token,
-                        search_phrase.topic_match_phraselet):
+                self._is_entity_search_phrase_token(search_phrase_token, topic_match_phraselet):
             ontology_matching_strings = set()
+            # the ontology dictionary is keyed by lower-case words
             ontology_matching_strings.update(self.ontology.get_words_matching_lower_case(
-                    search_phrase.root_token._.holmes.lemma))
-            if not search_phrase.topic_match_phraselet:
+                    search_phrase_token._.holmes.lemma.lower()))
+            if not topic_match_phraselet:
                 ontology_matching_strings.update(self.ontology.get_words_matching_lower_case(
-                        search_phrase.root_token.text.lower()))
+                        search_phrase_token.text.lower()))
             for working_word in ontology_matching_strings:
                 yield working_word
 
@@ -259,6 +383,37 @@ class StructuralMatcher:
                             working_tokens)
             pointer += 1
 
+    def _new_structural_matcher(self):
+        return StructuralMatcher(self.semantic_analyzer, self.ontology,
+                self.overall_similarity_threshold, self.embedding_based_matching_on_root_words,
+                self.perform_coreference_resolution,
+                self.progress_reporter, self.search_phrase_cache,
+                self.metrics, self.match_budget)
+
+    def matcher_sharing_documents(self):
+        """Returns a new *StructuralMatcher* with the same settings as this object that matches
+            against the documents currently registered with this object but has its own,
+            initially empty, set of search phrases. Registering search phrases with the new
+            object does not change the state of this object, so that several such objects can
+            be used concurrently from different threads.
+        """
+        structural_matcher = self._new_structural_matcher()
+        structural_matcher._registered_documents = self._registered_documents.copy()
+        structural_matcher.document_version = self.document_version
+        return structural_matcher
+
+    def matcher_sharing_search_phrases(self):
+        """Returns a new *StructuralMatcher* with the same settings as this object that matches
+            the search phrases currently registered with this object but has its own, initially
+            empty, set of registered documents. Registering documents with the new object does
+            not change the state of this object, so that several such objects can be used
+            concurrently from different threads.
+        """
+        structural_matcher = self._new_structural_matcher()
+        structural_matcher.search_phrases = self.search_phrases.copy()
+        structural_matcher.search_phrase_labels = self.search_phrase_labels.copy()
+        return structural_matcher
+
     def remove_all_search_phrases(self):
         self.search_phrases = []
         self.search_phrase_labels = set()
@@ -269,10 +424,55 @@ class StructuralMatcher:
         if label in self.search_phrase_labels:
             self.search_phrase_labels.remove(label)
 
+    def search_phrase_cache_key(self, search_phrase_text):
+        """Returns the key under which a search phrase registered from *search_phrase_text* is
+            stored in the search phrase cache. Because the key contains everything that affects
+            how a search phrase is compiled, a cache may be shared between structural matchers
+            with different settings.
+        """
+        return (search_phrase_text, self.semantic_analyzer.model, self.ontology,
+                self.overall_similarity_threshold, self.perform_coreference_resolution)
+
     def register_search_phrase(self, search_phrase_text, label, topic_match_phraselet=False):
-        search_phrase_doc = self.semantic_analyzer.parse(search_phrase_text)
-        self._internal_register_search_phrase(search_phrase_text, search_phrase_doc, label,
-                topic_match_phraselet)
+        if self.search_phrase_cache == None or topic_match_phraselet:
+            search_phrase_doc = self.semantic_analyzer.parse(search_phrase_text)
+            self._internal_register_search_phrase(search_phrase_text, search_phrase_doc, label,
+                    topic_match_phraselet)
+            return
+        key = self.search_phrase_cache_key(search_phrase_text)
+        search_phrase = self.search_phrase_cache.get(key)
+        if search_phrase == None:
+            search_phrase_doc = self.semantic_analyzer.parse(search_phrase_text)
+            search_phrase = self._create_search_phrase(search_phrase_text, search_phrase_doc,
+                    label, False)
+            if search_phrase == None:
+                return
+            self.search_phrase_cache.put(key, search_phrase)
+            self._add_search_phrase(search_phrase)
+        else:
+            self.register_cached_search_phrase(search_phrase, label)
+
+    def register_cached_search_phrase(self, search_phrase, label):
+        """Registers a search phrase object that has been retrieved from the search phrase cache
+            under *label*.
+        """
+        if search_phrase.label != label:
+            # the cached object is shared and must not be changed
+            search_phrase = copy.copy(search_phrase)
+            search_phrase.label = label
+        self._add_search_phrase(search_phrase)
+
+    def register_parsed_search_phrase(self, search_phrase_text, search_phrase_doc, label):
+        """Registers a search phrase that has already been parsed by *self.semantic_analyzer*.
+            The document may be changed during registration and should not be reused.
+        """
+        search_phrase = self._create_search_phrase(search_phrase_text, search_phrase_doc, label,
+                False)
+        if search_phrase != None:
+            if self.search_phrase_cache != None:
+                self.search_phrase_cache.put(self.search_phrase_cache_key(search_phrase_text),
+                        search_phrase)
+            self._add_search_phrase(search_phrase)
 
     def register_phraselet_doc(self, phraselet_doc, label):
         if label not in self.search_phrase_labels:
@@ -304,26 +504,33 @@ class StructuralMatcher:
                 # ontology contains text but not lemma, so stick to text
             return word
 
+        def register_phraselet(phraselet_template, phraselet_label, parent_word, child_word):
+            # the template sentence is only parsed for phraselets that are not yet registered
+            if phraselet_label not in self.search_phrase_labels:
+                phraselet_doc = self.semantic_analyzer.parse_phraselet_template(
+                        phraselet_template)
+                phraselet_doc[phraselet_template.parent_index]._.holmes.lemma = parent_word
+                if child_word != None:
+                    phraselet_doc[phraselet_template.child_index]._.holmes.lemma = child_word
+                self.register_phraselet_doc(phraselet_doc, phraselet_label)
+            if returning_serialized_phraselets:
+                serialized_phraselets.append(SerializedPhraselet(
+                        phraselet_label, phraselet_template.label, parent_word, child_word))
+
         def process_single_word_phraselet_templates(token, checking_tags):
             for phraselet_template in (phraselet_template for phraselet_template in
                     self.semantic_analyzer.phraselet_templates if
                     phraselet_template.single_word() and token._.holmes.is_matchable):
                 if not checking_tags or token.tag_ in phraselet_template.parent_tags:
-                    phraselet_doc = self.semantic_analyzer.parse(
-                        phraselet_template.template_sentence)
                     word = get_word_from_token(token)
                     if self.ontology != None and replace_with_hypernym_ancestors:
                         word = self.ontology.get_most_general_hypernym_ancestor(word)
-                    phraselet_doc[phraselet_template.parent_index]._.holmes.lemma = word
                     phraselet_label = ''.join((phraselet_template.label, ': ', word))
                     if word not in self.semantic_analyzer.phraselet_stop_lemmas and word != \
                             'ENTITYNOUN':
                             # ENTITYNOUN has to be excluded as single word although it is still
                             # permitted as the child of a relation phraselet template
-                        self.register_phraselet_doc(phraselet_doc, phraselet_label)
-                        if returning_serialized_phraselets:
-                            serialized_phraselets.append(SerializedPhraselet(
-                                    phraselet_label, phraselet_template.label, word, None))
+                        register_phraselet(phraselet_template, phraselet_label, word, None)
 
         if returning_serialized_phraselets:
             serialized_phraselets = []
@@ -353,8 +560,6 @@ class StructuralMatcher:
                                     doc[child].tag_ in phraselet_template.child_tags and \
                                     doc[parent]._.holmes.is_matchable and \
                                     doc[child]._.holmes.is_matchable:
-                                phraselet_doc = self.semantic_analyzer.parse(
-                                        phraselet_template.template_sentence)
                                 parent_word = get_word_from_token(doc[parent])
                                 if self.ontology != None and replace_with_hypernym_ancestors:
                                     parent_word = \
@@ -365,21 +570,14 @@ class StructuralMatcher:
                                     child_word = \
                                             self.ontology.get_most_general_hypernym_ancestor(
                                             child_word)
-                                phraselet_doc[phraselet_template.parent_index]._.holmes.lemma = \
-                                        parent_word
-                                phraselet_doc[phraselet_template.child_index]._.holmes.lemma = \
-                                        child_word
                                 phraselet_label = ''.join((phraselet_template.label, ': ',
                                         parent_word, '-', child_word))
                                 if parent_word not in \
                                         self.semantic_analyzer.phraselet_stop_lemmas and \
                                         child_word not in \
                                         self.semantic_analyzer.phraselet_stop_lemmas:
-                                    self.register_phraselet_doc(phraselet_doc, phraselet_label)
-                                    if returning_serialized_phraselets:
-                                        serialized_phraselets.append(SerializedPhraselet(
-                                                phraselet_label, phraselet_template.label,
-                                                parent_word, child_word))
+                                    register_phraselet(phraselet_template, phraselet_label,
+                                            parent_word, child_word)
             process_single_word_phraselet_templates(token, True)
         if len(self.list_search_phrase_labels()) == 0 and not match_all_words:
             for token in doc:
@@ -393,19 +591,23 @@ class StructuralMatcher:
         def register_serialized_phraselet(serialized_phraselet):
             for phraselet_template in self.semantic_analyzer.phraselet_templates:
                 if serialized_phraselet.template_label == phraselet_template.label:
-                    phraselet_doc = self.semantic_analyzer.parse(
-                            phraselet_template.template_sentence)
-                    phraselet_doc[phraselet_template.parent_index]._.holmes.lemma = \
-                            serialized_phraselet.parent_word
                     if serialized_phraselet.child_word != None:
-                        phraselet_doc[phraselet_template.child_index]._.holmes.lemma = \
-                                serialized_phraselet.child_word
                         phraselet_label = ''.join((phraselet_template.label, ': ',
                                 serialized_phraselet.parent_word, '-',
                                 serialized_phraselet.child_word))
                     else:
                         phraselet_label = ''.join((phraselet_template.label, ': ',
                                 serialized_phraselet.parent_word))
+                    if phraselet_label in self.search_phrase_labels:
+                        # avoid parsing the template sentence for a duplicate phraselet
+                        return
+                    phraselet_doc = self.semantic_analyzer.parse_phraselet_template(
+                            phraselet_template)
+                    phraselet_doc[phraselet_template.parent_index]._.holmes.lemma = \
+                            serialized_phraselet.parent_word
+                    if serialized_phraselet.child_word != None:
+                        phraselet_doc[phraselet_template.child_index]._.holmes.lemma = \
+                                serialized_phraselet.child_word
                     self.register_phraselet_doc(phraselet_doc, phraselet_label)
                     return
             raise RuntimeError(' '.join(('Phraselet template', serialized_phraselet.template_label,
@@ -434,6 +636,24 @@ class StructuralMatcher:
 
     def _internal_register_search_phrase(self, search_phrase_text, search_phrase_doc,
             label, topic_match_phraselet):
+        search_phrase = self._create_search_phrase(search_phrase_text, search_phrase_doc, label,
+                topic_match_phraselet)
+        if search_phrase != None:
+            self._add_search_phrase(search_phrase)
+
+    def _add_search_phrase(self, search_phrase):
+        self.search_phrases.append(search_phrase)
+        self.search_phrase_labels.add(search_phrase.label)
+
+    def _create_search_phrase(self, search_phrase_text, search_phrase_doc, label,
+            topic_match_phraselet):
+        """Returns a new *_SearchPhrase* object, or *None* if the document has no root token."""
+        with timer(self.metrics, 'search_phrase_compilation'):
+            return self._compile_search_phrase(search_phrase_text, search_phrase_doc, label,
+                    topic_match_phraselet)
+
+    def _compile_search_phrase(self, search_phrase_text, search_phrase_doc, label,
+            topic_match_phraselet):
 
         def replace_grammatical_root_token_recursively(token):
             """Where the syntactic root of a search phrase document is a grammatical token or is
@@ -476,46 +696,107 @@ class StructuralMatcher:
 
         root_tokens = []
         tokens_to_match = []
-        matchable_non_entity_tokens_to_lexemes = {}
         for token in search_phrase_doc:
             # check whether grammatical token
             if token._.holmes.is_matchable and not (len(token._.holmes.children) > 0 and
                     token._.holmes.children[0].child_index < 0):
                 tokens_to_match.append(token)
-                if self.ontology != None:
-                    self.ontology.add_to_dictionary(token._.holmes.lemma)
-                    if not topic_match_phraselet:
-                        self.ontology.add_to_dictionary(token.text)
-                if self.overall_similarity_threshold < 1.0 and not \
-                        self._is_entity_search_phrase_token(token, topic_match_phraselet):
-                    if not topic_match_phraselet:
-                        matchable_non_entity_tokens_to_lexemes[token.i] = \
-                                self.semantic_analyzer.nlp.vocab[token.lemma_]
-                    else:
-                        matchable_non_entity_tokens_to_lexemes[token.i] = \
-                                self.semantic_analyzer.nlp.vocab[token._.holmes.lemma]
             if token.dep_ == 'ROOT': # syntactic root
                 root_tokens.append(replace_grammatical_root_token_recursively(token))
         if len(tokens_to_match) == 0:
             raise SearchPhraseWithoutMatchableWordsError(search_phrase_text)
         if len(root_tokens) > 1:
             raise SearchPhraseContainsMultipleClausesError(search_phrase_text)
+        if len(root_tokens) == 1:
+            return self._search_phrase_from_tokens(search_phrase_doc, tokens_to_match,
+                    root_tokens[0], label, topic_match_phraselet)
+        return None
+
+    def _search_phrase_from_tokens(self, search_phrase_doc, tokens_to_match, root_token, label,
+            topic_match_phraselet):
+        """Returns a new *_SearchPhrase* object for a search phrase document whose matchable
+            tokens and root token have already been determined, either by compilation or
+            because the search phrase is being restored from a snapshot.
+        """
+        matchable_non_entity_tokens_to_lexemes = {}
+        for token in tokens_to_match:
+            if self.ontology != None:
+                self.ontology.add_to_dictionary(token._.holmes.lemma)
+                if not topic_match_phraselet:
+                    self.ontology.add_to_dictionary(token.text)
+            if self.overall_similarity_threshold < 1.0 and not \
+                    self._is_entity_search_phrase_token(token, topic_match_phraselet):
+                if not topic_match_phraselet:
+                    matchable_non_entity_tokens_to_lexemes[token.i] = \
+                            self.semantic_analyzer.nlp.vocab[token.lemma_]
+                else:
+                    matchable_non_entity_tokens_to_lexemes[token.i] = \
+                            self.semantic_analyzer.nlp.vocab[token._.holmes.lemma]
         single_token_similarity_threshold = 1.0
         if self.overall_similarity_threshold < 1.0 and \
                 len(matchable_non_entity_tokens_to_lexemes) > 0:
             single_token_similarity_threshold = \
                     self.overall_similarity_threshold ** len(matchable_non_entity_tokens_to_lexemes)
-        if len(root_tokens) == 1:
-            self.search_phrases.append(self._SearchPhrase(search_phrase_doc, tokens_to_match,
-                    root_tokens[0], matchable_non_entity_tokens_to_lexemes,
-                    single_token_similarity_threshold, label, self.ontology,
-                    topic_match_phraselet))
-            self.search_phrase_labels.add(label)
+        # tokens that can match entities or, via embeddings, any word are not restricted to
+        # particular words
+        required_word_sets = tuple(frozenset(self._words_matching_search_phrase_token(token,
+                topic_match_phraselet)) for token in tokens_to_match if token.i not in
+                matchable_non_entity_tokens_to_lexemes and not
+                self._is_entity_search_phrase_token(token, topic_match_phraselet))
+        return self._SearchPhrase(search_phrase_doc, tokens_to_match, root_token,
+                matchable_non_entity_tokens_to_lexemes, single_token_similarity_threshold, label,
+                self.ontology, topic_match_phraselet, required_word_sets)
 
     def list_search_phrase_labels(self):
         return sorted(self.search_phrase_labels)
 
     def register_document(self, parsed_document, label):
+        if label in self._registered_documents.keys():
+            raise DuplicateDocumentError(label)
+        with timer(self.metrics, 'document_registration'):
+            words_to_token_indexes_dict = self._words_to_token_indexes_dict(parsed_document)
+        self._register_document_with_index(parsed_document, label, words_to_token_indexes_dict)
+
+    def _register_document_with_index(self, parsed_document, label, words_to_token_indexes_dict):
+        """Registers a document whose dictionary from words to token indexes has already been
+            built, e.g. by an earlier registration of the same document that has been restored
+            from a snapshot.
+        """
+        if label in self._registered_documents.keys():
+            raise DuplicateDocumentError(label)
+        self._registered_documents[label] = self._RegisteredDocument(parsed_document,
+                words_to_token_indexes_dict, self._document_words(parsed_document))
+        self.document_version += 1
+
+    def _document_words(self, parsed_document):
+        """Returns a frozenset of the words with which search phrase words are compared when
+            matching against *parsed_document*: the Holmes lemma and lower-case text of each
+            token and, where there is an ontology, the lower-case text of each multiword span.
+            Holmes lemmas are also included in lower case because ontology matching ignores
+            case.
+        """
+        words = set()
+        for token in parsed_document:
+            words.add(token._.holmes.lemma)
+            words.add(token._.holmes.lemma.lower())
+            words.add(token.text.lower())
+            if self.ontology != None:
+                for multiword_span in self._multiword_spans_with_head_token(token):
+                    words.add(multiword_span.text.lower())
+        return frozenset(words)
+
+    def _document_may_match(self, search_phrase, registered_document):
+        """Returns *False* if *search_phrase* cannot match the registered document because
+            the document contains none of the words that one of its matchable tokens could
+            match.
+        """
+        document_words = registered_document.words
+        for required_word_set in search_phrase.required_word_sets:
+            if required_word_set.isdisjoint(document_words):
+                return False
+        return True
+
+    def _words_to_token_indexes_dict(self, parsed_document):
 
         def add_dict_entry(dict, word, token_index):
             if word in dict.keys():
@@ -530,8 +811,6 @@ class StructuralMatcher:
                     return multiword_span.text.lower()
             return None
 
-        if label in self._registered_documents.keys():
-            raise DuplicateDocumentError(label)
         words_to_token_indexes_dict = {}
         for token in parsed_document:
             if self.ontology != None:
@@ -551,14 +830,15 @@ class StructuralMatcher:
                     or token.ent_type_ != token.head.ent_type_):
                 entity_label = ''.join(('ENTITY', token.ent_type_))
                 add_dict_entry(words_to_token_indexes_dict, entity_label, token.i)
-        self._registered_documents[label] = self._RegisteredDocument(parsed_document,
-                words_to_token_indexes_dict)
+        return words_to_token_indexes_dict
 
     def remove_document(self, label):
         self._registered_documents.pop(label)
+        self.document_version += 1
 
     def remove_all_documents(self):
         self._registered_documents = {}
+        self.document_version += 1
 
     def document_labels(self):
         """Returns a list of the labels of the currently registered documents."""
@@ -572,7 +852,7 @@ class StructuralMatcher:
 
     def _match_recursively(self, *, search_phrase, search_phrase_token, document, document_token,
         search_phrase_tokens_to_word_matches, search_phrase_and_document_visited_table,
-        is_uncertain, structurally_matched_document_token):
+        is_uncertain, structurally_matched_document_token, budget_tracker):
         """Called whenever matching is attempted between a search phrase token and a document
             token."""
 
@@ -604,9 +884,8 @@ class StructuralMatcher:
                     # Loop through the dependencies from each token
                     for document_dependency in (document_dependency for
                             document_dependency in working_document_parent._.holmes.children
-                            if self.semantic_analyzer.dependency_labels_match(
-                            search_phrase_dependency_label= dependency.label,
-                            document_dependency_label = document_dependency.label)):
+                            if self.semantic_analyzer.dependency_label_ids_match(
+                            dependency.label_id, document_dependency.label_id)):
                         document_child = document_dependency.child_token(document_token.doc)
                         # wherever a dependency is found, loop through any tokens linked
                         # to the child by coreference
@@ -632,7 +911,8 @@ class StructuralMatcher:
                                             search_phrase_and_document_visited_table,
                                     is_uncertain=(document_dependency.is_uncertain and not
                                             dependency.is_uncertain),
-                                    structurally_matched_document_token=document_child):
+                                    structurally_matched_document_token=document_child,
+                                    budget_tracker=budget_tracker):
                                 at_least_one_document_dependency_matched = True
                 if at_least_one_document_dependency_tried and not \
                         at_least_one_document_dependency_matched:
@@ -643,6 +923,10 @@ class StructuralMatcher:
                     document_word, match_type, similarity_measure, is_negated, is_uncertain,
                     structurally_matched_document_token, document_word, depth))
 
+        if self.metrics != None:
+            self.metrics.increment('recursive_matching_calls')
+        if budget_tracker != None:
+            budget_tracker.record_recursion_step()
         search_phrase_and_document_visited_table[search_phrase_token.i].add(document_token.i)
         is_negated = document_token._.holmes.is_negated
         if document_token._.holmes.is_uncertain:
@@ -681,12 +965,12 @@ class StructuralMatcher:
             handle_match(search_phrase_word_lemma, document_word_lemma, 'direct', 0)
             return True
         if self.ontology != None:
-            entry = self.ontology.matches(search_phrase_word_lemma, document_word_text)
+            entry = self._ontology_matches(search_phrase_word_lemma, document_word_text)
             if entry != None:
                 handle_match(search_phrase_word_lemma, entry.word, 'ontology',
                         entry.depth)
                 return True
-            entry = self.ontology.matches(search_phrase_word_lemma, document_word_lemma)
+            entry = self._ontology_matches(search_phrase_word_lemma, document_word_lemma)
             if entry != None:
                 handle_match(search_phrase_word_lemma, entry.word, 'ontology',
                         entry.depth)
@@ -703,12 +987,12 @@ class StructuralMatcher:
                     handle_match(search_phrase_token.text, document_word_lemma, 'direct', 0)
                     return True
             if self.ontology != None:
-                entry = self.ontology.matches(search_phrase_word_text, document_word_text)
+                entry = self._ontology_matches(search_phrase_word_text, document_word_text)
                 if entry != None:
                     handle_match(search_phrase_token.text, entry.word, 'ontology',
                             entry.depth)
                     return True
-                entry = self.ontology.matches(search_phrase_word_text, document_word_lemma)
+                entry = self._ontology_matches(search_phrase_word_text, document_word_lemma)
                 if entry != None:
                     handle_match(search_phrase_token.text, entry.word, 'ontology',
                             entry.depth)
@@ -724,7 +1008,8 @@ class StructuralMatcher:
                         handle_match(search_phrase_word_lemma, multiword_span.text, 'ontology',
                                 0)
                         return True
-                entry = self.ontology.matches(search_phrase_word_lemma, multiword_span.text.lower())
+                entry = self._ontology_matches(search_phrase_word_lemma,
+                        multiword_span.text.lower())
                 if entry != None:
                     for working_token in multiword_span.tokens:
                         search_phrase_and_document_visited_table[search_phrase_token.i].add(
@@ -733,7 +1018,7 @@ class StructuralMatcher:
                             entry.depth)
                     return True
                 if not search_phrase.topic_match_phraselet:
-                    entry = self.ontology.matches(search_phrase_word_text,
+                    entry = self._ontology_matches(search_phrase_word_text,
                             multiword_span.text.lower())
                     if entry != None:
                         for working_token in multiword_span.tokens:
@@ -744,6 +1029,8 @@ class StructuralMatcher:
                         return True
 
         if search_phrase_token.i in search_phrase.matchable_non_entity_tokens_to_lexemes.keys():
+            if self.metrics != None:
+                self.metrics.increment('embedding_similarity_calls')
             similarity_measure = search_phrase.matchable_non_entity_tokens_to_lexemes[
                     search_phrase_token.i].similarity(document_token)
             if similarity_measure > search_phrase.single_token_similarity_threshold:
@@ -756,6 +1043,11 @@ class StructuralMatcher:
                 return True
         return False
 
+    def _ontology_matches(self, search_phrase_word, document_word):
+        if self.metrics != None:
+            self.metrics.increment('ontology_lookups')
+        return self.ontology.matches(search_phrase_word, document_word)
+
     def _is_entity_search_phrase_token(self, search_phrase_token, topic_match_phraselet):
         if topic_match_phraselet:
             word_to_check = search_phrase_token._.holmes.lemma
@@ -784,13 +1076,13 @@ class StructuralMatcher:
                 # classifies whitespace as entities.
 
     def _build_matches(self, *, search_phrase, document, search_phrase_tokens_to_word_matches,
-            document_label):
+            document_label, budget_tracker):
         """Investigate possible matches when recursion is complete."""
 
         def get_mention_index_within_coref_cluster(cluster, token):
             """Get the index of the mention within *cluster* in which *token* occurs."""
             counter = -1
-            for mention in cluster.mentions:
+            for mention in cluster:
                 counter += 1
                 if token.i >= mention.start and token.i <= mention.end:
                     return counter
@@ -817,9 +1109,10 @@ class StructuralMatcher:
                         relevant_word_matches[0].document_token.doc[
                         structurally_matched_document_token_index]
                 already_added_document_token_indexes = set()
-                if structurally_matched_document_token._.in_coref:
+                if len(structurally_matched_document_token._.holmes.coreference_clusters) > 0:
                     # There can potentially be multiple clusters.
-                    for cluster in structurally_matched_document_token._.coref_clusters:
+                    for cluster in \
+                            structurally_matched_document_token._.holmes.coreference_clusters:
                         structural_index = get_mention_index_within_coref_cluster(
                             cluster, structurally_matched_document_token)
                         working_index = -1
@@ -860,41 +1153,41 @@ class StructuralMatcher:
                     in ('direct', 'ontology')):
                 working_entries = []
                 # First loop through getting ontology entries for all mentions in the cluster
-                for cluster in word_match.document_token._.coref_clusters:
-                    for mention in cluster.mentions:
-                        mention_root_token = mention.root
+                for cluster in word_match.document_token._.holmes.coreference_clusters:
+                    for mention in cluster:
+                        mention_root_token = mention.root_token(word_match.document_token.doc)
                         working_entries.append(
-                                self.ontology.matches(
+                                self._ontology_matches(
                                 word_match.search_phrase_token._.holmes.lemma,
                                 mention_root_token._.holmes.lemma))
                         working_entries.append(
-                                self.ontology.matches(
+                                self._ontology_matches(
                                 word_match.search_phrase_token._.holmes.lemma,
                                 mention_root_token.text.lower()))
                         working_entries.append(
-                                self.ontology.matches(
+                                self._ontology_matches(
                                 word_match.search_phrase_token.text.lower(),
                                 mention_root_token._.holmes.lemma))
                         working_entries.append(
-                                self.ontology.matches(
+                                self._ontology_matches(
                                 word_match.search_phrase_token.text.lower(),
                                 mention_root_token.text.lower()))
                         for multiword_span in self._multiword_spans_with_head_token(
                                 mention_root_token):
                             working_entries.append(
-                                    self.ontology.matches(
+                                    self._ontology_matches(
                                     word_match.search_phrase_token.text.lower(),
                                     multiword_span.text))
                             working_entries.append(
-                                    self.ontology.matches(
+                                    self._ontology_matches(
                                     word_match.search_phrase_token._.holmes.lemma,
                                     multiword_span.lemma))
                             working_entries.append(
-                                    self.ontology.matches(
+                                    self._ontology_matches(
                                     word_match.search_phrase_token.text.lower(),
                                     multiword_span.text))
                             working_entries.append(
-                                    self.ontology.matches(
+                                    self._ontology_matches(
                                     word_match.search_phrase_token._.holmes.lemma,
                                     multiword_span.lemma))
                 # Now loop through the ontology entries to see if any are more specific than
@@ -950,66 +1243,80 @@ class StructuralMatcher:
                                 not_yet_traversed_document_token_indexes,
                                 traversed_token_indexes)
 
-        matches = [Match(search_phrase.label, document_label,
-                search_phrase.topic_match_phraselet and len(search_phrase.doc) == 1)]
-        for search_phrase_token in search_phrase.matchable_tokens:
-            word_matches = search_phrase_tokens_to_word_matches[search_phrase_token.i]
-            if len(word_matches) == 0:
-                # if there is any search phrase token without a matching document token,
-                # we have no match and can return
-                return []
-            if self.perform_coreference_resolution and \
-                    word_matches[0].document_token.doc._.has_coref:
-                word_matches = filter_word_matches_based_on_coreference_resolution(word_matches)
-                if self.ontology != None:
-                    word_matches = revise_extracted_words_based_on_coreference_resolution(
+        with timer(self.metrics, 'match_building'):
+            matches = [Match(search_phrase.label, document_label,
+                    search_phrase.topic_match_phraselet and len(search_phrase.doc) == 1)]
+            for search_phrase_token in search_phrase.matchable_tokens:
+                word_matches = search_phrase_tokens_to_word_matches[search_phrase_token.i]
+                if len(word_matches) == 0:
+                    # if there is any search phrase token without a matching document token,
+                    # we have no match and can return
+                    return []
+                if self.perform_coreference_resolution and any(
+                        len(word_match.document_token._.holmes.coreference_clusters) > 0 or
+                        len(word_match.structurally_matched_document_token._.holmes.
+                        coreference_clusters) > 0 for word_match in word_matches):
+                    word_matches = filter_word_matches_based_on_coreference_resolution(
                             word_matches)
-            # handle any conjunction by distributing the matches amongst separate match objects
-            working_matches = []
-            for word_match in word_matches:
-                for match in matches:
-                    working_match = copy.copy(match)
-                    if not match_already_contains_structurally_matched_document_token(working_match,
-                            word_match.structurally_matched_document_token):
-                        working_match.word_matches.append(word_match)
-                        if word_match.is_negated:
-                            working_match.is_negated = True
-                        if word_match.is_uncertain:
-                            working_match.is_uncertain = True
-                        if search_phrase_token.i == search_phrase.root_token.i:
-                            working_match.index_within_document = word_match.document_token.i
-                        working_matches.append(working_match)
-            matches = working_matches
+                    if self.ontology != None:
+                        word_matches = revise_extracted_words_based_on_coreference_resolution(
+                                word_matches)
+                # handle any conjunction by distributing the matches amongst separate match
+                # objects
+                working_matches = []
+                for word_match in word_matches:
+                    for match in matches:
+                        working_match = copy.copy(match)
+                        if not match_already_contains_structurally_matched_document_token(
+                                working_match, word_match.structurally_matched_document_token):
+                            working_match.word_matches.append(word_match)
+                            if word_match.is_negated:
+                                working_match.is_negated = True
+                            if word_match.is_uncertain:
+                                working_match.is_uncertain = True
+                            if search_phrase_token.i == search_phrase.root_token.i:
+                                working_match.index_within_document = word_match.document_token.i
+                            working_matches.append(working_match)
+                    if budget_tracker != None:
+                        budget_tracker.check_deadline()
+                        if not budget_tracker.partial_matches_permitted(len(working_matches)):
+                            return []
+                matches = working_matches
 
         matches_to_return = []
         # now carry out the coherence check
-        for match in matches:
-            not_yet_traversed_document_token_indexes = set(
-                    word_match.document_token.i for word_match in match.word_matches)
-            for document_token_matching_root in (word_match.document_token
-                    for word_match in match.word_matches
-                    if word_match.search_phrase_token.i == search_phrase.root_token.i):
-                check_match_is_coherent_recursively(
-                        document_token_matching_root, not_yet_traversed_document_token_indexes, [])
-                if len(not_yet_traversed_document_token_indexes) == 0:
-                    not_normalized_overall_similarity_measure = 1.0
-                    for word_match in match.word_matches:
-                        not_normalized_overall_similarity_measure *= word_match.similarity_measure
-                    if not_normalized_overall_similarity_measure < 1.0:
-                        overall_similarity_measure = \
-                                round(not_normalized_overall_similarity_measure ** \
-                                (1 / len(search_phrase.matchable_non_entity_tokens_to_lexemes)), 8)
-                    else:
-                        overall_similarity_measure = 1.0
-                    if overall_similarity_measure == 1.0 or \
-                            overall_similarity_measure >= self.overall_similarity_threshold:
-                        match.overall_similarity_measure = str(
-                            overall_similarity_measure)
-                        matches_to_return.append(match)
+        with timer(self.metrics, 'coherence_checking'):
+            for match in matches:
+                if budget_tracker != None:
+                    budget_tracker.check_deadline()
+                not_yet_traversed_document_token_indexes = set(
+                        word_match.document_token.i for word_match in match.word_matches)
+                for document_token_matching_root in (word_match.document_token
+                        for word_match in match.word_matches
+                        if word_match.search_phrase_token.i == search_phrase.root_token.i):
+                    check_match_is_coherent_recursively(document_token_matching_root,
+                            not_yet_traversed_document_token_indexes, [])
+                    if len(not_yet_traversed_document_token_indexes) == 0:
+                        not_normalized_overall_similarity_measure = 1.0
+                        for word_match in match.word_matches:
+                            not_normalized_overall_similarity_measure *= \
+                                    word_match.similarity_measure
+                        if not_normalized_overall_similarity_measure < 1.0:
+                            overall_similarity_measure = \
+                                    round(not_normalized_overall_similarity_measure ** \
+                                    (1 / len(search_phrase.matchable_non_entity_tokens_to_lexemes)),
+                                    8)
+                        else:
+                            overall_similarity_measure = 1.0
+                        if overall_similarity_measure == 1.0 or \
+                                overall_similarity_measure >= self.overall_similarity_threshold:
+                            match.overall_similarity_measure = str(
+                                overall_similarity_measure)
+                            matches_to_return.append(match)
         return matches_to_return
 
     def _get_matches_starting_at_root_word_match(self, search_phrase, document,
-            document_token, document_label):
+            document_token, document_label, budget_tracker=None):
         """Begin recursive matching where a search phrase root token has matched a document
             token.
         """
@@ -1022,106 +1329,153 @@ class StructuralMatcher:
         # corresponds to the search phrase token with its index and contains the indexes within
         # the document of tokens to which a match to that search phrase token has been attempted.
         search_phrase_and_document_visited_table = [set() for token in search_phrase.doc]
-        self._match_recursively(
-                search_phrase=search_phrase,
-                search_phrase_token=search_phrase.root_token,
-                document=document,
-                document_token=document_token,
-                search_phrase_tokens_to_word_matches=search_phrase_tokens_to_word_matches,
-                search_phrase_and_document_visited_table=search_phrase_and_document_visited_table,
-                is_uncertain=document_token._.holmes.is_uncertain,
-                structurally_matched_document_token=document_token)
+        with timer(self.metrics, 'recursive_matching'):
+            self._match_recursively(
+                    search_phrase=search_phrase,
+                    search_phrase_token=search_phrase.root_token,
+                    document=document,
+                    document_token=document_token,
+                    search_phrase_tokens_to_word_matches=search_phrase_tokens_to_word_matches,
+                    search_phrase_and_document_visited_table=
+                            search_phrase_and_document_visited_table,
+                    is_uncertain=document_token._.holmes.is_uncertain,
+                    structurally_matched_document_token=document_token,
+                    budget_tracker=budget_tracker)
+        if self.metrics != None:
+            self.metrics.increment('visited_pairs', sum(len(document_indexes) for
+                    document_indexes in search_phrase_and_document_visited_table))
         working_matches = self._build_matches(
                 search_phrase=search_phrase,
                 document=document,
                 search_phrase_tokens_to_word_matches=search_phrase_tokens_to_word_matches,
-                document_label=document_label)
+                document_label=document_label,
+                budget_tracker=budget_tracker)
         matches_to_return.extend(working_matches)
         return matches_to_return
 
     def match(self):
         """Finds and returns matches between the search phrases and the documents
-        managed by this object.
+        managed by this object. The matches are returned in a *ResultList* whose *is_truncated*
+        property is *True* if the *MatchBudget* of this object was exceeded.
         """
         if len(self._registered_documents) == 0:
             raise NoSearchedDocumentError(
                 'At least one searched document is required to match.')
         if len(self.search_phrases) == 0:
             raise NoSearchPhraseError('At least one search_phrase is required to match.')
-        matches = []
-        for document_label, registered_document in self._registered_documents.items():
-            doc = registered_document.doc
-            if self.output_document_matching_message_to_console:
-                print('Processing document', document_label)
-            # Dictionary used to improve performance when embedding-based matching for root tokens
-            # is active and there are multiple search phrases with the same root token word: the
-            # same indexes in the document will then match all the search phrase root tokens.
-            root_lexeme_to_indexes_to_match_dict = {}
-            for search_phrase in self.search_phrases:
-                if search_phrase.topic_match_phraselet and len(search_phrase.doc) == 1 and not \
-                        self.embedding_based_matching_on_root_words:
-                    # We are only matching a single word without embedding, so to improve
-                    # performance we avoid entering the subgraph matching code.
-                    for word_matching_root_token in self._words_matching_root_token(
-                            search_phrase):
-                        if word_matching_root_token in \
-                                registered_document.words_to_token_indexes_dict.keys():
-                            for index in registered_document.words_to_token_indexes_dict[
-                                    word_matching_root_token]:
-                                minimal_match = Match(search_phrase.label, document_label, True)
-                                minimal_match.index_within_document = index
-                                matches.append(minimal_match)
-                    continue
-                if self._is_entitynoun_search_phrase_token(search_phrase.root_token,
-                        search_phrase.topic_match_phraselet):
-                    for token in doc:
-                        if token.pos_ in self.semantic_analyzer.noun_pos:
-                            matches.extend(self._get_matches_starting_at_root_word_match(
-                                    search_phrase, doc, token, document_label))
-                    continue
-                else:
-                    matched_indexes_set = set()
-                    if self._is_entity_search_phrase_token(search_phrase.root_token,
-                        search_phrase.topic_match_phraselet):
-                        if search_phrase.root_token.text in \
-                                registered_document.words_to_token_indexes_dict.keys():
-                            matched_indexes_set.update(
-                                    registered_document.words_to_token_indexes_dict[
-                                    search_phrase.root_token.text])
-                    else:
-                        for word_matching_root_token in self._words_matching_root_token(
-                                search_phrase):
-                            if word_matching_root_token in \
-                                    registered_document.words_to_token_indexes_dict.keys():
-                                matched_indexes_set.update(
-                                        registered_document.words_to_token_indexes_dict[
-                                        word_matching_root_token])
-                if self.embedding_based_matching_on_root_words and not \
-                        self._is_entity_search_phrase_token(search_phrase.root_token,
-                                search_phrase.topic_match_phraselet):
-                    if not search_phrase.topic_match_phraselet:
-                        root_token_lemma_to_use = search_phrase.root_token.lemma_
-                    else:
-                        root_token_lemma_to_use = search_phrase.root_token._.holmes.lemma
-                    if root_token_lemma_to_use in root_lexeme_to_indexes_to_match_dict:
-                        matched_indexes_set.update(root_lexeme_to_indexes_to_match_dict[
-                                root_token_lemma_to_use])
-                    else:
-                        working_indexes_to_match_for_cache_set = set()
-                        for document_word in registered_document.words_to_token_indexes_dict.keys():
-                            indexes_to_match = registered_document.words_to_token_indexes_dict[
-                                    document_word]
-                            similarity_measure = \
-                                    search_phrase.matchable_non_entity_tokens_to_lexemes[
-                                    search_phrase.root_token.i].similarity(
-                                    doc[indexes_to_match[0]])
-                            if similarity_measure >= \
-                                    search_phrase.single_token_similarity_threshold:
-                                matched_indexes_set.update(indexes_to_match)
-                                working_indexes_to_match_for_cache_set.update(indexes_to_match)
-                        root_lexeme_to_indexes_to_match_dict[root_token_lemma_to_use] = \
-                                working_indexes_to_match_for_cache_set
-                for index_to_match in sorted(matched_indexes_set):
-                    matches.extend(self._get_matches_starting_at_root_word_match(
-                            search_phrase, doc, doc[index_to_match], document_label))
+        if self.match_budget != None:
+            budget_tracker = _MatchBudgetTracker(self.match_budget)
+        else:
+            budget_tracker = None
+        if self.progress_reporter != None:
+            progress_tracker = _ProgressTracker(self.progress_reporter, 'matching')
+        else:
+            progress_tracker = None
+        matches = ResultList()
+        try:
+            for document_label, registered_document in self._registered_documents.items():
+                doc = registered_document.doc
+                # Dictionary used to improve performance when embedding-based matching for root
+                # tokens is active and there are multiple search phrases with the same root token
+                # word: the same indexes in the document will then match all the search phrase
+                # root tokens.
+                root_lexeme_to_indexes_to_match_dict = {}
+                for search_phrase in self.search_phrases:
+                    if not self._document_may_match(search_phrase, registered_document):
+                        if self.metrics != None:
+                            self.metrics.increment('prefilter_rejections')
+                        continue
+                    with timer(self.metrics, 'candidate_selection'):
+                        indexes_to_match = self._root_token_candidate_indexes(search_phrase,
+                                registered_document, root_lexeme_to_indexes_to_match_dict)
+                    if self.metrics != None:
+                        self.metrics.increment('root_token_candidates', len(indexes_to_match))
+                    if search_phrase.topic_match_phraselet and len(search_phrase.doc) == 1 and not \
+                            self.embedding_based_matching_on_root_words:
+                        # We are only matching a single word without embedding, so to improve
+                        # performance we avoid entering the subgraph matching code.
+                        for index in indexes_to_match:
+                            minimal_match = Match(search_phrase.label, document_label, True)
+                            minimal_match.index_within_document = index
+                            matches.append(minimal_match)
+                        continue
+                    for index_to_match in indexes_to_match:
+                        matches.extend(self._get_matches_starting_at_root_word_match(
+                                search_phrase, doc, doc[index_to_match], document_label,
+                                budget_tracker))
+                if progress_tracker != None:
+                    progress_tracker.advance(document_label,
+                            doc[-1].idx + len(doc[-1]) if len(doc) > 0 else 0)
+        except _MatchBudgetExceeded:
+            # the matches found before the budget was exceeded are returned
+            pass
+        if progress_tracker != None:
+            progress_tracker.finish()
+        if budget_tracker != None and budget_tracker.is_truncated:
+            matches.is_truncated = True
+            if self.metrics != None:
+                self.metrics.increment('match_budget_exceeded')
         return matches
+
+    def _root_token_candidate_indexes(self, search_phrase, registered_document,
+            root_lexeme_to_indexes_to_match_dict):
+        """Returns the indexes of the tokens within a registered document at which matching the
+            root token of a search phrase should be attempted, in the order in which they should
+            be tried.
+        """
+        doc = registered_document.doc
+        if search_phrase.topic_match_phraselet and len(search_phrase.doc) == 1 and not \
+                self.embedding_based_matching_on_root_words:
+            indexes_to_match = []
+            for word_matching_root_token in self._words_matching_root_token(search_phrase):
+                if word_matching_root_token in \
+                        registered_document.words_to_token_indexes_dict.keys():
+                    indexes_to_match.extend(registered_document.words_to_token_indexes_dict[
+                            word_matching_root_token])
+            return indexes_to_match
+        if self._is_entitynoun_search_phrase_token(search_phrase.root_token,
+                search_phrase.topic_match_phraselet):
+            return [token.i for token in doc if token.pos_ in self.semantic_analyzer.noun_pos]
+        matched_indexes_set = set()
+        if self._is_entity_search_phrase_token(search_phrase.root_token,
+            search_phrase.topic_match_phraselet):
+            if search_phrase.root_token.text in \
+                    registered_document.words_to_token_indexes_dict.keys():
+                matched_indexes_set.update(
+                        registered_document.words_to_token_indexes_dict[
+                        search_phrase.root_token.text])
+        else:
+            for word_matching_root_token in self._words_matching_root_token(search_phrase):
+                if word_matching_root_token in \
+                        registered_document.words_to_token_indexes_dict.keys():
+                    matched_indexes_set.update(
+                            registered_document.words_to_token_indexes_dict[
+                            word_matching_root_token])
+        if self.embedding_based_matching_on_root_words and not \
+                self._is_entity_search_phrase_token(search_phrase.root_token,
+                        search_phrase.topic_match_phraselet):
+            if not search_phrase.topic_match_phraselet:
+                root_token_lemma_to_use = search_phrase.root_token.lemma_
+            else:
+                root_token_lemma_to_use = search_phrase.root_token._.holmes.lemma
+            if root_token_lemma_to_use in root_lexeme_to_indexes_to_match_dict:
+                matched_indexes_set.update(root_lexeme_to_indexes_to_match_dict[
+                        root_token_lemma_to_use])
+            else:
+                working_indexes_to_match_for_cache_set = set()
+                for document_word in registered_document.words_to_token_indexes_dict.keys():
+                    indexes_to_match = registered_document.words_to_token_indexes_dict[
+                            document_word]
+                    if self.metrics != None:
+                        self.metrics.increment('embedding_similarity_calls')
+                    similarity_measure = \
+                            search_phrase.matchable_non_entity_tokens_to_lexemes[
+                            search_phrase.root_token.i].similarity(
+                            doc[indexes_to_match[0]])
+                    if similarity_measure >= \
+                            search_phrase.single_token_similarity_threshold:
+                        matched_indexes_set.update(indexes_to_match)
+                        working_indexes_to_match_for_cache_set.update(indexes_to_match)
+                root_lexeme_to_indexes_to_match_dict[root_token_lemma_to_use] = \
+                        working_indexes_to_match_for_cache_set
+        return sorted(matched_indexes_set)
@@ -0,0 +1,64 @@
+import unittest
+import asyncio
+import holmes_extractor as holmes
+from holmes_extractor.errors import DocumentTooBigError
+
+holmes_manager = holmes.Manager(model='en_core_web_lg', perform_coreference_resolution=False)
+holmes_manager.register_search_phrase("A dog chases a cat")
+holmes_manager.parse_and_register_document("A dog chased a cat.", 'dog')
+holmes_manager.parse_and_register_document("There was a big horse.", 'horse')
+
+class AsyncManagerTest(unittest.TestCase):
+
+    def _run(self, coroutine_function, **kwargs):
+        async def run_with_async_manager():
+            async with holmes.AsyncManager(holmes_manager, **kwargs) as async_manager:
+                return await coroutine_function(async_manager)
+        return asyncio.get_event_loop().run_until_complete(run_with_async_manager())
+
+    def test_parse(self):
+        doc = self._run(lambda async_manager: async_manager.parse("A dog chased a cat."))
+        self.assertEqual(doc[1]._.holmes.lemma, 'dog')
+        self.assertEqual(doc[2]._.holmes.string_representation_of_children(), '1:nsubj; 4:dobj')
+
+    def test_concurrent_requests_are_parsed_in_batches(self):
+        texts = ["A dog chased a cat.", "A cat chased a dog.", "Nothing to see."] * 10
+        async def match_all(async_manager):
+            return await asyncio.gather(*(async_manager.match_search_phrases_against(text)
+                    for text in texts))
+        for maximum_batch_size in (1, 4, 100):
+            results = self._run(match_all, maximum_batch_size=maximum_batch_size)
+            self.assertEqual([len(result) for result in results], [1, 0, 0] * 10)
+        self.assertEqual(holmes_manager.list_search_phrase_labels(), ["A dog chases a cat"])
+
+    def test_match_documents_against(self):
+        async def match(async_manager):
+            return await asyncio.gather(async_manager.match_documents_against("A big horse"),
+                    async_manager.match_documents_against("A dog chases a cat"))
+        horse_matches, dog_matches = self._run(match)
+        self.assertEqual(horse_matches[0]['document'], 'horse')
+        self.assertEqual(dog_matches[0]['document'], 'dog')
+        self.assertEqual(holmes_manager.list_search_phrase_labels(), ["A dog chases a cat"])
+
+    def test_match_documents_against_looks_up_search_phrase_cache_once(self):
+        self._run(lambda async_manager: async_manager.match_documents_against("A big horse"))
+        statistics_before = holmes_manager.search_phrase_cache_statistics()
+        horse_matches = self._run(lambda async_manager:
+                async_manager.match_documents_against("A big horse"))
+        statistics_after = holmes_manager.search_phrase_cache_statistics()
+        self.assertEqual(horse_matches[0]['document'], 'horse')
+        self.assertEqual(statistics_after['hits'] - statistics_before['hits'], 1)
+        self.assertEqual(statistics_after['misses'] - statistics_before['misses'], 0)
+
+    def test_topic_match_documents_against(self):
+        topic_matches = self._run(lambda async_manager:
+                async_manager.topic_match_documents_against("A big horse"))
+        self.assertEqual(topic_matches[0].document_label, 'horse')
+
+    def test_error_is_only_reported_to_request_that_caused_it(self):
+        async def match(async_manager):
+            return await asyncio.gather(async_manager.parse("A dog chased a cat."),
+                    async_manager.parse('a' * 1000001), return_exceptions=True)
+        doc, exception = self._run(match)
+        self.assertEqual(doc[1]._.holmes.lemma, 'dog')
+        self.assertIsInstance(exception, DocumentTooBigError)
@@ -0,0 +1,107 @@
+import unittest
+import holmes_extractor as holmes
+from holmes_extractor.caching import LruCache
+from holmes_extractor.errors import SearchPhraseContainsNegationError
+
+holmes_manager = holmes.Manager(model='en_core_web_lg', perform_coreference_resolution=False)
+holmes_manager.parse_and_register_document("A dog chased a cat.", 'dog')
+
+class LruCacheTest(unittest.TestCase):
+
+    def test_least_recently_used_entry_is_discarded(self):
+        cache = LruCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)
+        self.assertEqual(cache.get('b'), None)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.statistics(), {'size': 2, 'maximum_size': 2, 'hits': 3,
+                'misses': 1})
+
+    def test_clear(self):
+        cache = LruCache(2)
+        cache.put('a', 1)
+        cache.clear()
+        self.assertFalse('a' in cache)
+        self.assertEqual(len(cache), 0)
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            LruCache(0)
+
+class SearchPhraseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        holmes_manager.remove_all_search_phrases()
+        holmes_manager._search_phrase_cache.clear()
+
+    def test_repeated_registration_uses_cache(self):
+        statistics_before = holmes_manager.search_phrase_cache_statistics()
+        holmes_manager.register_search_phrase("A dog chases a cat", 'first')
+        holmes_manager.register_search_phrase("A dog chases a cat", 'second')
+        statistics_after = holmes_manager.search_phrase_cache_statistics()
+        self.assertEqual(statistics_after['hits'] - statistics_before['hits'], 1)
+        self.assertEqual(statistics_after['misses'] - statistics_before['misses'], 1)
+        self.assertEqual(statistics_after['size'], 1)
+        self.assertEqual(sorted(match.search_phrase_label for match in holmes_manager.match()),
+                ['first', 'second'])
+
+    def test_repeated_match_documents_against_uses_cache(self):
+        statistics_before = holmes_manager.search_phrase_cache_statistics()
+        for _ in range(3):
+            self.assertEqual(len(holmes_manager.match_documents_against("A dog chases a cat")),
+                    1)
+        statistics_after = holmes_manager.search_phrase_cache_statistics()
+        self.assertEqual(statistics_after['hits'] - statistics_before['hits'], 2)
+
+    def test_cache_not_shared_between_settings(self):
+        structural_matcher = holmes_manager.structural_matcher
+        key = structural_matcher.search_phrase_cache_key("A dog chases a cat")
+        other_structural_matcher = structural_matcher.matcher_sharing_documents()
+        other_structural_matcher.perform_coreference_resolution = True
+        self.assertNotEqual(key, other_structural_matcher.search_phrase_cache_key(
+                "A dog chases a cat"))
+
+    def test_search_phrase_errors_are_still_raised(self):
+        for _ in range(2):
+            with self.assertRaises(SearchPhraseContainsNegationError):
+                holmes_manager.register_search_phrase("A dog does not chase a cat")
+
+    def test_cache_can_be_deactivated(self):
+        manager = holmes.Manager(model='en_core_web_lg', perform_coreference_resolution=False,
+                search_phrase_cache_size=0)
+        manager.register_search_phrase("A dog chases a cat")
+        self.assertEqual(manager.search_phrase_cache_statistics(), None)
+
+class TopicMatchCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        holmes_manager.remove_all_documents()
+        holmes_manager.parse_and_register_document("A dog chased a cat.", 'dog')
+
+    def test_repeated_query_uses_cache(self):
+        statistics_before = holmes_manager.topic_match_cache_statistics()
+        first_topic_matches = holmes_manager.topic_match_documents_against("A dog chases a cat")
+        second_topic_matches = holmes_manager.topic_match_documents_against("A dog chases a cat")
+        statistics_after = holmes_manager.topic_match_cache_statistics()
+        self.assertEqual(statistics_after['hits'] - statistics_before['hits'], 1)
+        self.assertEqual([topic_match.score for topic_match in first_topic_matches],
+                [topic_match.score for topic_match in second_topic_matches])
+
+    def test_different_parameters_are_not_confused(self):
+        first_topic_matches = holmes_manager.topic_match_documents_against("A dog chases a cat")
+        second_topic_matches = holmes_manager.topic_match_documents_against("A dog chases a cat",
+                relation_score=60)
+        self.assertNotEqual(first_topic_matches[0].score, second_topic_matches[0].score)
+
+    def test_registering_document_invalidates_cache(self):
+        topic_matches = holmes_manager.topic_match_documents_against("A big horse")
+        self.assertEqual(len(topic_matches), 0)
+        holmes_manager.parse_and_register_document("There was a big horse.", 'horse')
+        topic_matches = holmes_manager.topic_match_documents_against("A big horse")
+        self.assertEqual(topic_matches[0].document_label, 'horse')
+        holmes_manager.remove_document('horse')
+        topic_matches = holmes_manager.topic_match_documents_against("A big horse")
+        self.assertEqual(len(topic_matches), 0)
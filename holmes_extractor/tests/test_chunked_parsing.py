@@ -0,0 +1,51 @@
+import unittest
+import holmes_extractor as holmes
+from holmes_extractor.semantics import _split_into_blocks
+
+holmes_manager = holmes.Manager(model='en_core_web_lg', perform_coreference_resolution=False)
+text = "There was a house.\n\nA dog chased a cat. The cat ran away.\n\nA big horse was happy."
+
+class ChunkedParsingTest(unittest.TestCase):
+
+    def setUp(self):
+        holmes_manager.remove_all_documents()
+        holmes_manager.remove_all_search_phrases()
+
+    def test_split_into_blocks(self):
+        blocks = _split_into_blocks(text, 40)
+        self.assertEqual([text[start:end] for start, end in blocks], ["There was a house.\n\n",
+                "A dog chased a cat. The cat ran away.\n\n", "A big horse was happy."])
+        blocks = _split_into_blocks(text, 25)
+        self.assertEqual(''.join(text[start:end] for start, end in blocks), text)
+        self.assertEqual(text[blocks[1][0]:blocks[1][1]], "A dog chased a cat. ")
+        self.assertEqual(_split_into_blocks('abcdefg', 3), [(0, 3), (3, 6), (6, 7)])
+
+    def test_chunks_form_a_single_document(self):
+        doc = holmes_manager.semantic_analyzer.parse_in_chunks(text, maximum_chunk_size=25,
+                overlap=20)
+        whole_doc = holmes_manager.semantic_analyzer.parse(text)
+        self.assertEqual(doc.text, text)
+        self.assertEqual([token.idx for token in doc], [token.idx for token in whole_doc])
+        self.assertEqual([token._.holmes.lemma for token in doc],
+                [token._.holmes.lemma for token in whole_doc])
+        self.assertEqual(doc[8]._.holmes.string_representation_of_children(),
+                '7:nsubj; 10:dobj')
+        self.assertEqual(len(list(doc.sents)), 4)
+
+    def test_invalid_chunk_size(self):
+        with self.assertRaises(ValueError):
+            holmes_manager.semantic_analyzer.parse_in_chunks(text, maximum_chunk_size=0)
+        with self.assertRaises(ValueError):
+            holmes_manager.semantic_analyzer.parse_in_chunks(text,
+                    maximum_chunk_size=1000000, overlap=1)
+
+    def test_matching_across_chunks(self):
+        holmes_manager.parse_and_register_document_in_chunks(text, 'chunked',
+                maximum_chunk_size=25, overlap=0)
+        holmes_manager.register_search_phrase("A dog chases a cat")
+        holmes_manager.register_search_phrase("A big horse")
+        matches = holmes_manager.match()
+        self.assertEqual(sorted(match.index_within_document for match in matches), [8, 20])
+        topic_matches = holmes_manager.topic_match_documents_against("A big horse")
+        self.assertEqual(topic_matches[0].document_label, 'chunked')
+        self.assertTrue(topic_matches[0].text.startswith("A big horse"))
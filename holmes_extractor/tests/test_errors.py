@@ -98,15 +98,6 @@ class ErrorsTest(unittest.TestCase):
             deserialized_doc = common_holmes_manager.serialize_document('')
             common_holmes_manager.deserialize_and_register_document(deserialized_doc, '')
 
-    def test_serialization_not_supported_on_serialization(self):
-        with self.assertRaises(SerializationNotSupportedError) as context:
-            coref_holmes_manager.parse_and_register_document("A", '')
-            deserialized_doc = coref_holmes_manager.serialize_document('')
-
-    def test_serialization_not_supported_on_deserialization(self):
-        with self.assertRaises(SerializationNotSupportedError) as context:
-            coref_holmes_manager.deserialize_and_register_document("A", '')
-
     def test_no_search_phrase_error(self):
         with self.assertRaises(NoSearchPhraseError) as context:
             common_holmes_manager.remove_all_search_phrases()
@@ -0,0 +1,12 @@
+import unittest
+import subprocess
+import sys
+
+class ImportTest(unittest.TestCase):
+
+    def test_optional_dependencies_are_not_imported(self):
+        output = subprocess.run([sys.executable, '-c', ''.join((
+                'import sys, holmes_extractor; print(sorted(name for name in ',
+                "('sklearn', 'scipy', 'rdflib', 'jsonpickle') if name in sys.modules))"))],
+                check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout
+        self.assertEqual(output.strip(), '[]')
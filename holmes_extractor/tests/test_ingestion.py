@@ -0,0 +1,130 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+import holmes_extractor as holmes
+from holmes_extractor.errors import DuplicateDocumentError
+from holmes_extractor.ingestion import read_documents
+
+holmes_manager = holmes.Manager(model='en_core_web_lg', perform_coreference_resolution=False)
+
+class _RecordingProgressReporter(holmes.ProgressReporter):
+
+    def __init__(self):
+        self.events = []
+
+    def started(self, operation):
+        self.events.append(('started', operation))
+
+    def advanced(self, operation, label, *, documents, characters, seconds):
+        self.events.append(('advanced', operation, label, documents, characters))
+
+    def finished(self, operation, *, documents, characters, seconds):
+        self.events.append(('finished', operation, documents, characters))
+
+class IngestionTest(unittest.TestCase):
+
+    def setUp(self):
+        holmes_manager.remove_all_documents()
+        holmes_manager.remove_all_search_phrases()
+        self.directory = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.directory.name, 'dog.txt'), 'w', encoding='utf-8') as file:
+            file.write("A dog chased a cat.")
+        with open(os.path.join(self.directory.name, 'animals.jsonl'), 'w',
+                encoding='utf-8') as file:
+            file.write(json.dumps({'text': "A big horse chased a cat.", 'label': 'horse'}))
+            file.write('\n\n')
+            file.write(json.dumps({'text': "The cat was chased by a lion."}))
+            file.write('\n')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_read_documents(self):
+        self.assertEqual(list(read_documents([self.directory.name])), [
+                ('horse', "A big horse chased a cat."),
+                ('animals.jsonl:3', "The cat was chased by a lion."),
+                ('dog.txt', "A dog chased a cat.")])
+
+    def test_read_documents_invalid_line(self):
+        path = os.path.join(self.directory.name, 'invalid.jsonl')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write('{"content": "A dog chased a cat."}\n')
+        with self.assertRaises(ValueError):
+            list(read_documents([path]))
+
+    def test_register_documents_from_paths(self):
+        progress_reporter = _RecordingProgressReporter()
+        self.assertEqual(holmes_manager.register_documents_from_paths([self.directory.name],
+                batch_size=2, progress_reporter=progress_reporter), 3)
+        self.assertEqual(sorted(holmes_manager.document_labels()),
+                ['animals.jsonl:3', 'dog.txt', 'horse'])
+        self.assertEqual(progress_reporter.events, [('started', 'registration'),
+                ('advanced', 'registration', 'horse', 1, 25),
+                ('advanced', 'registration', 'animals.jsonl:3', 2, 54),
+                ('advanced', 'registration', 'dog.txt', 3, 73),
+                ('finished', 'registration', 3, 73)])
+        holmes_manager.register_search_phrase("A cat is chased")
+        self.assertEqual(len(holmes_manager.match()), 3)
+
+    def test_documents_are_read_lazily(self):
+        taken = []
+
+        def labelled_texts():
+            for index in range(5):
+                taken.append(index)
+                yield str(index), "A dog chased a cat."
+
+        class _CheckingProgressReporter(holmes.ProgressReporter):
+
+            def advanced(reporter, operation, label, *, documents, characters, seconds):
+                # no more than one batch is taken from the generator ahead of registration
+                self.assertLessEqual(len(taken), documents + 1)
+
+        self.assertEqual(holmes_manager.parse_and_register_documents(labelled_texts(),
+                batch_size=2, progress_reporter=_CheckingProgressReporter()), 5)
+        self.assertEqual(len(holmes_manager.document_labels()), 5)
+
+    def test_duplicate_label(self):
+        holmes_manager.parse_and_register_document("A dog chased a cat.", 'dog')
+        with self.assertRaises(DuplicateDocumentError):
+            holmes_manager.parse_and_register_documents([('dog', "A horse.")])
+
+    def test_duplicate_label_within_batch(self):
+        path = os.path.join(self.directory.name, 'duplicates.jsonl')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(json.dumps({'text': "A dog chased a cat.", 'label': 'animal'}))
+            file.write('\n')
+            file.write(json.dumps({'text': "A big horse.", 'label': 'animal'}))
+            file.write('\n')
+        with self.assertRaises(DuplicateDocumentError):
+            holmes_manager.register_documents_from_paths([path])
+        # the duplicate is detected before any document in the batch is registered
+        self.assertEqual(len(holmes_manager.document_labels()), 0)
+
+    def test_progress_reported_when_matching(self):
+        holmes_manager.parse_and_register_documents([('dog', "A dog chased a cat."),
+                ('horse', "A horse chased a cat.")])
+        progress_reporter = _RecordingProgressReporter()
+        holmes_manager.structural_matcher.progress_reporter = progress_reporter
+        try:
+            holmes_manager.register_search_phrase("A cat is chased")
+            holmes_manager.match()
+        finally:
+            holmes_manager.structural_matcher.progress_reporter = None
+        self.assertEqual(progress_reporter.events, [('started', 'matching'),
+                ('advanced', 'matching', 'dog', 1, 19),
+                ('advanced', 'matching', 'horse', 2, 40),
+                ('finished', 'matching', 2, 40)])
+
+    def test_console_progress_reporter(self):
+        output = io.StringIO()
+        progress_reporter = holmes.ConsoleProgressReporter(interval_seconds=0, file=output)
+        holmes_manager.parse_and_register_documents([('dog', "A dog chased a cat.")],
+                progress_reporter=progress_reporter)
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].startswith('registration: 1 documents'))
+        self.assertTrue(lines[0].endswith('last document: dog'))
+        self.assertTrue(lines[1].endswith('finished'))
@@ -0,0 +1,76 @@
+import unittest
+import holmes_extractor as holmes
+from holmes_extractor.errors import MatchBudgetExceededError
+
+def _manager(**match_budget_arguments):
+    manager = holmes.Manager(model='en_core_web_lg', perform_coreference_resolution=False,
+            match_budget=holmes.MatchBudget(**match_budget_arguments))
+    manager.parse_and_register_document("A dog chased a cat.", 'dog')
+    manager.parse_and_register_document(
+            "Dogs, foxes, horses and mice chased cats, rats, hens and birds.", 'animals')
+    manager.register_search_phrase("An ENTITYNOUN chases an ENTITYNOUN")
+    return manager
+
+class MatchBudgetTest(unittest.TestCase):
+
+    def test_within_budget(self):
+        manager = _manager(maximum_recursion_steps=1000, maximum_partial_matches=1000,
+                deadline_seconds=60)
+        matches = manager.match()
+        self.assertEqual(len(matches), 17)
+        self.assertFalse(matches.is_truncated)
+
+    def test_no_budget(self):
+        manager = holmes.Manager(model='en_core_web_lg', perform_coreference_resolution=False)
+        manager.parse_and_register_document("A dog chased a cat.", 'dog')
+        manager.register_search_phrase("A dog chases a cat")
+        self.assertFalse(manager.match().is_truncated)
+
+    def test_maximum_recursion_steps_truncates(self):
+        manager = _manager(maximum_recursion_steps=4)
+        matches = manager.match()
+        self.assertEqual(len(matches), 1)
+        self.assertEqual(matches[0].document_label, 'dog')
+        self.assertTrue(matches.is_truncated)
+        match_dicts = manager.match_returning_dictionaries()
+        self.assertEqual(len(match_dicts), 1)
+        self.assertTrue(match_dicts.is_truncated)
+
+    def test_maximum_recursion_steps_raises(self):
+        manager = _manager(maximum_recursion_steps=4, raise_when_exceeded=True)
+        with self.assertRaises(MatchBudgetExceededError):
+            manager.match()
+
+    def test_maximum_partial_matches_skips_root_token(self):
+        manager = _manager(maximum_partial_matches=4)
+        matches = manager.match()
+        self.assertEqual([match.document_label for match in matches], ['dog'])
+        self.assertTrue(matches.is_truncated)
+        manager = _manager(maximum_partial_matches=16)
+        matches = manager.match()
+        self.assertEqual(len(matches), 17)
+        self.assertFalse(matches.is_truncated)
+
+    def test_maximum_partial_matches_raises(self):
+        manager = _manager(maximum_partial_matches=4, raise_when_exceeded=True)
+        with self.assertRaises(MatchBudgetExceededError):
+            manager.match()
+
+    def test_deadline(self):
+        manager = _manager(deadline_seconds=0.000000001)
+        matches = manager.match()
+        self.assertEqual(len(matches), 0)
+        self.assertTrue(matches.is_truncated)
+        manager = _manager(deadline_seconds=0.000000001, raise_when_exceeded=True)
+        with self.assertRaises(MatchBudgetExceededError):
+            manager.match()
+
+    def test_truncated_topic_matches_are_not_cached(self):
+        manager = _manager(maximum_recursion_steps=1)
+        topic_matches = manager.topic_match_documents_against("A dog chases a cat")
+        self.assertTrue(topic_matches.is_truncated)
+        self.assertEqual(manager.topic_match_cache_statistics()['size'], 0)
+
+    def test_invalid_budget(self):
+        with self.assertRaises(ValueError):
+            holmes.MatchBudget(maximum_recursion_steps=0)
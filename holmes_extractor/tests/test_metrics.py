@@ -0,0 +1,86 @@
+import unittest
+import holmes_extractor as holmes
+from holmes_extractor.metrics import Metrics, MetricsSink
+
+class _RecordingSink(MetricsSink):
+
+    def __init__(self):
+        self.stages = []
+        self.counts = {}
+
+    def record_timing(self, stage, seconds):
+        self.stages.append(stage)
+
+    def record_count(self, counter, value):
+        self.counts[counter] = self.counts.get(counter, 0) + value
+
+sink = _RecordingSink()
+metrics = Metrics([sink])
+holmes_manager = holmes.Manager(model='en_core_web_lg', perform_coreference_resolution=False,
+        metrics=metrics)
+holmes_manager.parse_and_register_document("A dog chased a cat.", 'dog')
+holmes_manager.parse_and_register_document("There was a big horse.", 'horse')
+
+class MetricsTest(unittest.TestCase):
+
+    def setUp(self):
+        holmes_manager.remove_all_search_phrases()
+        metrics.reset()
+
+    def test_timer_and_counters(self):
+        working_metrics = Metrics()
+        with working_metrics.timer('stage'):
+            pass
+        with working_metrics.timer('stage'):
+            pass
+        working_metrics.increment('counter')
+        working_metrics.increment('counter', 2)
+        stats = working_metrics.snapshot()
+        self.assertEqual(stats['timings']['stage']['count'], 2)
+        self.assertTrue(stats['timings']['stage']['seconds'] >= 0)
+        self.assertEqual(stats['counters'], {'counter': 3})
+        working_metrics.reset()
+        self.assertEqual(working_metrics.snapshot(), {'timings': {}, 'counters': {}})
+
+    def test_parse_is_recorded(self):
+        holmes_manager.semantic_analyzer.parse("A dog chased a cat.")
+        timings = holmes_manager.stats()['timings']
+        self.assertEqual(timings['spacy_parse']['count'], 1)
+        self.assertEqual(timings['holmes_parse']['count'], 1)
+        self.assertEqual(timings['holmes_parse._create_holmes_dictionaries']['count'], 1)
+        self.assertEqual(timings['holmes_parse._set_negation']['count'], 1)
+        self.assertEqual(timings['holmes_parse._copy_any_sibling_info']['count'], 2)
+
+    def test_matching_is_recorded(self):
+        holmes_manager.register_search_phrase("A dog chases a cat")
+        self.assertEqual(len(holmes_manager.match_returning_dictionaries()), 1)
+        stats = holmes_manager.stats()
+        for stage in ('search_phrase_compilation', 'candidate_selection', 'recursive_matching',
+                'match_building', 'coherence_checking', 'match_dictionary_construction'):
+            self.assertTrue(stats['timings'][stage]['count'] > 0, stage)
+        # the document about the horse cannot match and is ruled out by the prefilter
+        self.assertEqual(stats['counters']['prefilter_rejections'], 1)
+        self.assertEqual(stats['timings']['candidate_selection']['count'], 1)
+        self.assertEqual(stats['counters']['root_token_candidates'], 1)
+        self.assertEqual(stats['counters']['recursive_matching_calls'], 3)
+        self.assertEqual(stats['counters']['visited_pairs'], 3)
+        self.assertFalse('ontology_lookups' in stats['counters'])
+
+    def test_sinks_receive_measurements(self):
+        sink.stages.clear()
+        sink.counts.clear()
+        holmes_manager.match_documents_against("A dog chases a cat")
+        self.assertTrue('recursive_matching' in sink.stages)
+        self.assertEqual(sink.counts, holmes_manager.stats()['counters'])
+
+    def test_document_registration_is_recorded(self):
+        holmes_manager.parse_and_register_document("A cat chased a dog.", 'cat')
+        holmes_manager.remove_document('cat')
+        self.assertEqual(holmes_manager.stats()['timings']['document_registration']['count'], 1)
+
+    def test_metrics_deactivated_by_default(self):
+        manager = holmes.Manager(model='en_core_web_lg', perform_coreference_resolution=False)
+        manager.parse_and_register_document("A dog chased a cat.")
+        manager.register_search_phrase("A dog chases a cat")
+        self.assertEqual(len(manager.match()), 1)
+        self.assertEqual(manager.stats(), None)
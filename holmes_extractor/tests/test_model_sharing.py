@@ -0,0 +1,32 @@
+import unittest
+import holmes_extractor as holmes
+
+class ModelSharingTest(unittest.TestCase):
+
+    def test_model_is_loaded_lazily(self):
+        manager = holmes.Manager(model='en_core_web_lg', perform_coreference_resolution=False,
+                overall_similarity_threshold=0.9)
+        self.assertEqual(manager.semantic_analyzer._nlp, None)
+        self.assertFalse(manager.semantic_analyzer.model_supports_coreference_resolution())
+        self.assertEqual(manager.semantic_analyzer._nlp, None)
+        manager.parse_and_register_document("A dog chased a cat.")
+        self.assertNotEqual(manager.semantic_analyzer._nlp, None)
+
+    def test_managers_share_model(self):
+        first_manager = holmes.Manager(model='en_core_web_lg',
+                perform_coreference_resolution=False)
+        second_manager = holmes.Manager(model='en_core_web_lg',
+                perform_coreference_resolution=False, overall_similarity_threshold=0.85)
+        self.assertIsNot(first_manager.semantic_analyzer, second_manager.semantic_analyzer)
+        self.assertIs(first_manager.semantic_analyzer.nlp, second_manager.semantic_analyzer.nlp)
+
+    def test_disabled_pipes(self):
+        manager = holmes.Manager(model='en_core_web_lg', perform_coreference_resolution=False,
+                disabled_pipes=('ner',))
+        other_manager = holmes.Manager(model='en_core_web_lg',
+                perform_coreference_resolution=False)
+        self.assertIsNot(manager.semantic_analyzer.nlp, other_manager.semantic_analyzer.nlp)
+        self.assertFalse(manager.semantic_analyzer.nlp.has_pipe('ner'))
+        manager.parse_and_register_document("A dog chased a cat.")
+        manager.register_search_phrase("A dog chases a cat")
+        self.assertEqual(len(manager.match()), 1)
@@ -0,0 +1,41 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import holmes_extractor as holmes
+
+holmes_manager = holmes.Manager(model='en_core_web_lg', perform_coreference_resolution=False)
+holmes_manager.register_search_phrase("A dog chases a cat")
+holmes_manager.register_search_phrase("A big horse")
+holmes_manager.parse_and_register_document("A dog chased a cat.", 'dog')
+holmes_manager.parse_and_register_document("There was a big horse.", 'horse')
+
+class MultithreadingTest(unittest.TestCase):
+
+    def _run_concurrently(self, function, arguments):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            return list(executor.map(function, arguments))
+
+    def test_match_search_phrases_against_concurrently(self):
+        entries = ["A dog chased a cat.", "A big horse was there.", "Nothing matches here."] * 10
+        results = self._run_concurrently(holmes_manager.match_search_phrases_against, entries)
+        for entry, result in zip(entries, results):
+            self.assertEqual(len(result), 0 if entry == "Nothing matches here." else 1)
+        self.assertEqual(holmes_manager.list_search_phrase_labels(),
+                ["A big horse", "A dog chases a cat"])
+        self.assertEqual(len(holmes_manager.match()), 2)
+
+    def test_match_documents_against_concurrently(self):
+        search_phrases = ["A dog chases a cat", "A big horse", "A cat chases a dog"] * 10
+        results = self._run_concurrently(holmes_manager.match_documents_against, search_phrases)
+        for search_phrase, result in zip(search_phrases, results):
+            self.assertEqual(len(result), 0 if search_phrase == "A cat chases a dog" else 1)
+        self.assertEqual(holmes_manager.list_search_phrase_labels(),
+                ["A big horse", "A dog chases a cat"])
+        self.assertEqual(len(holmes_manager.match()), 2)
+
+    def test_topic_match_documents_against_concurrently(self):
+        texts = ["A dog chases a cat", "A big horse"] * 10
+        results = self._run_concurrently(holmes_manager.topic_match_documents_against, texts)
+        for text, result in zip(texts, results):
+            self.assertEqual(result[0].document_label, 'dog' if 'dog' in text else 'horse')
+        self.assertEqual(holmes_manager.list_search_phrase_labels(),
+                ["A big horse", "A dog chases a cat"])
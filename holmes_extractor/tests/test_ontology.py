@@ -165,3 +165,14 @@ class OntologyTest(unittest.TestCase):
     def test_most_general_hypernym_ancestor_not_in_ontology_symmetric(self):
         self.assertEqual(symmetric_ontology.get_most_general_hypernym_ancestor('toolbox'),
                 'toolbox')
+
+    def test_most_general_hypernym_ancestor_precomputed(self):
+        working_ontology = holmes.Ontology(os.sep.join((script_directory,'test_ontology.owl')))
+        working_ontology.precompute_hypernym_ancestors()
+        self.assertEqual(working_ontology._hypernym_ancestor_dict['mimi momo'], 'animal')
+        self.assertEqual(working_ontology._hypernym_ancestor_dict['animal'], None)
+        self.assertEqual(working_ontology.get_most_general_hypernym_ancestor('Mimi Momo'),
+                'animal')
+        self.assertEqual(working_ontology.get_most_general_hypernym_ancestor('Animal'), 'Animal')
+        self.assertEqual(working_ontology.get_most_general_hypernym_ancestor('toolbox'),
+                'toolbox')
@@ -0,0 +1,45 @@
+import os
+import unittest
+import holmes_extractor as holmes
+
+script_directory = os.path.dirname(os.path.realpath(__file__))
+ontology = holmes.Ontology(os.sep.join((script_directory, 'test_ontology.owl')))
+metrics = holmes.Metrics()
+holmes_manager = holmes.Manager(model='en_core_web_lg', ontology=ontology,
+        perform_coreference_resolution=False, metrics=metrics)
+holmes_manager.parse_and_register_document("A puppy chased a kitten.", 'puppy')
+holmes_manager.parse_and_register_document("A German Shepherd dog chased a cat.", 'shepherd')
+holmes_manager.parse_and_register_document("A gymnast jumped over a vaulting horse.", 'gym')
+holmes_manager.parse_and_register_document("Richard Hudson chased a cat.", 'person')
+
+class PrefilterTest(unittest.TestCase):
+
+    def setUp(self):
+        holmes_manager.remove_all_search_phrases()
+        metrics.reset()
+
+    def _matched_document_labels(self):
+        return sorted(match.document_label for match in holmes_manager.match())
+
+    def test_ontology_words_are_not_rejected(self):
+        holmes_manager.register_search_phrase("A dog chases a cat")
+        self.assertEqual(self._matched_document_labels(), ['puppy', 'shepherd'])
+        self.assertEqual(holmes_manager.stats()['counters']['prefilter_rejections'], 2)
+
+    def test_multiwords_are_not_rejected(self):
+        holmes_manager.register_search_phrase("A German Shepherd dog")
+        self.assertEqual(self._matched_document_labels(), ['shepherd'])
+        self.assertEqual(holmes_manager.stats()['counters']['prefilter_rejections'], 3)
+
+    def test_entity_words_are_not_required(self):
+        holmes_manager.register_search_phrase("An ENTITYPERSON chases a cat")
+        self.assertEqual(self._matched_document_labels(), ['person'])
+        self.assertEqual(holmes_manager.stats()['counters']['prefilter_rejections'], 1)
+
+    def test_embedding_words_are_not_required(self):
+        manager = holmes.Manager(model='en_core_web_lg', perform_coreference_resolution=False,
+                overall_similarity_threshold=0.85, metrics=holmes.Metrics())
+        manager.parse_and_register_document("A hound chased a cat.")
+        manager.register_search_phrase("A dog chases a cat")
+        manager.match()
+        self.assertFalse('prefilter_rejections' in manager.stats()['counters'])
@@ -1,5 +1,5 @@
 import unittest
-from holmes_extractor.semantics import SemanticAnalyzerFactory
+from holmes_extractor.semantics import SemanticAnalyzerFactory, dependency_label_id
 
 analyzer = SemanticAnalyzerFactory().semantic_analyzer(model='en_coref_lg', debug=False)
 
@@ -666,3 +666,23 @@ class EnglishSemanticAnalyzerTest(unittest.TestCase):
         self.assertEqual(analyzer.token_and_coreference_chain_indexes(doc[26]), [13,18,22,26,30,34])
         self.assertEqual(analyzer.token_and_coreference_chain_indexes(doc[30]), [18,22,26,30,34])
         self.assertEqual(analyzer.token_and_coreference_chain_indexes(doc[34]), [22,26,30,34])
+
+    def test_dependency_label_ids_match_agrees_with_dependency_labels_match(self):
+        labels = set(analyzer._matching_dep_dict.keys())
+        for document_labels in analyzer._matching_dep_dict.values():
+            labels.update(document_labels)
+        labels.update(('nsubj', 'ROOT', 'det', 'neverseenlabel', None))
+        for search_phrase_label in labels:
+            for document_label in labels:
+                self.assertEqual(analyzer.dependency_label_ids_match(
+                        dependency_label_id(search_phrase_label),
+                        dependency_label_id(document_label)),
+                        analyzer.dependency_labels_match(
+                        search_phrase_dependency_label=search_phrase_label,
+                        document_dependency_label=document_label))
+
+    def test_label_id_follows_relabelled_dependency(self):
+        doc = analyzer.parse("The cat was chased by the dog.")
+        for dependency in doc[3]._.holmes.children:
+            self.assertEqual(dependency.label_id, dependency_label_id(dependency.label))
+        self.assertTrue(doc[3]._.holmes.has_dependency_with_label('nsubjpass'))
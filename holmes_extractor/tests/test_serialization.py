@@ -1,12 +1,17 @@
 import unittest
 import os
+import json
+import pickle
 import holmes_extractor as holmes
+from holmes_extractor.semantics import HolmesDictionary
 from holmes_extractor.tests.testing_utils import HolmesInstanceManager
 
 script_directory = os.path.dirname(os.path.realpath(__file__))
 ontology = holmes.Ontology(os.sep.join((script_directory,'test_ontology.owl')))
 holmes_manager = HolmesInstanceManager(ontology).en_core_web_lg
 holmes_manager.register_search_phrase("A dog chases a cat")
+coref_holmes_manager = HolmesInstanceManager(ontology).en_coref_lg
+coref_holmes_manager.register_search_phrase("A dog chases a cat")
 
 class SerializationTest(unittest.TestCase):
 
@@ -35,3 +40,68 @@ class SerializationTest(unittest.TestCase):
         holmes_manager.remove_all_documents()
         serialized_doc = holmes_manager.serialize_document('pets')
         self.assertEqual(serialized_doc, None)
+
+    def _word_match_tuples(self, matches):
+        # the shared manager may hold search phrases registered by other test modules
+        return [[(word_match.document_token.i, word_match.extracted_word,
+                word_match.involves_coreference) for word_match in match.word_matches]
+                for match in matches if match.search_phrase_label == "A dog chases a cat"]
+
+    def test_matching_with_reserialized_coreference_document(self):
+        coref_holmes_manager.remove_all_documents()
+        coref_holmes_manager.parse_and_register_document(
+                "I saw a dog and it was chasing a cat.", 'pets')
+        matches = [match for match in coref_holmes_manager.match() if
+                match.search_phrase_label == "A dog chases a cat"]
+        self.assertEqual(len(matches), 1)
+        self.assertTrue(matches[0].involves_coreference)
+        serialized_doc = coref_holmes_manager.serialize_document('pets')
+        coref_holmes_manager.remove_all_documents()
+        coref_holmes_manager.deserialize_and_register_document(serialized_doc, 'pets')
+        self.assertEqual(self._word_match_tuples(coref_holmes_manager.match()),
+                self._word_match_tuples(matches))
+
+    def test_coreference_clusters_survive_serialization(self):
+        coref_holmes_manager.remove_all_documents()
+        coref_holmes_manager.parse_and_register_document(
+                "I saw a dog and it was chasing a cat.", 'pets')
+        doc = coref_holmes_manager.semantic_analyzer.from_serialized_string(
+                coref_holmes_manager.serialize_document('pets'))
+        self.assertEqual([(mention.root_index, mention.start, mention.end) for mention in
+                doc[5]._.holmes.coreference_clusters[0]], [(3, 2, 4), (5, 5, 6)])
+        self.assertEqual(
+                coref_holmes_manager.semantic_analyzer.token_and_coreference_chain_indexes(doc[5]),
+                [3, 5])
+
+    def test_dictionary_state_without_coreference_clusters(self):
+        dictionary = HolmesDictionary(3, 'dog')
+        state = dictionary.__dict__.copy()
+        del state['coreference_clusters']
+        restored_dictionary = HolmesDictionary.__new__(HolmesDictionary)
+        restored_dictionary.__setstate__(state)
+        self.assertEqual(restored_dictionary.lemma, 'dog')
+        self.assertEqual(restored_dictionary.coreference_clusters, [])
+        self.assertEqual(pickle.loads(pickle.dumps(restored_dictionary)).coreference_clusters,
+                [])
+
+    def test_document_serialized_without_coreference_clusters(self):
+        holmes_manager.remove_all_documents()
+        holmes_manager.parse_and_register_document("The cat was chased by the dog", 'pets')
+        def remove_coreference_clusters(value):
+            if isinstance(value, dict):
+                return {key: remove_coreference_clusters(entry) for key, entry in value.items()
+                        if key != 'coreference_clusters'}
+            if isinstance(value, list):
+                return [remove_coreference_clusters(entry) for entry in value]
+            return value
+        # documents serialized before coreference clusters were recorded lack the attribute
+        serialized_doc = json.dumps(remove_coreference_clusters(json.loads(
+                holmes_manager.serialize_document('pets'))))
+        self.assertNotIn('coreference_clusters', serialized_doc)
+        holmes_manager.remove_all_documents()
+        holmes_manager.deserialize_and_register_document(serialized_doc, 'pets')
+        doc = holmes_manager.structural_matcher.get_document('pets')
+        for token in doc:
+            self.assertEqual(token._.holmes.coreference_clusters, [])
+            self.assertFalse(holmes_manager.semantic_analyzer.is_involved_in_coreference(token))
+        self.assertEqual(len(holmes_manager.match()), 1)
@@ -0,0 +1,82 @@
+import unittest
+import threading
+import http.client
+import json
+import holmes_extractor as holmes
+from holmes_extractor.server import HolmesServer
+
+holmes_manager = holmes.Manager(model='en_core_web_lg', perform_coreference_resolution=False)
+holmes_manager.register_search_phrase("A dog chases a cat")
+holmes_manager.parse_and_register_document("A dog chased a cat.", 'dog')
+holmes_manager.parse_and_register_document("There was a big horse.", 'horse')
+
+class ServerTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HolmesServer(('localhost', 0), holmes_manager, number_of_workers=4)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.connection = http.client.HTTPConnection('localhost', self.server.server_address[1])
+
+    def tearDown(self):
+        self.connection.close()
+
+    def _post(self, path, content):
+        self.connection.request('POST', path, json.dumps(content),
+                {'Content-Type': 'application/json'})
+        response = self.connection.getresponse()
+        return response.status, json.loads(response.read().decode('utf-8'))
+
+    def test_match_search_phrases_with_keep_alive(self):
+        for _ in range(3):
+            status, match_dicts = self._post('/match_search_phrases',
+                    {'text': 'A dog chased a cat.'})
+            self.assertEqual(status, 200)
+            self.assertEqual(len(match_dicts), 1)
+            self.assertEqual(match_dicts[0]['search_phrase'], 'A dog chases a cat')
+        status, match_dicts = self._post('/match_search_phrases', {'text': 'Nothing.'})
+        self.assertEqual(status, 200)
+        self.assertEqual(match_dicts, [])
+
+    def test_match_documents(self):
+        status, match_dicts = self._post('/match_documents', {'text': 'A big horse'})
+        self.assertEqual(status, 200)
+        self.assertEqual(match_dicts[0]['document'], 'horse')
+        self.assertEqual(holmes_manager.list_search_phrase_labels(), ["A dog chases a cat"])
+
+    def test_topic_match(self):
+        status, topic_matches = self._post('/topic_match', {'text': 'A big horse',
+                'number_of_results': 1})
+        self.assertEqual(status, 200)
+        self.assertEqual(len(topic_matches), 1)
+        self.assertEqual(topic_matches[0]['document_label'], 'horse')
+
+    def test_search_phrase_error(self):
+        status, error = self._post('/match_documents', {'text': 'A dog does not chase a cat'})
+        self.assertEqual(status, 400)
+        self.assertEqual(error['error'], 'SearchPhraseContainsNegationError')
+
+    def test_classify_without_classifier(self):
+        status, _ = self._post('/classify', {'text': 'A dog chased a cat.'})
+        self.assertEqual(status, 400)
+
+    def test_bad_requests(self):
+        status, _ = self._post('/match_documents', {'txt': 'A big horse'})
+        self.assertEqual(status, 400)
+        status, _ = self._post('/unknown', {'text': 'A big horse'})
+        self.assertEqual(status, 404)
+
+    def test_description(self):
+        self.connection.request('GET', '/')
+        response = self.connection.getresponse()
+        description = json.loads(response.read().decode('utf-8'))
+        self.assertEqual(description['model'], 'en_core_web_lg')
+        self.assertEqual(description['document_labels'], ['dog', 'horse'])
+        self.assertFalse(description['classifier'])
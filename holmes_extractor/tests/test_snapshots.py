@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import holmes_extractor as holmes
+from holmes_extractor.errors import UnsupportedSnapshotFormatError
+
+script_directory = os.path.dirname(os.path.realpath(__file__))
+ontology = holmes.Ontology(os.sep.join((script_directory, 'test_ontology.owl')))
+holmes_manager = holmes.Manager(model='en_core_web_lg', ontology=ontology,
+        perform_coreference_resolution=False, search_phrase_cache_size=10,
+        topic_match_cache_size=0)
+holmes_manager.parse_and_register_document("A German Shepherd dog chased a kitten.", 'dog')
+holmes_manager.parse_and_register_document("The cat was chased by a big horse.", 'horse')
+holmes_manager.register_search_phrase("An animal chases a cat", 'animal')
+holmes_manager.register_search_phrase("A big horse")
+
+def _match_tuples(manager):
+    return sorted((match.search_phrase_label, match.document_label, match.index_within_document)
+            for match in manager.match())
+
+class SnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'snapshot')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_restored_manager_matches_identically(self):
+        holmes_manager.save_snapshot(self.path)
+        restored_manager = holmes.Manager.load_snapshot(self.path)
+        self.assertEqual(sorted(restored_manager.document_labels()), ['dog', 'horse'])
+        self.assertEqual(restored_manager.structural_matcher.list_search_phrase_labels(),
+                ['A big horse', 'animal'])
+        self.assertEqual(len(_match_tuples(holmes_manager)), 3)
+        self.assertEqual(_match_tuples(restored_manager), _match_tuples(holmes_manager))
+        self.assertEqual(
+                restored_manager.topic_match_documents_against("A horse chases a cat")[0].text,
+                holmes_manager.topic_match_documents_against("A horse chases a cat")[0].text)
+
+    def test_configuration_is_restored(self):
+        holmes_manager.save_snapshot(self.path)
+        restored_manager = holmes.Manager.load_snapshot(self.path)
+        self.assertEqual(restored_manager.ontology.path, ontology.path)
+        self.assertEqual(restored_manager.search_phrase_cache_statistics()['maximum_size'], 10)
+        self.assertEqual(restored_manager.topic_match_cache_statistics(), None)
+        self.assertFalse(restored_manager.perform_coreference_resolution)
+
+    def test_restored_manager_can_register_further_documents(self):
+        holmes_manager.save_snapshot(self.path)
+        restored_manager = holmes.Manager.load_snapshot(self.path)
+        restored_manager.parse_and_register_document("A puppy chased a cat.", 'puppy')
+        self.assertIn(('animal', 'puppy', 2), _match_tuples(restored_manager))
+
+    def test_snapshot_taken_while_matching(self):
+        search_phrases = ["A dog chases a cat", "A big horse"] * 20
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(holmes_manager.match_documents_against, search_phrase)
+                    for search_phrase in search_phrases]
+            for _ in range(5):
+                holmes_manager.save_snapshot(self.path)
+            results = [future.result() for future in futures]
+        self.assertEqual([result[0]['document'] for result in results], ['dog', 'horse'] * 20)
+        self.assertEqual(_match_tuples(holmes.Manager.load_snapshot(self.path)),
+                _match_tuples(holmes_manager))
+
+    def test_not_a_snapshot(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'A dog chased a cat.')
+        with self.assertRaises(UnsupportedSnapshotFormatError):
+            holmes.Manager.load_snapshot(self.path)
@@ -1,7 +1,9 @@
 import unittest
 import holmes_extractor as holmes
 from holmes_extractor.extensive_matching import SupervisedTopicClassifier
+from holmes_extractor.errors import UnsupportedModelFormatError
 import os
+import tempfile
 from holmes_extractor.tests.testing_utils import HolmesInstanceManager
 
 script_directory = os.path.dirname(os.path.realpath(__file__))
@@ -225,6 +227,20 @@ class EnglishSupervisedTopicClassificationTest(unittest.TestCase):
         self.assertEqual(stc2.parse_and_classify("My name is Charles and I like sewing."), [])
         self.assertEqual(stc2.parse_and_classify("Your dog appears to be on a lead."),
                 ['animal', 'dog', 'hound'])
+        self.assertEqual(stc2.parse_and_classify_many(["You are a robot.",
+                "My name is Charles and I like sewing.", "Your dog appears to be on a lead.",
+                "You are a cat."]), [['computers'], [], ['animal', 'dog', 'hound'], ['animal']])
+        self.assertEqual(stc2.classify_many([]), [])
+        binary_supervised_topic_classifier_model = stc.serialize_model_to_bytes()
+        self.assertTrue(len(binary_supervised_topic_classifier_model) <
+                len(serialized_supervised_topic_classifier_model))
+        stc3 = no_ontology_holmes_manager.deserialize_supervised_topic_classifier(
+                binary_supervised_topic_classifier_model)
+        self.assertEqual(stc2._model.sorted_label_dict, stc3._model.sorted_label_dict)
+        self.assertEqual(stc2._model.classifications, stc3._model.classifications)
+        self.assertEqual(stc3.parse_and_classify_many(["You are a robot.",
+                "My name is Charles and I like sewing.", "Your dog appears to be on a lead.",
+                "You are a cat."]), [['computers'], [], ['animal', 'dog', 'hound'], ['animal']])
 
     def test_filtering(self):
         sttb = holmes_manager.get_supervised_topic_training_basis()
@@ -252,3 +268,140 @@ class EnglishSupervisedTopicClassificationTest(unittest.TestCase):
         self.assertEqual(set(map(lambda phr: phr.label, trainer2._serialized_phraselets)),
                 {'predicate-actor: chase-animal',
                 'predicate-patient: chase-animal'})
+
+    def test_repeated_phraselets_are_registered_once(self):
+        sttb = holmes_manager.get_supervised_topic_training_basis(oneshot=False)
+        sttb.parse_and_register_training_document("A dog chases a cat", 'animals')
+        sttb.parse_and_register_training_document("A cat chases a dog", 'animals')
+        sttb.parse_and_register_training_document("A dog chases a cat", 'animals')
+        labels = [serialized_phraselet.label for serialized_phraselet in
+                sttb.serialized_phraselets]
+        self.assertEqual(len(labels), len(set(labels)))
+        self.assertEqual(set(labels), set(sttb.structural_matcher.list_search_phrase_labels()))
+        self.assertEqual(len(sttb.structural_matcher.search_phrases), len(set(labels)))
+        sttb.prepare()
+        freq = sttb.labels_to_classification_frequencies
+        self.assertEqual(freq['predicate-actor: chase-animal'], {'animals': 3})
+
+    def test_incremental_training(self):
+        documents = [("A dog chases a cat", 'animals', 'd0'),
+                ("A cat chases a horse", 'animals', 'd1'),
+                ("A gymnast jumps over a horse", 'gym', 'd2'),
+                ("A lion eats and consumes a tiger", 'animals', 'd3'),
+                ("A gymnast jumps over a vaulting horse", 'gym', 'd4')]
+        def train(sttb):
+            sttb.prepare()
+            return sttb.labels_to_classification_frequencies, sttb.train(minimum_occurrences=0,
+                    cv_threshold=0)
+        sttb = holmes_manager.get_supervised_topic_training_basis(oneshot=False)
+        for text, classification, label in documents:
+            sttb.parse_and_register_training_document(text, classification, label)
+        freq, trainer = train(sttb)
+        incremental_sttb = holmes_manager.get_supervised_topic_training_basis(oneshot=False,
+                incremental=True)
+        for text, classification, label in documents[:3]:
+            incremental_sttb.parse_and_register_training_document(text, classification, label)
+        incremental_sttb.parse_and_register_training_document("A robot", 'computers', 'd5')
+        train(incremental_sttb)
+        incremental_sttb.remove_training_document('d5')
+        for text, classification, label in documents[3:]:
+            incremental_sttb.parse_and_register_training_document(text, classification, label)
+        with self.assertRaises(RuntimeError):
+            incremental_sttb.train()
+        incremental_freq, incremental_trainer = train(incremental_sttb)
+        self.assertEqual(freq, incremental_freq)
+        self.assertFalse('word: robot' in incremental_freq)
+        self.assertEqual(trainer._sorted_label_dict, incremental_trainer._sorted_label_dict)
+        self.assertEqual(trainer._input_matrix.toarray().tolist(),
+                incremental_trainer._input_matrix.toarray().tolist())
+        self.assertEqual(trainer._output_matrix.toarray().tolist(),
+                incremental_trainer._output_matrix.toarray().tolist())
+
+    def test_incremental_training_resumes_after_reloading(self):
+        documents = [("A dog chases a cat", 'animals', 'd0'),
+                ("A gymnast jumps over a horse", 'gym', 'd1'),
+                ("A lion eats and consumes a tiger", 'animals', 'd2'),
+                ("A gymnast jumps over a vaulting horse", 'gym', 'd3')]
+        sttb = holmes_manager.get_supervised_topic_training_basis(oneshot=False)
+        for text, classification, label in documents:
+            sttb.parse_and_register_training_document(text, classification, label)
+        sttb.prepare()
+        incremental_sttb = holmes_manager.get_supervised_topic_training_basis(oneshot=False,
+                incremental=True)
+        for text, classification, label in documents[:3]:
+            incremental_sttb.parse_and_register_training_document(text, classification, label)
+        incremental_sttb.prepare()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'training_basis')
+            incremental_sttb.save(path)
+            loaded_sttb = holmes_manager.load_supervised_topic_training_basis(path)
+        self.assertEqual(loaded_sttb.labels_to_classification_frequencies,
+                incremental_sttb.labels_to_classification_frequencies)
+        text, classification, label = documents[3]
+        loaded_sttb.parse_and_register_training_document(text, classification, label)
+        calls = []
+        match_documents = loaded_sttb._match_documents
+        def recording_match_documents(serialized_phraselets, document_labels):
+            calls.append(([serialized_phraselet.label for serialized_phraselet in
+                    serialized_phraselets], list(document_labels)))
+            return match_documents(serialized_phraselets, document_labels)
+        loaded_sttb._match_documents = recording_match_documents
+        loaded_sttb.prepare()
+        # only the new document is matched against all phraselets; the documents restored
+        # from the file are only matched against the phraselets the new document introduced
+        self.assertEqual(calls[0][1], ['d3'])
+        self.assertEqual(calls[1][1], ['d0', 'd1', 'd2'])
+        self.assertFalse(set(calls[1][0]) & set(serialized_phraselet.label for
+                serialized_phraselet in incremental_sttb.serialized_phraselets))
+        self.assertEqual(loaded_sttb.labels_to_classification_frequencies,
+                sttb.labels_to_classification_frequencies)
+
+    def test_changes_after_prepare_require_incremental_mode(self):
+        sttb = holmes_manager.get_supervised_topic_training_basis()
+        sttb.parse_and_register_training_document("A dog chases a cat", 'animals', 'd0')
+        sttb.parse_and_register_training_document("A computer", 'computers', 'd1')
+        sttb.prepare()
+        with self.assertRaises(RuntimeError):
+            sttb.parse_and_register_training_document("A robot", 'computers', 'd2')
+        with self.assertRaises(RuntimeError):
+            sttb.remove_training_document('d1')
+
+    def test_training_in_multiple_processes(self):
+        def train(number_of_processes):
+            sttb = no_coref_holmes_manager.get_supervised_topic_training_basis(oneshot=False,
+                    number_of_processes=number_of_processes)
+            sttb.parse_and_register_training_document("A dog chases a cat", 'animals', 'd0')
+            sttb.parse_and_register_training_document("A cat chases a dog", 'animals', 'd1')
+            sttb.parse_and_register_training_document("A cat chases a horse", 'animals', 'd2')
+            sttb.parse_and_register_training_document("A lion eats and consumes a tiger",
+                    'animals', 'd3')
+            sttb.parse_and_register_training_document("A gymnast jumps over a horse", 'gym',
+                    'd4')
+            sttb.parse_and_register_training_document("A gymnast jumps over a vaulting horse",
+                    'gym', 'd5')
+            sttb.prepare()
+            trainer = sttb.train(minimum_occurrences=0, cv_threshold=0)
+            return sttb.labels_to_classification_frequencies, trainer
+        freq, trainer = train(1)
+        parallel_freq, parallel_trainer = train(3)
+        self.assertEqual(freq, parallel_freq)
+        self.assertEqual(trainer._sorted_label_dict, parallel_trainer._sorted_label_dict)
+        self.assertEqual(trainer._input_matrix.toarray().tolist(),
+                parallel_trainer._input_matrix.toarray().tolist())
+
+    def test_training_in_multiple_processes_with_coreference(self):
+        def train(number_of_processes):
+            sttb = holmes_manager.get_supervised_topic_training_basis(oneshot=False,
+                    number_of_processes=number_of_processes)
+            sttb.parse_and_register_training_document("I saw a dog and it was chasing a cat",
+                    'animals', 'd0')
+            sttb.parse_and_register_training_document("A cat chases a dog", 'animals', 'd1')
+            sttb.parse_and_register_training_document("A gymnast jumps over a horse", 'gym',
+                    'd2')
+            sttb.prepare()
+            return sttb.labels_to_classification_frequencies
+        self.assertEqual(train(1), train(2))
+
+    def test_unsupported_binary_model_format(self):
+        with self.assertRaises(UnsupportedModelFormatError):
+            holmes_manager.deserialize_supervised_topic_classifier(b'PK not a model')